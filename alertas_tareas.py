@@ -0,0 +1,128 @@
+"""
+Detección de tareas en riesgo en una sola pasada vectorizada
+Se clasifica al procesar el dataset (al sincronizar) y las columnas viajan con él:
+vencidas, que vencen en los próximos días hábiles, con inicio atrasado, con
+fechas estimadas y sin asignar. Sin interfaz genera la lista diaria de alertas
+
+Uso: python alertas_tareas.py [--dias N] [--carpeta alertas] [--formato csv|json]
+"""
+import argparse
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+# Columna → etiqueta, en orden de gravedad (la primera que aplica da el Riesgo)
+CATEGORIAS_RIESGO = {
+    'Vencida': "🔴 Vencida",
+    'Vence_Pronto': "🟠 Vence pronto",
+    'Inicio_Atrasado': "🟡 Inicio atrasado",
+    'Sin_Fechas': "⚪ Sin fechas",
+    'Sin_Asignar': "👤 Sin asignar",
+}
+SIN_RIESGO = "Sin riesgo"
+ESTADOS_CERRADOS = ("Completado", "Cancelado")
+DIAS_AVISO = 3
+CARPETA_ALERTAS = "alertas"
+COLUMNAS_ALERTA = ['Riesgo', 'Dias_Atraso', 'Tarea', 'Área', 'Carpeta', 'Lista', 'Estado',
+                   'Asignados', 'Prioridad', 'Fecha_Inicio', 'Fecha_Limite']
+
+
+def clasificar_riesgo(df, hoy=None, dias_aviso=DIAS_AVISO, calendario=None):
+    """
+    Agregar las columnas de CATEGORIAS_RIESGO (booleanas), Riesgo (la más grave)
+    y Dias_Atraso (días hábiles desde la fecha límite). Las tareas cerradas no
+    tienen riesgo. df.attrs['riesgo_evaluado'] guarda la fecha de evaluación
+    """
+    import pandas as pd
+    from calendario_laboral import a_dias, calendario_configurado
+
+    calendario = calendario or calendario_configurado()
+    hoy = np.datetime64(hoy or date.today(), 'D')
+    limite = a_dias(df['Fecha_Limite'])
+    abiertas = ~df['Estado'].isin(ESTADOS_CERRADOS).to_numpy()
+
+    vencida = abiertas & (limite < hoy)
+    # Días hábiles desde hoy hasta la fecha límite, ambos inclusive
+    restantes = np.busday_count(hoy, limite + 1, busdaycal=calendario)
+    estimadas = df['Fechas_Estimadas'].to_numpy(dtype=bool) if 'Fechas_Estimadas' in df.columns else False
+    banderas = {
+        'Vencida': vencida,
+        'Vence_Pronto': abiertas & ~vencida & (restantes <= dias_aviso),
+        'Inicio_Atrasado': (df['Estado'] == "Pendiente").to_numpy() & (a_dias(df['Fecha_Inicio']) < hoy),
+        'Sin_Fechas': abiertas & estimadas,
+        'Sin_Asignar': abiertas & (df['Asignados'] == "Sin asignar").to_numpy(),
+    }
+    riesgo = np.select(list(banderas.values()), list(CATEGORIAS_RIESGO.values()), SIN_RIESGO)
+
+    resultado = df.assign(
+        **banderas,
+        Riesgo=pd.Categorical(riesgo, categories=[*CATEGORIAS_RIESGO.values(), SIN_RIESGO]),
+        Dias_Atraso=np.where(vencida, np.busday_count(limite + 1, hoy + 1, busdaycal=calendario), 0)
+    )
+    resultado.attrs['riesgo_evaluado'] = str(hoy)
+    return resultado
+
+
+def riesgo_vigente(df, hoy=None):
+    """El mismo DataFrame si ya se evaluó hoy; si no, reclasificado"""
+    hoy = str(np.datetime64(hoy or date.today(), 'D'))
+    if df.attrs.get('riesgo_evaluado') == hoy and 'Riesgo' in df.columns:
+        return df
+    return clasificar_riesgo(df, hoy)
+
+
+def resumen_alertas(df):
+    """Cantidad de tareas por categoría de riesgo (una tarea puede estar en varias)"""
+    return {columna: int(df[columna].sum()) if columna in df.columns else 0 for columna in CATEGORIAS_RIESGO}
+
+
+def lista_alertas(df):
+    """Tareas con algún riesgo, de la más grave y más atrasada a la menos"""
+    alertas = df.loc[df['Riesgo'] != SIN_RIESGO, [c for c in COLUMNAS_ALERTA if c in df.columns]]
+    return alertas.sort_values(['Riesgo', 'Dias_Atraso', 'Fecha_Limite'], ascending=[True, False, True])
+
+
+def guardar_alertas(alertas, carpeta=CARPETA_ALERTAS, formato="csv", hoy=None):
+    """Escribir la lista del día en `carpeta` de forma atómica. Devuelve la ruta"""
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, f"alertas_{np.datetime64(hoy or date.today(), 'D')}.{formato}")
+    temporal = f"{ruta}.tmp"
+    if formato == "json":
+        registros = alertas.astype({'Riesgo': str}).to_dict(orient="records")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(registros, f, ensure_ascii=False, indent=2, default=str)
+    else:
+        alertas.to_csv(temporal, index=False, date_format="%d/%m/%Y", encoding="utf-8-sig")
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lista diaria de tareas en riesgo")
+    parser.add_argument("--dias", type=int, default=DIAS_AVISO, help="Días hábiles de aviso antes del vencimiento")
+    parser.add_argument("--carpeta", default=CARPETA_ALERTAS)
+    parser.add_argument("--formato", choices=["csv", "json"], default="csv")
+    args = parser.parse_args()
+
+    from config import get_config
+    from almacen_dataset import construir_dataset, rutas_fuentes
+
+    config = get_config()
+    df, _ = construir_dataset(rutas_fuentes(config), config.get('space_id'), config.get('areas') or ())
+    if df is None or df.empty:
+        print("❌ No hay datos para evaluar")
+        return 1
+
+    df = clasificar_riesgo(df, dias_aviso=args.dias)
+    alertas = lista_alertas(df)
+    ruta = guardar_alertas(alertas, args.carpeta, args.formato)
+    print(f"🚨 {len(alertas)} de {len(df)} tareas con alertas → {ruta}")
+    for columna, cantidad in resumen_alertas(df).items():
+        print(f"   {CATEGORIAS_RIESGO[columna]}: {cantidad}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""
+Dataset de tareas compartido entre varios procesos de la app en el mismo host
+Un proceso publica la tabla procesada como Arrow IPC sin comprimir en
+dataset_compartido/ y los demás la abren con memory_map (zero-copy, las páginas
+las comparte el sistema operativo). Cada publicación es una versión nueva; el
+puntero actual.json se reemplaza de forma atómica al terminar de escribirla
+
+Uso: python almacen_dataset.py publicar | estado
+"""
+import argparse
+import glob
+import json
+import os
+from datetime import datetime
+
+CARPETA_ALMACEN = "dataset_compartido"
+ARCHIVO_PUNTERO = "actual.json"
+VERSIONES_CONSERVADAS = 3
+
+
+def ruta_version(version, carpeta=CARPETA_ALMACEN):
+    return os.path.join(carpeta, f"tareas_v{version:06d}.arrow")
+
+
+def version_publicada(carpeta=CARPETA_ALMACEN):
+    """Puntero a la versión vigente ({version, archivo, tareas, publicado, entradas}) o None"""
+    try:
+        with open(os.path.join(carpeta, ARCHIVO_PUNTERO), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def rutas_fuentes(config):
+    """Cachés por espacio configurados que existen o, si no hay ninguno, el JSON combinado"""
+    from utils_gantt import ARCHIVO_DATOS
+    from ingesta_clickup import ruta_cache_espacio
+
+    rutas = [ruta_cache_espacio(space_id) for space_id in config.get('space_ids') or []]
+    rutas = [ruta for ruta in rutas if os.path.exists(ruta)]
+    if not rutas and os.path.exists(ARCHIVO_DATOS):
+        rutas = [ARCHIVO_DATOS]
+    return rutas
+
+
+def construir_dataset(rutas, space_id=None, areas=()):
+    """
+    Cargar y procesar las fuentes. Devuelve (df, entradas sin los datos crudos)
+    o (None, []) si no hay datos
+    """
+    from ingesta_clickup import combinar_espacios, leer_cache_espacio
+    from utils_gantt import ARCHIVO_DATOS, procesar_datos_gantt
+
+    areas = list(areas)
+    if rutas == [ARCHIVO_DATOS]:
+        with open(ARCHIVO_DATOS, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        espacios = {area: space_id for area in data} if space_id and len(data) == 1 else {}
+        entradas = []
+    else:
+        ids = [os.path.splitext(os.path.basename(ruta))[0] for ruta in rutas]
+        entradas = [entrada for entrada in map(leer_cache_espacio, ids) if entrada]
+        data, espacios = combinar_espacios(entradas, areas)
+    if not data:
+        return None, []
+
+    df = procesar_datos_gantt(data, espacios, areas)
+    return df, [{k: v for k, v in entrada.items() if k != 'datos'} for entrada in entradas]
+
+
+def _reservar_version(carpeta):
+    """Crear en exclusiva el archivo de la siguiente versión (dos publicadores no chocan)"""
+    actual = version_publicada(carpeta)
+    version = (actual or {}).get("version", 0) + 1
+    while True:
+        ruta = ruta_version(version, carpeta)
+        try:
+            os.close(os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return version, ruta
+        except FileExistsError:
+            version += 1
+
+
+def publicar_dataset(df, entradas=(), carpeta=CARPETA_ALMACEN):
+    """Escribir una versión nueva del dataset y apuntar actual.json a ella. Devuelve el puntero"""
+    import pyarrow as pa
+
+    os.makedirs(carpeta, exist_ok=True)
+    version, ruta = _reservar_version(carpeta)
+    # Cadenas y fechas sin diccionarios ni compresión: la lectura es zero-copy
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    with open(ruta, "wb") as destino:
+        with pa.ipc.new_file(destino, tabla.schema) as writer:
+            writer.write_table(tabla, max_chunksize=max(len(tabla), 1))
+        destino.flush()
+        os.fsync(destino.fileno())
+
+    puntero = {
+        "version": version,
+        "archivo": os.path.basename(ruta),
+        "tareas": len(df),
+        "publicado": datetime.now().isoformat(timespec="seconds"),
+        "entradas": list(entradas),
+    }
+    # Un publicador más lento no debe retroceder el puntero a una versión anterior
+    if (version_publicada(carpeta) or {}).get("version", 0) < version:
+        temporal = os.path.join(carpeta, f".{ARCHIVO_PUNTERO}.{version}.tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(puntero, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, os.path.join(carpeta, ARCHIVO_PUNTERO))
+
+    limpiar_versiones(carpeta)
+    return puntero
+
+
+def abrir_dataset(puntero, carpeta=CARPETA_ALMACEN):
+    """
+    Abrir una versión publicada como DataFrame respaldado por el archivo mapeado
+    (columnas pyarrow, sin copiar a objetos de Python)
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    # El mapa no se cierra: las columnas del DataFrame apuntan a sus páginas
+    fuente = pa.memory_map(os.path.join(carpeta, puntero["archivo"]), "r")
+    return pa.ipc.open_file(fuente).read_all().to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def limpiar_versiones(carpeta=CARPETA_ALMACEN, conservar=VERSIONES_CONSERVADAS):
+    """Borrar versiones antiguas; las que otro proceso aún tenga abiertas se reintentan después"""
+    rutas = sorted(glob.glob(os.path.join(glob.escape(carpeta), "tareas_v*.arrow")))
+    for ruta in rutas[:-conservar]:
+        try:
+            os.remove(ruta)
+        except OSError:
+            # En Windows un archivo mapeado no se puede borrar
+            pass
+
+
+def publicar_desde_fuentes(config, carpeta=CARPETA_ALMACEN):
+    """Procesar las fuentes configuradas y publicarlas. Devuelve el puntero o None"""
+    df, entradas = construir_dataset(rutas_fuentes(config), config.get('space_id'), config.get('areas') or ())
+    if df is None:
+        return None
+    return publicar_dataset(df, entradas, carpeta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset compartido entre procesos de la app")
+    parser.add_argument("accion", choices=["publicar", "estado"])
+    parser.add_argument("--carpeta", default=CARPETA_ALMACEN)
+    args = parser.parse_args()
+
+    if args.accion == "publicar":
+        from config import get_config
+        puntero = publicar_desde_fuentes(get_config(), args.carpeta)
+        if not puntero:
+            print("❌ No hay datos para publicar")
+            return 1
+        print(f"✅ Versión {puntero['version']} publicada ({puntero['tareas']} tareas)")
+        return 0
+
+    puntero = version_publicada(args.carpeta)
+    if not puntero:
+        print("ℹ️ No hay ninguna versión publicada")
+        return 1
+    print(f"📦 Versión {puntero['version']}: {puntero['tareas']} tareas, publicada {puntero['publicado']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
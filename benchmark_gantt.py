@@ -0,0 +1,324 @@
+"""
+Benchmark del pipeline de gantt_app con datos sintéticos
+Genera datasets con la forma de tareas_sin_subtareas.json (1k, 10k, 100k y 1M tareas)
+y mide tiempo y memoria pico de cada etapa: carga, procesamiento, cada filtro del
+sidebar, diagrama de Gantt, serialización de la figura y exportaciones.
+
+Los resultados se escriben en JSON en benchmark_resultados/. Con --baseline se
+comparan contra una corrida guardada y el proceso termina con código 1 si alguna
+etapa empeora en tiempo o en memoria pico más que el umbral.
+
+Uso:
+    python benchmark_gantt.py [--tamanos 1000 10000] [--repeticiones 3]
+    python benchmark_gantt.py --guardar-baseline
+    python benchmark_gantt.py --baseline benchmark_baseline.json --umbral 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from utils_gantt import (
+    aplicar_filtro,
+    aplicar_filtros_gantt,
+    calcular_estadisticas_avanzadas,
+    cubo_para_filtros,
+    generar_exportacion,
+    procesar_datos_gantt,
+)
+
+TAMANOS = [1_000, 10_000, 100_000, 1_000_000]
+CARPETA_RESULTADOS = "benchmark_resultados"
+ARCHIVO_BASELINE = "benchmark_baseline.json"
+
+# Tamaño máximo por etapa: por encima se omite (la figura crea una traza por tarea)
+LIMITES_ETAPA = {
+    "diagrama_gantt": 10_000,
+    "serializar_figura": 10_000,
+    "exportar_excel": 100_000,
+    "simulacion_riesgo": 20_000,
+}
+
+# Por debajo de este tiempo o de esta memoria las diferencias se consideran ruido
+MINIMO_COMPARABLE_S = 0.05
+MINIMO_COMPARABLE_BYTES = 1 << 20
+
+AREAS = ["Administración y Sistemas", "Operaciones", "Comercial", "Finanzas"]
+ESTADOS = ["pendiente", "en progreso", "en revisión", "completado"]
+PRIORIDADES = ["urgent", "high", "normal", "low", None]
+
+
+def generar_datos_sinteticos(n_tareas, semilla=42):
+    """Estructura área → carpeta → lista → estado → tareas con `n_tareas` tareas"""
+    azar = random.Random(semilla)
+    personas = [f"Persona {i:03d}" for i in range(200)]
+    carpetas = [f"Carpeta {i:02d}" for i in range(12)]
+    listas = [f"Lista {i:02d}" for i in range(8)]
+    base = datetime.now() - timedelta(days=180)
+
+    def fecha(dias):
+        return (base + timedelta(days=dias)).strftime("%d/%m/%y")
+
+    datos = {}
+    for i in range(n_tareas):
+        estado = azar.choice(ESTADOS)
+        inicio = azar.randrange(360)
+        tarea = {
+            "nombre": f"Tarea sintética {i} " + "x" * azar.randrange(60),
+            "estado": estado,
+            "asignados": azar.sample(personas, azar.choice((0, 1, 1, 1, 2, 3))),
+            # ~10% de tareas sin fechas, como en los datos reales
+            "fecha_inicio": fecha(inicio) if azar.random() > 0.1 else None,
+            "fecha_limite": fecha(inicio + azar.randrange(1, 60)) if azar.random() > 0.1 else None,
+            "prioridad": azar.choice(PRIORIDADES),
+        }
+        (datos.setdefault(azar.choice(AREAS), {})
+              .setdefault(azar.choice(carpetas), {})
+              .setdefault(azar.choice(listas), {})
+              .setdefault(estado, [])
+              .append(tarea))
+    return datos
+
+
+def filtros_representativos(df):
+    """Valores de filtro que seleccionan una parte realista del DataFrame"""
+    centro = df['Fecha_Inicio'].min() + (df['Fecha_Limite'].max() - df['Fecha_Inicio'].min()) / 2
+    return {
+        'area': df['Área'].iloc[0],
+        'carpeta': df['Carpeta'].iloc[0],
+        'estados': ["Pendiente", "En Progreso"],
+        'prioridades': ["Urgent", "High"],
+        'asignado': "Persona 007",
+        'fechas': ((centro - timedelta(days=90)).date(), (centro + timedelta(days=90)).date()),
+    }
+
+
+def a_semanas_completas(filtros):
+    """Los mismos filtros con el rango de fechas ampliado de lunes a domingo"""
+    desde, hasta = filtros['fechas']
+    return {
+        **filtros,
+        'fechas': (desde - timedelta(days=desde.weekday()), hasta + timedelta(days=6 - hasta.weekday())),
+    }
+
+
+def etapas_pipeline(ruta_json):
+    """
+    Lista de (nombre, funcion(contexto)) en el orden de la app. Cada etapa lee
+    del contexto lo que producen las anteriores y guarda su propio resultado
+    """
+    def cargar(ctx):
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            ctx['datos'] = json.load(f)
+
+    def procesar(ctx):
+        ctx['df'] = procesar_datos_gantt(ctx['datos'])
+        ctx['filtros'] = filtros_representativos(ctx['df'])
+
+    def filtro(nombre):
+        def ejecutar(ctx):
+            aplicar_filtro(ctx['df'], nombre, ctx['filtros'][nombre])
+        return ejecutar
+
+    def filtros_combinados(ctx):
+        aplicar_filtros_gantt(ctx['df'], ctx['filtros'])
+
+    def cubo(ctx):
+        from cubo_metricas import construir_cubo
+        ctx['cubo'] = construir_cubo(ctx['df'])
+
+    def estadisticas(semanas_completas):
+        # Como la app: vista filtrada y cubo de esa vista. Un rango que corta semanas
+        # agrega la vista; uno de semanas completas filtra las celdas del cubo
+        def ejecutar(ctx):
+            filtros = a_semanas_completas(ctx['filtros']) if semanas_completas else ctx['filtros']
+            df_filtrado = aplicar_filtros_gantt(ctx['df'], filtros)
+            calcular_estadisticas_avanzadas(df_filtrado, cubo_para_filtros(
+                ctx['cubo'], df_filtrado, filtros,
+                (ctx['df']['Fecha_Inicio'].min(), ctx['df']['Fecha_Limite'].max())
+            ))
+        return ejecutar
+
+    def diagrama(ctx):
+        from graficos_gantt import crear_diagrama_gantt
+        ctx['figura'] = crear_diagrama_gantt(ctx['df'])
+
+    def serializar(ctx):
+        ctx['figura'].to_json()
+
+    def riesgo(ctx):
+        from riesgo_cronograma import simular_riesgo
+        simular_riesgo(ctx['df'], 1_000)
+
+    def exportar(formato):
+        def ejecutar(ctx):
+            generar_exportacion(ctx['df'], formato)
+        return ejecutar
+
+    return [
+        ("cargar_json", cargar),
+        ("procesar_datos", procesar),
+        *[(f"filtro_{nombre}", filtro(nombre))
+          for nombre in ('area', 'carpeta', 'estados', 'prioridades', 'asignado', 'fechas')],
+        ("filtros_combinados", filtros_combinados),
+        ("construir_cubo", cubo),
+        ("estadisticas_vista", estadisticas(False)),
+        ("estadisticas_cubo", estadisticas(True)),
+        ("diagrama_gantt", diagrama),
+        ("serializar_figura", serializar),
+        ("simulacion_riesgo", riesgo),
+        *[(f"exportar_{formato}", exportar(formato)) for formato in ('csv', 'excel', 'parquet', 'arrow')],
+    ]
+
+
+def medir_tamano(n_tareas, repeticiones, medir_memoria):
+    """Tiempos (mediana de `repeticiones`) y memoria pico por etapa para un tamaño"""
+    print(f"\n📦 {n_tareas:,} tareas")
+    datos = generar_datos_sinteticos(n_tareas)
+    descriptor, ruta_json = tempfile.mkstemp(suffix=".json", prefix="benchmark_gantt_")
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False)
+        del datos
+        tamano_json = os.path.getsize(ruta_json)
+
+        etapas = etapas_pipeline(ruta_json)
+        tiempos = {nombre: [] for nombre, _ in etapas}
+        omitidas = {nombre for nombre, _ in etapas if n_tareas > LIMITES_ETAPA.get(nombre, float("inf"))}
+
+        for _ in range(repeticiones):
+            ctx = {}
+            for nombre, etapa in etapas:
+                if nombre in omitidas:
+                    continue
+                inicio = time.perf_counter()
+                etapa(ctx)
+                tiempos[nombre].append(time.perf_counter() - inicio)
+
+        # Pasada aparte: tracemalloc distorsiona los tiempos
+        memoria = {}
+        if medir_memoria:
+            ctx = {}
+            tracemalloc.start()
+            for nombre, etapa in etapas:
+                if nombre in omitidas:
+                    continue
+                tracemalloc.reset_peak()
+                actual = tracemalloc.get_traced_memory()[0]
+                etapa(ctx)
+                memoria[nombre] = tracemalloc.get_traced_memory()[1] - actual
+            tracemalloc.stop()
+    finally:
+        os.remove(ruta_json)
+
+    resultado = {"tareas": n_tareas, "bytes_json": tamano_json, "etapas": {}}
+    for nombre, _ in etapas:
+        if nombre in omitidas:
+            resultado["etapas"][nombre] = {"omitida": True}
+            print(f"  {nombre:<24}{'omitida':>12}")
+            continue
+        mediana = statistics.median(tiempos[nombre])
+        resultado["etapas"][nombre] = {
+            "segundos": round(mediana, 6),
+            "min_segundos": round(min(tiempos[nombre]), 6),
+            "memoria_pico_bytes": memoria.get(nombre),
+        }
+        pico = f"{memoria[nombre] / 2**20:>10.1f} MB" if nombre in memoria else ""
+        print(f"  {nombre:<24}{mediana * 1000:>10.1f} ms{pico}")
+    return resultado
+
+
+def comparar_con_baseline(resultados, baseline, umbral):
+    """
+    Lista de regresiones (tareas, etapa, medida, antes, ahora) de tiempo o de
+    memoria pico que superan el umbral relativo
+    """
+    anteriores = {r["tareas"]: r["etapas"] for r in baseline["resultados"]}
+    medidas = (("segundos", MINIMO_COMPARABLE_S), ("memoria_pico_bytes", MINIMO_COMPARABLE_BYTES))
+    regresiones = []
+    for resultado in resultados:
+        for nombre, actual in resultado["etapas"].items():
+            anterior = anteriores.get(resultado["tareas"], {}).get(nombre) or {}
+            for medida, minimo in medidas:
+                # Sin medida en alguna de las corridas (etapa omitida o --sin-memoria)
+                if anterior.get(medida) is None or actual.get(medida) is None:
+                    continue
+                if actual[medida] < minimo:
+                    continue
+                if actual[medida] > anterior[medida] * (1 + umbral):
+                    regresiones.append((resultado["tareas"], nombre, medida, anterior[medida], actual[medida]))
+    return regresiones
+
+
+def formatear_medida(medida, valor):
+    return f"{valor / 2**20:.1f} MB" if medida == "memoria_pico_bytes" else f"{valor * 1000:.1f} ms"
+
+
+def guardar_json(contenido, ruta):
+    """Escribir JSON con reemplazo atómico"""
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de gantt_app")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS, help="Cantidad de tareas por dataset")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones por etapa (se usa la mediana)")
+    parser.add_argument("--sin-memoria", action="store_true", help="Omitir la pasada de memoria pico")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", default=None, help="Resultados previos contra los que comparar")
+    parser.add_argument("--umbral", type=float, default=0.25, help="Regresión relativa tolerada (0.25 = 25%%)")
+    parser.add_argument("--guardar-baseline", action="store_true", help=f"Guardar esta corrida en {ARCHIVO_BASELINE}")
+    args = parser.parse_args()
+
+    print("⏱️ BENCHMARK DEL PIPELINE GANTT")
+    # Importar antes de medir para no cargar el costo de importación a la primera etapa
+    import pandas  # noqa: F401
+    import graficos_gantt  # noqa: F401
+    from calendario_laboral import calendario_configurado
+    calendario_configurado()
+    resultados = [medir_tamano(n, args.repeticiones, not args.sin_memoria) for n in args.tamanos]
+
+    corrida = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }
+    salida = args.salida or os.path.join(
+        CARPETA_RESULTADOS, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    guardar_json(corrida, salida)
+    print(f"\n💾 Resultados en {salida}")
+
+    if args.guardar_baseline:
+        guardar_json(corrida, ARCHIVO_BASELINE)
+        print(f"📌 Baseline guardado en {ARCHIVO_BASELINE}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regresiones = comparar_con_baseline(resultados, json.load(f), args.umbral)
+        if regresiones:
+            print(f"\n❌ {len(regresiones)} etapa(s) empeoraron más de {args.umbral:.0%}:")
+            for tareas, nombre, medida, antes, ahora in regresiones:
+                print(f"  {tareas:>9,} {nombre:<24}{formatear_medida(medida, antes):>12} → {formatear_medida(medida, ahora)}")
+            return 1
+        print(f"\n✅ Sin regresiones respecto a {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
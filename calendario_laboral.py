@@ -0,0 +1,130 @@
+"""
+Calendario laboral: fines de semana y feriados (Perú por defecto)
+Todas las funciones trabajan sobre columnas completas con np.busday_count y
+np.busday_offset; no hay costo por fila. Los feriados se configuran con
+secrets app.holidays / app.working_days o FERIADOS / DIAS_LABORABLES
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# Lunes a viernes
+DIAS_LABORABLES = "1111100"
+ANIOS_CALENDARIO = (2015, 2040)
+
+# (mes-día, año desde el que rige, nombre)
+FERIADOS_FIJOS_PERU = [
+    ("01-01", 1900, "Año Nuevo"),
+    ("05-01", 1900, "Día del Trabajo"),
+    ("06-07", 2024, "Batalla de Arica y Día de la Bandera"),
+    ("06-29", 1900, "San Pedro y San Pablo"),
+    ("07-23", 2024, "Día de la Fuerza Aérea del Perú"),
+    ("07-28", 1900, "Fiestas Patrias"),
+    ("07-29", 1900, "Fiestas Patrias"),
+    ("08-06", 2022, "Batalla de Junín"),
+    ("08-30", 1900, "Santa Rosa de Lima"),
+    ("10-08", 1900, "Combate de Angamos"),
+    ("11-01", 1900, "Todos los Santos"),
+    ("12-08", 1900, "Inmaculada Concepción"),
+    ("12-09", 2022, "Batalla de Ayacucho"),
+    ("12-25", 1900, "Navidad"),
+]
+
+
+def pascua(anios):
+    """Domingo de Pascua (calendario gregoriano) de cada año, vectorizado"""
+    y = np.asarray(anios, dtype=np.int64)
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = b // 4, b % 4
+    g = (b - (b + 8) // 25 + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    n = h + l - 7 * m + 114
+    meses = (y - 1970) * 12 + (n // 31 - 1)
+    return meses.astype('datetime64[M]').astype('datetime64[D]') + (n % 31)
+
+
+def feriados_peru(desde=ANIOS_CALENDARIO[0], hasta=ANIOS_CALENDARIO[1]):
+    """Feriados nacionales del Perú entre dos años (incluye Jueves y Viernes Santo)"""
+    anios = np.arange(desde, hasta + 1)
+    fijos = [
+        np.array([f"{anio}-{mes_dia}" for anio in anios if anio >= vigente], dtype='datetime64[D]')
+        for mes_dia, vigente, _ in FERIADOS_FIJOS_PERU
+    ]
+    domingo = pascua(anios)
+    return np.unique(np.concatenate(fijos + [domingo - 3, domingo - 2]))
+
+
+@lru_cache(maxsize=8)
+def crear_calendario(feriados=None, dias_laborables=DIAS_LABORABLES):
+    """
+    np.busdaycalendar con los días laborables y `feriados` (tupla de fechas ISO;
+    None usa los del Perú). Se crea una vez por combinación
+    """
+    fechas = feriados_peru() if feriados is None else np.array(feriados, dtype='datetime64[D]')
+    return np.busdaycalendar(weekmask=dias_laborables, holidays=fechas)
+
+
+def calendario_configurado():
+    """Calendario según la configuración de la app (Perú, lunes a viernes por defecto)"""
+    try:
+        from config import obtener_calendario_laboral
+        feriados, dias_laborables = obtener_calendario_laboral()
+    except ImportError:
+        feriados, dias_laborables = None, DIAS_LABORABLES
+    return crear_calendario(feriados, dias_laborables)
+
+
+def a_dias(fechas):
+    """Fechas (Series, arreglo o escalar) como datetime64[D]"""
+    import pandas as pd
+
+    if isinstance(fechas, pd.Series):
+        fechas = fechas.astype('datetime64[ns]').to_numpy()
+    return np.asarray(fechas, dtype='datetime64[ns]').astype('datetime64[D]')
+
+
+def dias_habiles(inicio, fin, calendario=None):
+    """Días hábiles entre `inicio` y `fin`, ambos inclusive"""
+    calendario = calendario or calendario_configurado()
+    return np.busday_count(a_dias(inicio), a_dias(fin) + 1, busdaycal=calendario)
+
+
+def sumar_dias_habiles(fechas, dias, calendario=None):
+    """Fecha `dias` días hábiles después de cada fecha (si cae en feriado, desde el siguiente hábil)"""
+    calendario = calendario or calendario_configurado()
+    return np.busday_offset(a_dias(fechas), dias, roll='forward', busdaycal=calendario)
+
+
+def es_laborable(fechas, calendario=None):
+    """Máscara de días laborables"""
+    calendario = calendario or calendario_configurado()
+    return np.is_busday(a_dias(fechas), busdaycal=calendario)
+
+
+def dias_habiles_tareas(df, calendario=None):
+    """
+    Días hábiles de cada tarea (mínimo 1). Usa la columna Dias_Habiles y, en
+    datasets anteriores que no la tienen, la calcula de las fechas
+    """
+    if 'Dias_Habiles' in df.columns:
+        return df['Dias_Habiles'].astype('int64').to_numpy()
+    return np.maximum(dias_habiles(df['Fecha_Inicio'], df['Fecha_Limite'], calendario), 1)
+
+
+def a_indice_habil(fechas, origen, calendario=None, roll='forward'):
+    """
+    Número de día hábil de cada fecha contado desde `origen` (eje de la ruta
+    crítica). Con roll='backward' un día no laborable cuenta como el hábil anterior
+    """
+    calendario = calendario or calendario_configurado()
+    fechas = np.busday_offset(a_dias(fechas), 0, roll=roll, busdaycal=calendario)
+    return np.busday_count(origen, fechas, busdaycal=calendario)
+
+
+def desde_indice_habil(origen, dias, calendario=None):
+    """Fecha del día hábil número `dias` contado desde `origen`"""
+    calendario = calendario or calendario_configurado()
+    return np.busday_offset(origen, dias, roll='forward', busdaycal=calendario)
@@ -0,0 +1,103 @@
+"""
+Matriz de carga de trabajo persona × día a partir de los intervalos de las tareas
+Cada tarea suma +1 en su día de inicio y -1 el día siguiente a su fecha límite
+en un arreglo de diferencias; la suma acumulada por fila da las tareas activas
+de cada persona en cada día. Sin bucles por tarea ni por día. Los fines de
+semana y feriados del calendario laboral quedan sin carga
+"""
+import numpy as np
+import pandas as pd
+
+ESTADOS_SIN_CARGA = ("Completado",)
+LIMITE_TAREAS_SIMULTANEAS = 3
+
+
+def intervalos_por_persona(df, excluir_estados=ESTADOS_SIN_CARGA):
+    """Una fila por (persona, tarea) con sus fechas de inicio y límite como días"""
+    datos = df.loc[~df['Estado'].isin(excluir_estados), ['Asignados', 'Fecha_Inicio', 'Fecha_Limite']]
+    datos = datos[datos['Asignados'] != "Sin asignar"]
+    personas = datos['Asignados'].astype(str).str.split(",").explode().str.strip()
+    personas = personas[personas != ""]
+    fechas = datos.loc[personas.index]
+    return pd.DataFrame({
+        'persona': personas.to_numpy(),
+        'inicio': fechas['Fecha_Inicio'].astype('datetime64[ns]').to_numpy().astype('datetime64[D]'),
+        'fin': fechas['Fecha_Limite'].astype('datetime64[ns]').to_numpy().astype('datetime64[D]'),
+    })
+
+
+def matriz_carga(df, frecuencia="D", desde=None, hasta=None, excluir_estados=ESTADOS_SIN_CARGA, calendario=None):
+    """
+    DataFrame persona × periodo con las tareas activas en días hábiles. `frecuencia`
+    'D' da la carga diaria; 'W' el pico diario de cada semana (lunes a domingo)
+    """
+    from calendario_laboral import es_laborable
+
+    intervalos = intervalos_por_persona(df, excluir_estados)
+    if intervalos.empty:
+        return pd.DataFrame()
+
+    inicios = intervalos['inicio'].to_numpy().astype('datetime64[D]')
+    fines = intervalos['fin'].to_numpy().astype('datetime64[D]')
+    desde = np.datetime64(desde, 'D') if desde is not None else inicios.min()
+    hasta = np.datetime64(hasta, 'D') if hasta is not None else fines.max()
+    n_dias = int((hasta - desde).astype(int)) + 1
+    if n_dias <= 0:
+        return pd.DataFrame()
+
+    codigos, personas = pd.factorize(intervalos['persona'], sort=True)
+    # Los intervalos fuera de la ventana se recortan a sus bordes
+    inicio = np.clip((inicios - desde).astype(int), 0, n_dias)
+    fin = np.clip((fines - desde).astype(int) + 1, 0, n_dias)
+    visibles = inicio < fin
+
+    # Arreglo de diferencias aplanado (persona, día): +1 al empezar, -1 al terminar
+    ancho = n_dias + 1
+    celdas = len(personas) * ancho
+    filas = codigos[visibles] * ancho
+    diferencias = (
+        np.bincount(filas + inicio[visibles], minlength=celdas) -
+        np.bincount(filas + fin[visibles], minlength=celdas)
+    ).reshape(len(personas), ancho)
+    dias = pd.date_range(pd.Timestamp(desde), periods=n_dias, freq="D")
+    carga = np.cumsum(diferencias[:, :-1], axis=1) * es_laborable(dias.to_numpy(), calendario)
+
+    matriz = pd.DataFrame(carga, index=pd.Index(personas, name="persona"), columns=dias)
+    if frecuencia == "W":
+        lunes = dias - pd.to_timedelta(dias.dayofweek, unit="D")
+        matriz = matriz.T.groupby(lunes).max().T
+    return matriz
+
+
+def sobreasignaciones(matriz, limite=LIMITE_TAREAS_SIMULTANEAS):
+    """Personas que superan `limite` tareas simultáneas: periodos, pico y primer periodo"""
+    if matriz.empty:
+        return pd.DataFrame(columns=['periodos', 'pico', 'desde'])
+    valores = matriz.to_numpy()
+    excedido = valores > limite
+    filas = excedido.any(axis=1)
+    if not filas.any():
+        return pd.DataFrame(columns=['periodos', 'pico', 'desde'])
+    resultado = pd.DataFrame({
+        'periodos': excedido[filas].sum(axis=1),
+        'pico': valores[filas].max(axis=1),
+        'desde': matriz.columns[excedido[filas].argmax(axis=1)],
+    }, index=matriz.index[filas])
+    return resultado.sort_values(['pico', 'periodos'], ascending=False)
+
+
+def diferencia_carga(antes, despues, frecuencia="D"):
+    """
+    Cambio en tareas activas por persona y periodo al pasar de `antes` a `despues`
+    (las mismas tareas con otras fechas). Solo personas con algún cambio
+    """
+    fechas = pd.concat([antes[['Fecha_Inicio', 'Fecha_Limite']], despues[['Fecha_Inicio', 'Fecha_Limite']]])
+    if fechas.empty:
+        return pd.DataFrame()
+    desde, hasta = fechas['Fecha_Inicio'].min(), fechas['Fecha_Limite'].max()
+    previa = matriz_carga(antes, frecuencia, desde, hasta)
+    nueva = matriz_carga(despues, frecuencia, desde, hasta)
+    if previa.empty and nueva.empty:
+        return pd.DataFrame()
+    diferencia = nueva.sub(previa, fill_value=0).fillna(0).astype('int64')
+    return diferencia[(diferencia != 0).any(axis=1)]
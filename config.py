@@ -2,6 +2,26 @@ import streamlit as st
 import os
 import json
 
+def parsear_lista(valor):
+    """
+    Convierte una lista de secrets o un texto separado por comas en una lista limpia
+    """
+    if not valor:
+        return []
+    if isinstance(valor, str):
+        valor = valor.split(',')
+    return [str(v).strip() for v in valor if str(v).strip()]
+
+def completar_espacios(config):
+    """
+    Asegura que la configuración tenga la lista de espacios y el space_id principal
+    """
+    espacios = parsear_lista(config.get('space_ids')) or parsear_lista(config.get('space_id'))
+    config['space_ids'] = espacios
+    config['space_id'] = espacios[0] if espacios else config.get('space_id')
+    config['areas'] = parsear_lista(config.get('areas'))
+    return config
+
 def get_config():
     """
     Obtiene la configuración de manera segura desde Streamlit secrets o variables de entorno
@@ -13,22 +33,26 @@ def get_config():
         if hasattr(st, 'secrets') and st.secrets:
             if 'clickup' in st.secrets:
                 config['api_token'] = st.secrets.clickup.api_token
-                config['space_id'] = st.secrets.clickup.space_id
+                config['space_id'] = st.secrets.clickup.get('space_id')
+                config['space_ids'] = st.secrets.clickup.get('space_ids')
+                config['areas'] = st.secrets.clickup.get('areas')
                 
                 # Manejar configuración de app de manera segura
                 app_config = st.secrets.get('app', {})
                 config['environment'] = app_config.get('environment', 'production') if app_config else 'production'
                 config['debug_mode'] = app_config.get('debug_mode', False) if app_config else False
                 
-                return config
+                return completar_espacios(config)
         
         # Fallback a variables de entorno
         if os.getenv('CLICKUP_API_TOKEN'):
             config['api_token'] = os.getenv('CLICKUP_API_TOKEN')
             config['space_id'] = os.getenv('CLICKUP_SPACE_ID', '90111892233')
+            config['space_ids'] = os.getenv('CLICKUP_SPACE_IDS')
+            config['areas'] = os.getenv('CLICKUP_AREAS')
             config['environment'] = os.getenv('APP_ENVIRONMENT', 'production')
             config['debug_mode'] = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
-            return config
+            return completar_espacios(config)
         
     except Exception as e:
         # Si hay error accediendo a secrets, continuar con modo demo
@@ -37,6 +61,8 @@ def get_config():
     # Modo demo con datos de ejemplo
     config['api_token'] = None
     config['space_id'] = None
+    config['space_ids'] = []
+    config['areas'] = []
     config['environment'] = 'demo'
     config['debug_mode'] = True
     
@@ -65,6 +91,9 @@ def validate_config(config):
         st.warning("⚠️ No se encontró el ID del espacio de ClickUp, usando valor por defecto")
         config['space_id'] = '90111892233'
     
+    if not config.get('space_ids'):
+        config['space_ids'] = [config['space_id']]
+    
     # Validar formato del token
     if config.get('api_token') and not config['api_token'].startswith('pk_'):
         st.error("🚨 Error: El token de API no tiene el formato correcto (debe empezar con 'pk_')")
@@ -96,6 +125,69 @@ def log_debug(message, config):
     if config.get('debug_mode', False):
         st.sidebar.write(f"🐛 DEBUG: {message}")
 
+def obtener_puerto_metricas(predeterminado=9464):
+    """
+    Puerto local del endpoint de métricas (secrets app.metrics_port o METRICS_PORT).
+    0 desactiva el endpoint
+    """
+    try:
+        app_config = st.secrets.get('app', {}) if hasattr(st, 'secrets') and st.secrets else {}
+        if app_config and 'metrics_port' in app_config:
+            return int(app_config['metrics_port'])
+    except Exception:
+        pass
+    try:
+        return int(os.getenv('METRICS_PORT', predeterminado))
+    except ValueError:
+        return predeterminado
+
+def usar_dataset_compartido():
+    """
+    Modo de varios procesos: el dataset se publica en memoria compartida
+    (secrets app.shared_dataset o SHARED_DATASET=true)
+    """
+    try:
+        app_config = st.secrets.get('app', {}) if hasattr(st, 'secrets') and st.secrets else {}
+        if app_config and 'shared_dataset' in app_config:
+            return bool(app_config['shared_dataset'])
+    except Exception:
+        pass
+    return os.getenv('SHARED_DATASET', 'false').lower() == 'true'
+
+def prerender_reportes_activo():
+    """
+    Generar los reportes HTML en segundo plano después de cada sincronización
+    (secrets app.prerender_reports o PRERENDER_REPORTS; activo por defecto)
+    """
+    try:
+        app_config = st.secrets.get('app', {}) if hasattr(st, 'secrets') and st.secrets else {}
+        if app_config and 'prerender_reports' in app_config:
+            return bool(app_config['prerender_reports'])
+    except Exception:
+        pass
+    return os.getenv('PRERENDER_REPORTS', 'true').lower() == 'true'
+
+def obtener_calendario_laboral():
+    """
+    Feriados y días laborables del calendario de trabajo: secrets app.holidays
+    (lista de fechas AAAA-MM-DD) y app.working_days (máscara "1111100"), o
+    FERIADOS (separados por comas) y DIAS_LABORABLES. Sin feriados configurados
+    se usan los del Perú (None)
+    """
+    feriados, dias_laborables = None, None
+    try:
+        app_config = st.secrets.get('app', {}) if hasattr(st, 'secrets') and st.secrets else {}
+        if app_config and 'holidays' in app_config:
+            feriados = parsear_lista(app_config['holidays'])
+        if app_config and 'working_days' in app_config:
+            dias_laborables = str(app_config['working_days'])
+    except Exception:
+        pass
+    if feriados is None and os.getenv('FERIADOS') is not None:
+        feriados = parsear_lista(os.getenv('FERIADOS'))
+    dias_laborables = dias_laborables or os.getenv('DIAS_LABORABLES', '1111100')
+    return (tuple(feriados) if feriados is not None else None), dias_laborables
+
 def mask_token(token):
     """
     Enmascara el token para logging seguro
@@ -135,7 +227,7 @@ def show_config_status(config):
             st.write(f"**Space ID:** {space_status}")
             
             if config.get('debug_mode') and config.get('space_id'):
-                st.write(f"**Space ID:** {config['space_id']}")
+                st.write(f"**Space ID:** {', '.join(config.get('space_ids') or [config['space_id']])}")
     except Exception as e:
         # Si hay error mostrando el estado, continuar silenciosamente
         pass
@@ -0,0 +1,103 @@
+"""
+Cubo de conteos pre-agregado para las métricas y gráficos del dashboard
+Se calcula una vez por versión del dataset: tareas y suma de días hábiles por
+área × carpeta × lista × estado × prioridad × asignados × semana de inicio ×
+semana de fin. Los números del dashboard salen de sumar las celdas del cubo
+que pasan los filtros
+"""
+import pandas as pd
+
+DIMENSIONES_TEXTO = ['Área', 'Carpeta', 'Lista', 'Estado', 'Prioridad', 'Asignados']
+# Lunes de la semana de Fecha_Inicio y de Fecha_Limite
+DIMENSIONES_SEMANA = ['Semana', 'Semana_Fin']
+DIMENSIONES_CUBO = DIMENSIONES_TEXTO + DIMENSIONES_SEMANA
+ESTADO_COMPLETADO = "Completado"
+
+
+def lunes(fechas):
+    """Lunes (a medianoche) de la semana de cada fecha"""
+    fechas = pd.to_datetime(fechas.astype('datetime64[ns]'))
+    return (fechas - pd.to_timedelta(fechas.dt.dayofweek, unit='D')).dt.normalize()
+
+
+def construir_cubo(df):
+    """Agregar el DataFrame de tareas en celdas (una fila por combinación presente)"""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=DIMENSIONES_CUBO + ['tareas', 'duracion'])
+
+    from calendario_laboral import dias_habiles_tareas
+
+    cubo = (
+        df.assign(
+            Semana=lunes(df['Fecha_Inicio']),
+            Semana_Fin=lunes(df['Fecha_Limite']),
+            Dias_Habiles=dias_habiles_tareas(df)
+        )
+        .groupby(DIMENSIONES_CUBO, sort=False, dropna=False, observed=True)['Dias_Habiles']
+        .agg(tareas='size', duracion='sum')
+        .reset_index()
+    )
+    # Las dimensiones de texto se guardan como categóricas: el cubo ocupa poco
+    for columna in DIMENSIONES_TEXTO:
+        cubo[columna] = cubo[columna].astype(str).astype('category')
+    cubo[['tareas', 'duracion']] = cubo[['tareas', 'duracion']].astype('int64')
+    return cubo
+
+
+def semanas_completas(desde, hasta):
+    """True si el rango empieza un lunes y termina un domingo (None = sin límite)"""
+    return (desde is None or desde.weekday() == 0) and (hasta is None or hasta.weekday() == 6)
+
+
+def mascara_semanas(cubo, desde=None, hasta=None):
+    """
+    Celdas de las tareas que empiezan desde el lunes `desde` y terminan hasta el
+    domingo `hasta`: con semanas completas equivale al filtro de fechas por tarea
+    """
+    mascara = pd.Series(True, index=cubo.index)
+    if desde is not None:
+        mascara &= cubo['Semana'] >= pd.Timestamp(desde)
+    if hasta is not None:
+        # El lunes de la semana que termina en `hasta`
+        mascara &= cubo['Semana_Fin'] <= pd.Timestamp(hasta) - pd.Timedelta(days=6)
+    return mascara.to_numpy()
+
+
+def sumar_por(cubo, dimension):
+    """Tareas y duración total por valor de una dimensión (ordenado por tareas)"""
+    if cubo.empty:
+        return pd.DataFrame(columns=['tareas', 'duracion'])
+    resumen = cubo.groupby(dimension, observed=True)[['tareas', 'duracion']].sum()
+    return resumen[resumen['tareas'] > 0].sort_values('tareas', ascending=False)
+
+
+def tareas_por_persona(cubo):
+    """
+    Tareas por persona. Las celdas guardan la combinación de asignados de la tarea;
+    se separa solo sobre las celdas, no sobre las filas del dataset
+    """
+    personas = sumar_por(cubo, 'Asignados')['tareas']
+    personas = personas.drop("Sin asignar", errors='ignore')
+    if personas.empty:
+        return personas
+    separadas = personas.rename_axis('persona').reset_index()
+    separadas['persona'] = separadas['persona'].astype(str).str.split(",")
+    separadas = separadas.explode('persona')
+    separadas['persona'] = separadas['persona'].str.strip()
+    return separadas.groupby('persona')['tareas'].sum().sort_values(ascending=False)
+
+
+def resumen_cubo(cubo):
+    """Todos los números del dashboard a partir del cubo filtrado"""
+    por_estado = sumar_por(cubo, 'Estado')
+    total = int(por_estado['tareas'].sum()) if len(por_estado) else 0
+    completadas = int(por_estado['tareas'].get(ESTADO_COMPLETADO, 0))
+    return {
+        'total': total,
+        'por_estado': por_estado['tareas'],
+        'por_prioridad': sumar_por(cubo, 'Prioridad')['tareas'],
+        'duracion_promedio': (por_estado['duracion'] / por_estado['tareas']).to_dict(),
+        'carga_trabajo': tareas_por_persona(cubo).to_dict(),
+        'completadas': completadas,
+        'progreso_porcentaje': completadas / total * 100 if total else 0,
+    }
@@ -0,0 +1,152 @@
+"""
+Exportación de tareas a Parquet y Arrow IPC con pyarrow
+Conserva fechas tipadas y columnas categóricas (dictionary) para cargarlas
+en pandas sin volver a parsear texto
+"""
+
+# Tamaño de lote (filas) por row group / record batch
+TAMANO_LOTE = 50_000
+
+# Columnas de baja cardinalidad que se guardan como categóricas
+CATEGORICAS_JSON = ("Carpeta", "Lista", "Estado", "Prioridad")
+CATEGORICAS_DASHBOARD = ("Área", "Espacio", "Carpeta", "Lista", "Estado", "Prioridad", "Asignados")
+
+def _tipo_arrow(tipo, categorica=False):
+    """Tipo de pyarrow equivalente al tipo de columna del exportador"""
+    import pyarrow as pa
+
+    if categorica:
+        return pa.dictionary(pa.int32(), pa.string())
+    if tipo == "fecha":
+        return pa.timestamp("ms")
+    if tipo == "numero":
+        return pa.int64()
+    return pa.string()
+
+
+def esquema_arrow(columnas, categoricas=()):
+    """Construir el esquema de pyarrow a partir de [(titulo, tipo, ancho)]"""
+    import pyarrow as pa
+
+    return pa.schema([
+        (titulo, _tipo_arrow(tipo, titulo in categoricas))
+        for titulo, tipo, _ancho in columnas
+    ])
+
+
+class _Diccionario:
+    """Codificación incremental de una columna categórica; el diccionario solo crece"""
+
+    def __init__(self):
+        self.codigos = {}
+        self.categorias = []
+
+    def codificar(self, valor):
+        if valor is None:
+            return None
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = len(self.categorias)
+            self.codigos[valor] = codigo
+            self.categorias.append(valor)
+        return codigo
+
+
+def _abrir_writer(destino, esquema, formato):
+    """Abrir un writer de Parquet o Arrow IPC (archivo) para el esquema dado"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if formato == "parquet":
+        return pq.ParquetWriter(destino, esquema, compression="zstd")
+    if formato == "arrow":
+        # Sin compresión para que la lectura con memory_map sea zero-copy;
+        # los diccionarios crecen entre lotes y se emiten como deltas
+        opciones = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        return pa.ipc.new_file(destino, esquema, options=opciones)
+    raise ValueError(f"Formato Arrow no soportado: {formato}")
+
+
+def escribir_tabla_streaming(filas, destino, columnas, formato="parquet", categoricas=(), tamano_lote=TAMANO_LOTE):
+    """Escribir filas (hoja, valores) en Parquet o Arrow IPC por lotes. Devuelve el total de filas"""
+    import pyarrow as pa
+
+    esquema = esquema_arrow(columnas, categoricas)
+    diccionarios = {
+        col: _Diccionario()
+        for col, (titulo, _tipo, _ancho) in enumerate(columnas)
+        if titulo in categoricas
+    }
+    lote = [[] for _ in columnas]
+    total = 0
+
+    def construir_columna(col, valores, campo):
+        if col in diccionarios:
+            return pa.DictionaryArray.from_arrays(
+                pa.array(valores, type=pa.int32()),
+                pa.array(diccionarios[col].categorias, type=pa.string())
+            )
+        return pa.array(valores, type=campo.type)
+
+    def volcar(writer):
+        tabla = pa.table(
+            [construir_columna(col, valores, campo) for col, (valores, campo) in enumerate(zip(lote, esquema))],
+            schema=esquema
+        )
+        writer.write_table(tabla)
+        for valores in lote:
+            valores.clear()
+
+    with _abrir_writer(destino, esquema, formato) as writer:
+        for _hoja, valores in filas:
+            for col, valor in enumerate(valores):
+                diccionario = diccionarios.get(col)
+                lote[col].append(diccionario.codificar(valor) if diccionario else valor)
+            total += 1
+            if len(lote[0]) >= tamano_lote:
+                volcar(writer)
+        if lote[0] or total == 0:
+            volcar(writer)
+
+    return total
+
+
+def tabla_desde_dataframe(df, categoricas=CATEGORICAS_DASHBOARD):
+    """Convertir el DataFrame procesado en una tabla Arrow con categóricas y fechas tipadas"""
+    import pyarrow as pa
+
+    df_tipado = df.copy(deep=False)
+    for columna in categoricas:
+        if columna in df_tipado.columns:
+            df_tipado[columna] = df_tipado[columna].astype("category")
+    return pa.Table.from_pandas(df_tipado, preserve_index=False)
+
+
+def exportar_tabla_arrow(df, formato):
+    """Generar los bytes Parquet o Arrow IPC del DataFrame procesado"""
+    import pyarrow as pa
+
+    tabla = tabla_desde_dataframe(df)
+    buffer = pa.BufferOutputStream()
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(tabla, buffer, compression="zstd")
+    elif formato == "arrow":
+        with pa.ipc.new_file(buffer, tabla.schema) as writer:
+            writer.write_table(tabla)
+    else:
+        raise ValueError(f"Formato Arrow no soportado: {formato}")
+    return buffer.getvalue().to_pybytes()
+
+
+def leer_arrow(ruta):
+    """
+    Cargar un archivo Arrow IPC con memory_map como DataFrame. Las columnas quedan
+    con tipos Arrow (pd.ArrowDtype) sobre el mapa, sin copiarlas a NumPy
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    # El mapa de memoria no se cierra aquí: las columnas lo referencian
+    fuente = pa.memory_map(ruta, "r")
+    return pa.ipc.open_file(fuente).read_all().to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,148 @@
+"""
+Exportación de tareas a Excel en modo streaming
+Escribe las filas directamente en el XLSX (xlsxwriter, constant_memory),
+una hoja por carpeta, con fechas tipadas y autofiltro
+"""
+import re
+from datetime import datetime
+
+# Columnas (titulo, tipo, ancho) del formato plano de json_a_excel
+COLUMNAS_JSON = [
+    ("Carpeta", "texto", 22),
+    ("Lista", "texto", 22),
+    ("Estado", "texto", 14),
+    ("Nombre de tarea", "texto", 60),
+    ("Asignados", "texto", 30),
+    ("Fecha inicio", "fecha", 14),
+    ("Fecha límite", "fecha", 14),
+    ("Prioridad", "texto", 12),
+]
+
+# Columnas del DataFrame procesado del dashboard
+COLUMNAS_DASHBOARD = [
+    ("Tarea", "texto", 60),
+    ("Área", "texto", 24),
+    ("Espacio", "texto", 14),
+    ("Carpeta", "texto", 22),
+    ("Lista", "texto", 22),
+    ("Estado", "texto", 14),
+    ("Asignados", "texto", 30),
+    ("Prioridad", "texto", 12),
+    ("Fecha Inicio", "fecha", 14),
+    ("Fecha Límite", "fecha", 14),
+    ("Duración", "numero", 10),
+]
+
+# Columnas del DataFrame que corresponden a COLUMNAS_DASHBOARD
+CAMPOS_DASHBOARD = [
+    'Nombre_Completo', 'Área', 'Espacio', 'Carpeta', 'Lista', 'Estado', 'Asignados',
+    'Prioridad', 'Fecha_Inicio', 'Fecha_Limite', 'Duracion'
+]
+
+_CARACTERES_INVALIDOS_HOJA = re.compile(r'[\[\]:*?/\\]')
+
+
+def convertir_fecha_json(fecha_str):
+    """Convertir fecha dd/mm/yy del JSON a datetime (None si no es válida)"""
+    if not fecha_str or not fecha_str.strip():
+        return None
+    try:
+        return datetime.strptime(fecha_str, "%d/%m/%y")
+    except ValueError:
+        return None
+
+
+def iterar_filas_json(datos_area):
+    """Generar (hoja, fila) desde la estructura anidada carpeta → lista → estado → tareas"""
+    for carpeta, listas in datos_area.items():
+        for lista, estados in listas.items():
+            for estado, tareas in estados.items():
+                for tarea in tareas:
+                    yield carpeta, (
+                        carpeta,
+                        lista,
+                        estado,
+                        tarea["nombre"],
+                        ", ".join(tarea.get("asignados") or []),
+                        convertir_fecha_json(tarea.get("fecha_inicio")),
+                        convertir_fecha_json(tarea.get("fecha_limite")),
+                        tarea.get("prioridad"),
+                    )
+
+
+def iterar_filas_dataframe(df):
+    """Generar (hoja, fila) desde el DataFrame procesado del dashboard"""
+    indice_carpeta = CAMPOS_DASHBOARD.index('Carpeta')
+    for fila in df[CAMPOS_DASHBOARD].itertuples(index=False, name=None):
+        yield fila[indice_carpeta], fila
+
+
+def nombre_hoja_valido(nombre, usados):
+    """Ajustar el nombre a las reglas de Excel (31 caracteres, sin símbolos, único)"""
+    base = _CARACTERES_INVALIDOS_HOJA.sub("_", str(nombre or "Sin carpeta")).strip("'") or "Hoja"
+    base = base[:31]
+    candidato = base
+    sufijo = 2
+    while candidato.lower() in usados:
+        marca = f" ({sufijo})"
+        candidato = base[:31 - len(marca)] + marca
+        sufijo += 1
+    usados.add(candidato.lower())
+    return candidato
+
+
+def escribir_excel_streaming(filas, destino, columnas=COLUMNAS_JSON):
+    """
+    Escribir filas (hoja, valores) en un XLSX sin materializar el libro en memoria.
+    `destino` puede ser una ruta o un objeto tipo archivo. Devuelve el total de filas escritas.
+    """
+    import xlsxwriter
+
+    libro = xlsxwriter.Workbook(destino, {'constant_memory': True})
+    formato_encabezado = libro.add_format({
+        'bold': True, 'font_color': 'white', 'bg_color': '#667EEA', 'border': 1
+    })
+    formato_fecha = libro.add_format({'num_format': 'dd/mm/yyyy'})
+
+    hojas = {}
+    nombres_usados = set()
+    total = 0
+
+    def abrir_hoja(clave):
+        hoja = libro.add_worksheet(nombre_hoja_valido(clave, nombres_usados))
+        for col, (titulo, _tipo, ancho) in enumerate(columnas):
+            hoja.set_column(col, col, ancho)
+            hoja.write_string(0, col, titulo, formato_encabezado)
+        hoja.freeze_panes(1, 0)
+        hojas[clave] = [hoja, 0]
+        return hojas[clave]
+
+    try:
+        for clave, valores in filas:
+            estado_hoja = hojas.get(clave) or abrir_hoja(clave)
+            hoja = estado_hoja[0]
+            estado_hoja[1] += 1
+            fila = estado_hoja[1]
+
+            for col, valor in enumerate(valores):
+                tipo = columnas[col][1]
+                # valor != valor detecta NaN/NaT sin depender de pandas
+                if valor is None or valor != valor:
+                    continue
+                if tipo == "fecha":
+                    hoja.write_datetime(fila, col, valor, formato_fecha)
+                elif tipo == "numero":
+                    hoja.write_number(fila, col, valor)
+                else:
+                    hoja.write_string(fila, col, str(valor))
+            total += 1
+
+        if not hojas:
+            abrir_hoja("Tareas")
+
+        for hoja, ultima_fila in hojas.values():
+            hoja.autofilter(0, 0, ultima_fila, len(columnas) - 1)
+    finally:
+        libro.close()
+
+    return total
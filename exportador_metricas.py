@@ -0,0 +1,107 @@
+"""
+Endpoint de métricas en formato de texto de Prometheus
+Publica los contadores, indicadores e histogramas de instrumentacion (ingesta,
+cachés y render) en un puerto local, en un hilo aparte del servidor de Streamlit
+"""
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from instrumentacion import BUCKETS_SEGUNDOS, contadores, histogramas, indicadores
+
+PREFIJO = "gantt"
+PUERTO_PREDETERMINADO = 9464
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+_INICIO_PROCESO = time.time()
+_CARACTERES_INVALIDOS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _nombre(nombre):
+    """Nombre de métrica válido para Prometheus"""
+    return f"{PREFIJO}_{_CARACTERES_INVALIDOS.sub('_', nombre)}"
+
+
+def _etiqueta(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def memoria_residente_bytes():
+    """Memoria residente actual del proceso (pico si no hay /proc)"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return None
+
+
+def generar_texto_metricas():
+    """Todas las métricas del proceso en formato de exposición de texto de Prometheus"""
+    lineas = []
+
+    for nombre, valor in sorted(contadores().items()):
+        metrica = _nombre(nombre) + "_total"
+        lineas += [f"# TYPE {metrica} counter", f"{metrica} {valor}"]
+
+    valores = indicadores()
+    valores["proceso_inicio_segundos"] = _INICIO_PROCESO
+    memoria = memoria_residente_bytes()
+    if memoria is not None:
+        valores["proceso_memoria_residente_bytes"] = memoria
+    for nombre, valor in sorted(valores.items()):
+        metrica = _nombre(nombre)
+        lineas += [f"# TYPE {metrica} gauge", f"{metrica} {valor}"]
+
+    metrica = _nombre("etapa_duracion_segundos")
+    lineas.append(f"# HELP {metrica} Duración de cada etapa del pipeline")
+    lineas.append(f"# TYPE {metrica} histogram")
+    for etapa, (buckets, cantidad, suma) in sorted(histogramas().items()):
+        etiqueta = f'etapa="{_etiqueta(etapa)}"'
+        for limite, acumulado in zip(BUCKETS_SEGUNDOS, buckets):
+            lineas.append(f'{metrica}_bucket{{{etiqueta},le="{limite}"}} {acumulado}')
+        lineas.append(f'{metrica}_bucket{{{etiqueta},le="+Inf"}} {cantidad}')
+        lineas.append(f"{metrica}_sum{{{etiqueta}}} {suma}")
+        lineas.append(f"{metrica}_count{{{etiqueta}}} {cantidad}")
+
+    return "\n".join(lineas) + "\n"
+
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        cuerpo = generar_texto_metricas().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_CONTENIDO)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        # Los scrapes periódicos no deben llenar el log de Streamlit
+        pass
+
+
+def iniciar_servidor_metricas(puerto=PUERTO_PREDETERMINADO, host="127.0.0.1"):
+    """
+    Servir /metrics en un hilo daemon. Devuelve el servidor, o None si el puerto
+    está ocupado (p. ej. otro proceso de la app ya lo publica)
+    """
+    try:
+        servidor = ThreadingHTTPServer((host, puerto), _ManejadorMetricas)
+    except OSError as e:
+        print(f"⚠️ No se pudo abrir el endpoint de métricas en {host}:{puerto}: {e}")
+        return None
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="exportador-metricas", daemon=True).start()
+    return servidor
+
@@ -1,20 +1,32 @@
+import time
+_INICIO_SCRIPT = time.perf_counter()
+
 import streamlit as st
-import json
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.figure_factory as ff
-from datetime import datetime, timedelta
-import numpy as np
-from config import get_config, validate_config, show_config_status, log_debug
+from datetime import date, datetime
+import os
+from config import get_config, validate_config, show_config_status, log_debug, obtener_puerto_metricas, usar_dataset_compartido
+from cubo_metricas import construir_cubo
+from tabla_paginada import formatear_pagina, mostrar_tabla_paginada
+from instrumentacion import iniciar_corrida, medir, contar, cronometrado, fijar, registrar_tiempo, mostrar_panel_latencias
+from alertas_tareas import CATEGORIAS_RIESGO, DIAS_AVISO, resumen_alertas
+from almacen_dataset import abrir_dataset, construir_dataset, publicar_desde_fuentes, rutas_fuentes, version_publicada
 from utils_gantt import (
     actualizar_datos_desde_clickup, 
     verificar_datos_existentes, 
     generar_datos_ejemplo,
-    exportar_a_excel,
+    activar_copy_on_write,
+    opciones_filtros,
+    aplicar_filtros_gantt,
+    cubo_para_filtros,
+    huella_datos,
+    generar_exportacion,
+    FORMATOS_EXPORTACION,
     calcular_estadisticas_avanzadas
 )
 
+iniciar_corrida()
+contar("ejecuciones_script")
+
 # Configuración de la página
 st.set_page_config(
     page_title="📊 Diagrama de Gantt - Gestión de Tareas",
@@ -23,100 +35,77 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS personalizado para mejorar la apariencia
-st.markdown("""
-<style>
-    /* Mejorar el diseño general */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-        max-width: 1200px;
-    }
-    
-    /* Estilo del sidebar */
-    .sidebar .sidebar-content {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }
-    
-    /* Estilo del título principal */
-    h1 {
-        color: #2C3E50;
-        font-family: 'Segoe UI', Arial, sans-serif;
-        font-weight: 700;
-        text-align: center;
-        margin-bottom: 2rem;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    /* Mejorar las métricas */
-    div[data-testid="metric-container"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 12px;
-        padding: 1rem;
-        border: none;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    
-    div[data-testid="metric-container"] > div {
-        color: white;
-    }
-    
-    /* Estilo de los botones */
-    .stButton button {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        padding: 0.5rem 1rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton button:hover {
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        transform: translateY(-2px);
-    }
-    
-    /* Estilo de los selectboxes */
-    .stSelectbox > div > div {
-        background-color: #f8f9fa;
-        border-radius: 8px;
-    }
-    
-    /* Mejorar las tablas */
-    .dataframe {
-        border-radius: 8px;
-        overflow: hidden;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    }
-    
-    /* Estilo del gráfico de Plotly */
-    .plotly-graph-div {
-        border-radius: 12px;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        overflow: hidden;
-    }
-    
-    /* Ocultar elementos innecesarios */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Estilo de los expanderes */
-    .streamlit-expanderHeader {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 8px;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Columnas de la tabla de detalle (y del CSV) con su etiqueta
+COLUMNAS_DETALLE = {
+    'Nombre_Completo': 'Tarea',
+    'Carpeta': 'Carpeta',
+    'Lista': 'Lista',
+    'Estado': 'Estado',
+    'Asignados': 'Asignados',
+    'Prioridad': 'Prioridad',
+    'Fecha_Inicio': 'Fecha Inicio',
+    'Fecha_Limite': 'Fecha Límite',
+}
+FECHAS_DETALLE = ('Fecha_Inicio', 'Fecha_Limite')
+COLUMNAS_RUTA_CRITICA = {
+    'Tarea': 'Tarea',
+    'Asignados': 'Asignados',
+    'Estado': 'Estado',
+    'Inicio_Temprano': 'Inicio Temprano',
+    'Inicio_Tardio': 'Inicio Tardío',
+    'Fin_Temprano': 'Fin Temprano',
+    'Holgura': 'Holgura (días hábiles)',
+}
+FECHAS_RUTA_CRITICA = ('Inicio_Temprano', 'Inicio_Tardio', 'Fin_Temprano')
+COLUMNAS_SIMULACION = {
+    'Tarea': 'Tarea',
+    'Asignados': 'Asignados',
+    'Inicio_Base': 'Inicio Actual',
+    'Inicio_Nuevo': 'Inicio Simulado',
+    'Fin_Base': 'Fin Actual',
+    'Fin_Nuevo': 'Fin Simulado',
+    'Desplazamiento': 'Desplazamiento (días hábiles)',
+    'Holgura_Base': 'Holgura Actual',
+    'Holgura_Nueva': 'Holgura Simulada',
+}
+FECHAS_SIMULACION = ('Inicio_Base', 'Inicio_Nuevo', 'Fin_Base', 'Fin_Nuevo')
+
+@st.cache_resource
+def cargar_estilos():
+    """Leer la hoja de estilos una sola vez por proceso"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "estilos_gantt.css"), encoding="utf-8") as f:
+        return f.read()
+
+@st.cache_resource
+def iniciar_metricas(puerto):
+    """Levantar el endpoint de métricas una sola vez por proceso"""
+    if not puerto:
+        return None
+    from exportador_metricas import iniciar_servidor_metricas
+    return iniciar_servidor_metricas(puerto)
+
+def fragmento(etapa):
+    """
+    Sección que se vuelve a ejecutar sola cuando cambian sus propios widgets
+    (st.fragment; experimental_fragment en versiones anteriores). Sin soporte de
+    fragmentos se ejecuta con el resto del script. Cada ejecución se mide como `etapa`
+    """
+    decorador = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    
+    def envolver(funcion):
+        medida = cronometrado(etapa)(funcion)
+        return decorador(medida) if decorador else medida
+    return envolver
+
+iniciar_metricas(obtener_puerto_metricas())
+activar_copy_on_write()
 
-# Título principal
+# Título principal (primer render, antes de cargar los módulos pesados)
 st.title("📊 Diagrama de Gantt - Gestión de Tareas ClickUp")
 
+# CSS personalizado para mejorar la apariencia
+st.markdown(f"<style>{cargar_estilos()}</style>", unsafe_allow_html=True)
+
 # === VALIDACIÓN DE CONFIGURACIÓN SEGURA ===
 try:
     config = get_config()
@@ -142,7 +131,7 @@ except Exception as e:
 info_datos = verificar_datos_existentes()
 
 # Barra superior con controles
-col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+col1, col2, col3 = st.columns([2, 1, 1])
 
 with col1:
     if info_datos["existe"]:
@@ -167,396 +156,523 @@ with col3:
             st.success("✅ Datos de ejemplo generados")
             st.rerun()
 
-with col4:
-    if st.button("📊 Ver Estadísticas"):
-        st.session_state.show_stats = not st.session_state.get('show_stats', False)
-
 st.markdown("---")
 
-@st.cache_data
-def cargar_datos():
-    """Cargar y procesar los datos del JSON"""
-    try:
-        with open("tareas_sin_subtareas.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data
-    except FileNotFoundError:
-        st.error("❌ No se encontró el archivo 'tareas_sin_subtareas.json'")
-        return None
+def firma_fuentes(config):
+    """Versión de los datos de entrada: (ruta, fecha de modificación) de cada fuente"""
+    return tuple((ruta, os.path.getmtime(ruta)) for ruta in rutas_fuentes(config))
 
-def convertir_fecha(fecha_str):
-    """Convertir fecha en formato dd/mm/yy a datetime"""
-    if fecha_str and fecha_str.strip():
-        try:
-            return datetime.strptime(fecha_str, "%d/%m/%y")
-        except:
-            return None
-    return None
-
-def procesar_datos_gantt(data):
-    """Procesar datos para el diagrama de Gantt"""
-    tareas = []
-    
-    for carpeta, listas in data["Administración y Sistemas"].items():
-        for lista, estados in listas.items():
-            for estado, lista_tareas in estados.items():
-                for tarea in lista_tareas:
-                    fecha_inicio = convertir_fecha(tarea.get("fecha_inicio"))
-                    fecha_limite = convertir_fecha(tarea.get("fecha_limite"))
-                    
-                    # Si no hay fecha de inicio, usar fecha actual menos algunos días según el estado
-                    if not fecha_inicio:
-                        if estado == "completado":
-                            fecha_inicio = datetime.now() - timedelta(days=30)
-                        elif estado == "en progreso":
-                            fecha_inicio = datetime.now() - timedelta(days=15)
-                        else:  # pendiente
-                            fecha_inicio = datetime.now()
-                    
-                    # Si no hay fecha límite, estimar una duración
-                    if not fecha_limite:
-                        if estado == "completado":
-                            fecha_limite = fecha_inicio + timedelta(days=7)
-                        else:
-                            fecha_limite = fecha_inicio + timedelta(days=14)
-                    
-                    # Asegurar que fecha_limite >= fecha_inicio
-                    if fecha_limite < fecha_inicio:
-                        fecha_limite = fecha_inicio + timedelta(days=1)
-                    
-                    tareas.append({
-                        "Tarea": tarea["nombre"][:50] + "..." if len(tarea["nombre"]) > 50 else tarea["nombre"],
-                        "Nombre_Completo": tarea["nombre"],
-                        "Carpeta": carpeta,
-                        "Lista": lista,
-                        "Estado": estado.title(),
-                        "Asignados": ", ".join(tarea["asignados"]) if tarea["asignados"] else "Sin asignar",
-                        "Prioridad": tarea.get("prioridad", "normal").title() if tarea.get("prioridad") else "Normal",
-                        "Fecha_Inicio": fecha_inicio,
-                        "Fecha_Limite": fecha_limite,
-                        "Duracion": (fecha_limite - fecha_inicio).days + 1
-                    })
-    
-    return pd.DataFrame(tareas)
-
-def crear_diagrama_gantt(df_filtrado, escala_temporal="Meses"):
-    """Crear diagrama de Gantt moderno y profesional como en la imagen de referencia"""
-    if df_filtrado.empty:
-        st.warning("⚠️ No hay datos para mostrar con los filtros seleccionados")
+def _dataset(df, entradas, hoy):
+    from alertas_tareas import riesgo_vigente
+
+    # Las alertas dependen del día: una versión de otro día (o publicada) se reclasifica
+    df = riesgo_vigente(df, hoy)
+    return {'df': df, 'opciones': opciones_filtros(df), 'cubo': construir_cubo(df), 'entradas': entradas}
+
+@st.cache_resource(max_entries=2, show_spinner="Procesando tareas...")
+def dataset_compartido(firma, space_id, areas, hoy):
+    """
+    Dataset procesado una sola vez por proceso y versión de datos, compartido por
+    todas las sesiones. Es de solo lectura: las sesiones trabajan con vistas filtradas
+    """
+    contar("cache_fallos_dataset")
+    df, entradas = construir_dataset([ruta for ruta, _ in firma], space_id, areas)
+    return _dataset(df, entradas, hoy) if df is not None else None
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def dataset_publicado(version, hoy):
+    """Versión publicada en dataset_compartido/, mapeada en memoria (compartida entre procesos)"""
+    contar("cache_fallos_dataset")
+    puntero = version_publicada()
+    if not puntero or puntero['version'] != version:
+        # Se publicó otra versión entre la consulta y la apertura
         return None
+    return _dataset(abrir_dataset(puntero), puntero['entradas'], hoy)
+
+def obtener_dataset(config):
+    """Dataset de esta ejecución: el publicado entre procesos o el del proceso"""
+    hoy = date.today().isoformat()
+    if usar_dataset_compartido():
+        puntero = version_publicada()
+        if puntero is None:
+            # Ningún proceso lo publicó todavía: este hace de cargador
+            puntero = publicar_desde_fuentes(config)
+        if puntero:
+            fijar("dataset_version", puntero['version'])
+            dataset = dataset_publicado(puntero['version'], hoy)
+            if dataset:
+                return dataset
+    return dataset_compartido(firma_fuentes(config), config.get('space_id'), tuple(config.get('areas') or ()), hoy)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def cargar_metricas_historial(version):
+    """Métricas de burndown/velocidad; version = número de snapshots del historial"""
+    from metricas_historial import MetricasHistorial
+    return MetricasHistorial().actualizar()
+
+def version_historial():
+    """Número de sincronizaciones registradas (0 si no hay historial)"""
+    from historial_snapshots import HistorialSnapshots
+    return len(HistorialSnapshots().indice)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def obtener_exportacion(huella, formato, _df):
+    """Generar los bytes de exportación solo una vez por vista filtrada y formato"""
+    contar("cache_fallos_exportacion")
+    if formato == 'csv':
+        # El CSV mantiene las columnas y fechas de la tabla de detalle
+        _df = formatear_pagina(_df, COLUMNAS_DETALLE, FECHAS_DETALLE)
+    return generar_exportacion(_df, formato)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def modelo_ruta_critica(huella, _df):
+    """
+    Grafo, programa CPM y tabla de ruta crítica de la vista filtrada (una vez por
+    vista). Se comparte sin copiar: las simulaciones trabajan sobre copias
+    """
+    from ruta_critica import GrafoDependencias, origen_y_plan, programar, tabla_programa
+    with medir("ruta_critica"):
+        grafo = GrafoDependencias.desde_dataframe(_df)
+        origen_proyecto, planificado, duracion = origen_y_plan(_df)
+        programa = programar(grafo, planificado, duracion)
+        return {
+            'grafo': grafo,
+            'programa': programa,
+            'origen': origen_proyecto,
+            'ruta': tabla_programa(programa, origen_proyecto, _df.index),
+        }
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def figura_gantt(huella, escala_temporal, disposicion, resaltar_ruta, hoy, _df, _criticas):
+    """
+    Figura del Gantt por vista, escala y disposición; `hoy` renueva la línea del día.
+    Se comparte sin copiar: enviarla al navegador no la modifica
+    """
+    from graficos_gantt import crear_diagrama_gantt, crear_diagrama_gantt_compacto
+    
+    if disposicion == "Compacta por asignado":
+        return crear_diagrama_gantt_compacto(_df, escala_temporal, "Asignado", _criticas)
+    if disposicion == "Compacta por lista":
+        return crear_diagrama_gantt_compacto(_df, escala_temporal, "Lista", _criticas)
+    return crear_diagrama_gantt(_df, escala_temporal, _criticas)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def obtener_riesgo(huella, escenarios, _df):
+    """Escenarios Monte Carlo de la vista filtrada (una vez por vista y cantidad)"""
+    from riesgo_cronograma import simular_riesgo
+    with medir("simulacion_riesgo"):
+        return simular_riesgo(_df, escenarios)
+
+def boton_exportacion(formato, etiqueta, df_exportar, huella, prefijo_archivo):
+    """Mostrar un botón que genera la exportación solo cuando se solicita"""
+    solicitudes = st.session_state.setdefault('exportaciones_solicitadas', {})
+    
+    if solicitudes.get(formato) != huella:
+        if st.button(f"⚙️ Preparar {etiqueta}", key=f"preparar_{formato}"):
+            solicitudes[formato] = huella
+            contar(f"exportaciones_{formato}")
+        else:
+            return
     
-    # Paleta de colores moderna y profesional
-    colores_estado = {
-        "Pendiente": "#FF6B6B",      # Rojo coral vibrante
-        "En Progreso": "#4ECDC4",    # Turquesa moderno
-        "Completado": "#45B7D1",     # Azul cielo
-        "Pausado": "#96CEB4",        # Verde menta
-        "Cancelado": "#FECA57"       # Amarillo cálido
-    }
+    contar("cache_consultas_exportacion")
+    with st.spinner(f"Generando {etiqueta}..."):
+        datos_exportacion = obtener_exportacion(huella, formato, df_exportar)
     
-    # Colores de prioridad para intensidad
-    colores_prioridad = {
-        "Alta": 1.0,
-        "Media": 0.8,
-        "Baja": 0.6,
-        "Crítica": 1.2
-    }
+    if datos_exportacion:
+        formato_info = FORMATOS_EXPORTACION[formato]
+        st.download_button(
+            label=f"📥 Descargar {etiqueta}",
+            data=datos_exportacion,
+            file_name=f"{prefijo_archivo}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato_info['extension']}",
+            mime=formato_info['mime'],
+            key=f"descargar_{formato}"
+        )
+
+@fragmento("seccion_simulacion")
+def mostrar_simulacion(df_vista, modelo):
+    """
+    Modo what-if: mover las fechas de una tarea y ver cómo se propagan por sus
+    sucesoras (fechas, holguras y carga) frente al programa actual
+    """
+    import numpy as np
+    import plotly.graph_objects as go
+    from calendario_laboral import a_indice_habil, desde_indice_habil, dias_habiles
+    from carga_trabajo import diferencia_carga
+    from ruta_critica import cambios_ruta_critica, comparar_programas, fechas_programadas, propagar_cambio
+    
+    programa = modelo['programa']
+    posiciones = np.flatnonzero(programa['validas'])
+    if not len(posiciones):
+        st.info("ℹ️ Todas las tareas están en ciclos de dependencias")
+        return
+    
+    nombres = df_vista['Tarea'].astype(str).to_numpy()
+    posicion = st.selectbox(
+        "Tarea a mover:", posiciones.tolist(), format_func=lambda i: nombres[i], key="simulacion_tarea"
+    )
+    actual = fechas_programadas(df_vista, programa, [posicion], modelo['origen']).iloc[0]
+    col1, col2 = st.columns(2)
+    with col1:
+        nuevo_inicio = st.date_input("Nuevo inicio:", actual['Fecha_Inicio'].date(), key=f"simulacion_inicio_{posicion}")
+    with col2:
+        nuevo_fin = st.date_input("Nuevo fin:", actual['Fecha_Limite'].date(), key=f"simulacion_fin_{posicion}")
+    
+    if nuevo_fin < nuevo_inicio:
+        st.error("❌ La fecha de fin debe ser posterior al inicio")
+        return
+    if (nuevo_inicio, nuevo_fin) == (actual['Fecha_Inicio'].date(), actual['Fecha_Limite'].date()):
+        st.caption("Cambia las fechas para ver el efecto sobre las tareas que dependen de esta")
+        return
+    
+    inicio_simulacion = time.perf_counter()
+    with medir("simulacion"):
+        nuevo, cambiadas = propagar_cambio(
+            modelo['grafo'], programa, posicion,
+            int(a_indice_habil(np.datetime64(nuevo_inicio, 'D'), modelo['origen'])),
+            max(int(dias_habiles(np.datetime64(nuevo_inicio, 'D'), np.datetime64(nuevo_fin, 'D'))), 1)
+        )
+        cambios = cambios_ruta_critica(programa, nuevo)
+        diferencias = comparar_programas(df_vista, programa, nuevo, cambiadas, modelo['origen'])
     
-    # Crear figura principal
-    fig = go.Figure()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("🔁 Tareas reprogramadas", len(cambiadas))
+    with col2:
+        st.metric(
+            "🏁 Fin del proyecto",
+            f"{desde_indice_habil(modelo['origen'], nuevo['fin_proyecto'] - 1).item():%d/%m/%Y}",
+            delta=f"{nuevo['fin_proyecto'] - programa['fin_proyecto']:+d} días hábiles",
+            delta_color="inverse"
+        )
+    with col3:
+        st.metric("🧭 Holguras cambiadas", cambios['holgura_cambiada'])
+    st.caption(
+        f"Recalculado en {(time.perf_counter() - inicio_simulacion) * 1000:.0f} ms · "
+        f"{len(cambios['entran'])} tareas entran y {len(cambios['salen'])} salen de la ruta crítica"
+    )
     
-    # Ordenar tareas por fecha de inicio y prioridad
-    df_sorted = df_filtrado.sort_values(['Fecha_Inicio', 'Prioridad'])
+    mostrar_tabla_paginada(diferencias, "simulacion", COLUMNAS_SIMULACION, FECHAS_SIMULACION)
     
-    # Obtener rango de fechas
-    fecha_min = df_sorted['Fecha_Inicio'].min()
-    fecha_max = df_sorted['Fecha_Limite'].max()
+    # Carga de trabajo de las tareas reprogramadas: tareas activas de más (+) o de menos (-)
+    carga = diferencia_carga(
+        fechas_programadas(df_vista, programa, cambiadas, modelo['origen']),
+        fechas_programadas(df_vista, nuevo, cambiadas, modelo['origen'])
+    )
+    if not carga.empty:
+        limite = int(np.abs(carga.to_numpy()).max())
+        fig_carga = go.Figure(go.Heatmap(
+            z=carga.to_numpy(),
+            x=carga.columns,
+            y=carga.index,
+            colorscale="RdBu_r",
+            zmin=-limite,
+            zmax=limite,
+            colorbar=dict(title="Δ tareas"),
+            hovertemplate="%{y}<br>%{x|%d/%m/%Y}: %{z:+d} tareas<extra></extra>"
+        ))
+        fig_carga.update_layout(
+            height=min(200 + 22 * len(carga), 800),
+            title="Cambio en tareas activas por persona y día"
+        )
+        st.plotly_chart(fig_carga, use_container_width=True)
+
+@fragmento("seccion_ruta_critica")
+def seccion_ruta_critica(df_filtrado, ruta, ciclos):
+    """Tareas de la ruta crítica y ciclos de dependencias de la vista"""
+    from ruta_critica import tareas_en_ciclos
+    
+    if len(ciclos):
+        st.warning(
+            f"⚠️ Dependencias circulares entre {len(ciclos)} tareas; ellas y sus sucesoras "
+            f"quedan fuera del cálculo: {', '.join(tareas_en_ciclos(df_filtrado, ciclos)[:10])}"
+        )
+    detalle_ruta = df_filtrado[['Tarea', 'Asignados', 'Estado']].join(ruta)
+    detalle_ruta = detalle_ruta.dropna(subset=['Holgura']).sort_values(['Holgura', 'Inicio_Temprano'])
+    mostrar_tabla_paginada(detalle_ruta, "ruta_critica", COLUMNAS_RUTA_CRITICA, FECHAS_RUTA_CRITICA)
+
+@fragmento("seccion_detalle")
+def seccion_detalle(df_filtrado, huella_filtrado):
+    """Tabla de detalle y exportaciones: paginar o exportar solo vuelve a ejecutar esta sección"""
+    st.subheader("📋 Detalle de Tareas")
     
-    # Crear barras del diagrama de Gantt
-    estados_agregados = set()
+    # Paginada en el servidor: solo se formatea y envía la página visible
+    with medir("tabla_detalle"):
+        mostrar_tabla_paginada(df_filtrado, "detalle", COLUMNAS_DETALLE, FECHAS_DETALLE)
     
-    for idx, (_, row) in enumerate(df_sorted.iterrows()):
-        # Obtener color base y ajustar intensidad por prioridad
-        color_base = colores_estado.get(row['Estado'], '#9E9E9E')
-        intensidad = colores_prioridad.get(row['Prioridad'], 0.8)
-        
-        # Calcular altura de la barra (más gruesa para mayor impacto visual)
-        altura_barra = 0.6
-        
-        # Crear etiqueta corta y clara para el eje Y
-        etiqueta_y = f"{idx+1:02d}. {row['Tarea'][:35]}{'...' if len(row['Tarea']) > 35 else ''}"
-        
-        # Agregar la barra del Gantt
-        fig.add_trace(go.Bar(
-            x=[row['Duracion']],
-            y=[etiqueta_y],
-            base=[row['Fecha_Inicio']],
-            orientation='h',
-            name=row['Estado'],
-            marker=dict(
-                color=color_base,
-                opacity=intensidad,
-                line=dict(color='rgba(255,255,255,0.8)', width=2)
-            ),
-            showlegend=row['Estado'] not in estados_agregados,
-            text=f"📋 {row['Asignados'][:15]}{'...' if len(row['Asignados']) > 15 else ''}",
-            textposition='inside',
-            textfont=dict(
-                color='white', 
-                size=9, 
-                family="Segoe UI, Arial"
-            ),
-            width=altura_barra,
-            hovertemplate=f"<b>🎯 {row['Tarea']}</b><br>" +
-                         f"📊 Estado: <b>{row['Estado']}</b><br>" +
-                         f"📅 Inicio: <b>{row['Fecha_Inicio'].strftime('%d/%m/%Y')}</b><br>" +
-                         f"🏁 Fin: <b>{row['Fecha_Limite'].strftime('%d/%m/%Y')}</b><br>" +
-                         f"⏱️ Duración: <b>{row['Duracion']} días</b><br>" +
-                         f"👤 Asignados: <b>{row['Asignados']}</b><br>" +
-                         f"⚡ Prioridad: <b>{row['Prioridad']}</b><br>" +
-                         f"📁 Carpeta: <b>{row['Carpeta']}</b><br>" +
-                         "<extra></extra>"
-        ))
-        
-        estados_agregados.add(row['Estado'])
-    
-    # Configurar el fondo y separadores según la escala temporal
-    configurar_fondo_temporal(fig, fecha_min, fecha_max, escala_temporal)
-    
-    # Layout moderno y profesional
-    fig.update_layout(
-        title={
-            'text': f"📅 Cronograma del Proyecto - Vista por {escala_temporal}",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {
-                'size': 24, 
-                'family': 'Segoe UI, Arial Black', 
-                'color': '#2C3E50'
-            },
-            'pad': {'t': 20}
-        },
-        height=max(600, len(df_sorted) * 45 + 200),
-        margin=dict(l=280, r=100, t=120, b=80),
-        plot_bgcolor='#FAFBFC',
-        paper_bgcolor='white',
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.15,
-            xanchor="center",
-            x=0.5,
-            font=dict(size=12, family="Segoe UI"),
-            bordercolor="#E1E8ED",
-            borderwidth=2,
-            bgcolor="rgba(255,255,255,0.95)",
-            itemsizing="constant",
-            itemwidth=30
-        ),
-        font=dict(family="Segoe UI, Arial", size=11),
-        hovermode='closest',
-        bargap=0.3,
-        bargroupgap=0.1
-    )
+    # Opción para descargar datos filtrados (generados solo bajo demanda)
+    col1, col2, col3, col4 = st.columns(4)
     
-    # Configurar ejes con estilo moderno
-    configurar_ejes(fig, escala_temporal, fecha_min, fecha_max)
+    with col1:
+        boton_exportacion('csv', "CSV", df_filtrado, huella_filtrado, "tareas_filtradas")
     
-    # Agregar línea de "HOY" con estilo destacado
-    agregar_linea_hoy(fig, fecha_min, fecha_max)
+    with col2:
+        boton_exportacion('excel', "Excel", df_filtrado, huella_filtrado, "tareas_gantt")
     
-    # Agregar indicadores de progreso visual si es necesario
-    if escala_temporal == "Meses":
-        agregar_indicadores_mensuales(fig, fecha_min, fecha_max)
+    with col3:
+        boton_exportacion('parquet', "Parquet", df_filtrado, huella_filtrado, "tareas_gantt")
     
-    return fig
-
+    with col4:
+        boton_exportacion('arrow', "Arrow", df_filtrado, huella_filtrado, "tareas_gantt")
 
-def configurar_fondo_temporal(fig, fecha_min, fecha_max, escala_temporal):
-    """Configurar el fondo según la escala temporal seleccionada"""
-    if escala_temporal == "Meses":
-        # Colores suaves alternados para meses
-        colores_meses = ['#E3F2FD', '#F3E5F5', '#E8F5E8', '#FFF3E0', '#FCE4EC', '#E0F2F1']
+@fragmento("seccion_estadisticas")
+def seccion_estadisticas(stats):
+    """Estadísticas avanzadas y distribuciones (mostrarlas u ocultarlas no redibuja el Gantt)"""
+    import numpy as np
+    import plotly.express as px
+    
+    st.toggle("📊 Ver Estadísticas", key="show_stats")
+    if st.session_state.get('show_stats', False):
+        st.subheader("📈 Estadísticas Avanzadas del Proyecto")
         
-        current_date = fecha_min.replace(day=1)
-        mes_idx = 0
+        # Métricas de progreso
+        col1, col2, col3 = st.columns(3)
         
-        while current_date <= fecha_max:
-            # Calcular el siguiente mes
-            if current_date.month == 12:
-                next_month = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                next_month = current_date.replace(month=current_date.month + 1)
-            
-            # Agregar fondo alternado para cada mes
-            fig.add_vrect(
-                x0=current_date,
-                x1=min(next_month, fecha_max),
-                fillcolor=colores_meses[mes_idx % len(colores_meses)],
-                opacity=0.3,
-                layer="below",
-                line_width=0
+        with col1:
+            st.metric(
+                "📊 Progreso General", 
+                f"{stats['progreso_porcentaje']:.1f}%",
+                delta=f"{stats['progreso_porcentaje']:.1f}%" if stats['progreso_porcentaje'] > 50 else None
             )
-            
-            current_date = next_month
-            mes_idx += 1
-    
-    elif escala_temporal == "Semanas":
-        # Rayas verticales suaves para semanas
-        current_date = fecha_min
-        while current_date <= fecha_max:
-            fig.add_vline(
-                x=current_date,
-                line_width=1,
-                line_color="#E1E8ED",
-                opacity=0.5,
-                line_dash="dot"
+        
+        with col2:
+            duracion_promedio = np.mean(list(stats['duracion_promedio'].values())) if stats['duracion_promedio'] else 0
+            st.metric("⏱️ Duración Promedio", f"{duracion_promedio:.1f} días hábiles")
+        
+        with col3:
+            personas_activas = len(stats['carga_trabajo'])
+            st.metric("👥 Personas Activas", personas_activas)
+        
+        # Gráficos de estadísticas
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if stats['carga_trabajo']:
+                st.subheader("👤 Carga de Trabajo por Persona")
+                fig_carga = px.bar(
+                    x=list(stats['carga_trabajo'].values()),
+                    y=list(stats['carga_trabajo'].keys()),
+                    orientation='h',
+                    title="Número de Tareas Asignadas",
+                    labels={'x': 'Número de Tareas', 'y': 'Persona'},
+                    color=list(stats['carga_trabajo'].values()),
+                    color_continuous_scale="viridis"
+                )
+                fig_carga.update_layout(height=400)
+                st.plotly_chart(fig_carga, use_container_width=True)
+        
+        with col2:
+            if stats['duracion_promedio']:
+                st.subheader("⏱️ Duración Promedio por Estado")
+                estados = list(stats['duracion_promedio'].keys())
+                duraciones = list(stats['duracion_promedio'].values())
+                
+                fig_duracion = px.bar(
+                    x=estados,
+                    y=duraciones,
+                    title="Días Promedio por Estado",
+                    labels={'x': 'Estado', 'y': 'Días Promedio'},
+                    color=duraciones,
+                    color_continuous_scale="blues"
+                )
+                fig_duracion.update_layout(height=400)
+                st.plotly_chart(fig_duracion, use_container_width=True)
+    
+    # Mostrar estadísticas adicionales
+    with st.expander("📊 Estadísticas Adicionales"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📈 Distribución por Estado")
+            estado_counts = stats['por_estado']
+            fig_pie = px.pie(
+                values=estado_counts.values,
+                names=estado_counts.index,
+                title="Distribución de Tareas por Estado",
+                color_discrete_map={
+                    "Pendiente": "#FF6B6B",
+                    "En Progreso": "#4ECDC4", 
+                    "Completado": "#45B7D1"
+                }
             )
-            current_date += timedelta(weeks=1)
-
-
-def configurar_ejes(fig, escala_temporal, fecha_min, fecha_max):
-    """Configurar los ejes X e Y con estilos modernos"""
-    
-    # Configuración del eje X según escala temporal
-    if escala_temporal == "Días":
-        fig.update_xaxes(
-            dtick=86400000.0,  # Cada día
-            tickformat="%d/%m",
-            tickangle=45,
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(225, 232, 237, 0.8)',
-            title="📅 Días",
-            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
-            tickfont=dict(size=10, color='#657786')
-        )
-    elif escala_temporal == "Semanas":
-        fig.update_xaxes(
-            dtick=86400000.0 * 7,  # Cada semana
-            tickformat="Sem %U",
-            tickangle=45,
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(225, 232, 237, 0.8)',
-            title="📅 Semanas",
-            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
-            tickfont=dict(size=10, color='#657786')
-        )
-    elif escala_temporal == "Años":
-        fig.update_xaxes(
-            dtick="M12",  # Cada año
-            tickformat="%Y",
-            tickangle=0,
-            showgrid=True,
-            gridwidth=2,
-            gridcolor='rgba(225, 232, 237, 0.8)',
-            title="📅 Años",
-            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
-            tickfont=dict(size=12, color='#657786')
+            st.plotly_chart(fig_pie, use_container_width=True)
+        
+        with col2:
+            st.subheader("⚡ Distribución por Prioridad")
+            prioridad_counts = stats['por_prioridad']
+            fig_bar = px.bar(
+                x=prioridad_counts.index,
+                y=prioridad_counts.values,
+                title="Distribución de Tareas por Prioridad",
+                labels={'x': 'Prioridad', 'y': 'Cantidad de Tareas'},
+                color=prioridad_counts.values,
+                color_continuous_scale="viridis"
+            )
+            st.plotly_chart(fig_bar, use_container_width=True)
+
+@fragmento("seccion_carga")
+def seccion_carga(df_filtrado, fecha_inicio_filtro, fecha_fin_filtro):
+    """Carga diaria o semanal por persona con sus sobreasignaciones"""
+    import plotly.graph_objects as go
+    from carga_trabajo import LIMITE_TAREAS_SIMULTANEAS, matriz_carga, sobreasignaciones
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        granularidad = st.radio("Granularidad:", ["Día", "Semana"], horizontal=True, key="carga_granularidad")
+    with col2:
+        limite_carga = st.number_input(
+            "Límite de tareas simultáneas:", min_value=1, value=LIMITE_TAREAS_SIMULTANEAS, step=1, key="carga_limite"
         )
-    else:  # Meses (por defecto)
-        fig.update_xaxes(
-            dtick="M1",
-            tickformat="%b<br>%Y",
-            tickangle=0,
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(225, 232, 237, 0.8)',
-            title="📅 Cronograma Mensual",
-            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
-            tickfont=dict(size=10, color='#657786'),
-            showspikes=True,
-            spikecolor="rgba(68, 68, 68, 0.5)",
-            spikesnap="cursor",
-            spikemode="across"
+    
+    with medir("carga_trabajo"):
+        matriz = matriz_carga(
+            df_filtrado, "D" if granularidad == "Día" else "W",
+            desde=fecha_inicio_filtro, hasta=fecha_fin_filtro
         )
     
-    # Configuración del eje Y
-    fig.update_yaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='rgba(225, 232, 237, 0.5)',
-        tickfont=dict(size=10, color='#14171A', family="Segoe UI"),
-        title="📋 Tareas del Proyecto",
-        title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
-        categoryorder='total ascending',
-        ticksuffix="  ",
-        automargin=True
-    )
-
-
-def agregar_linea_hoy(fig, fecha_min, fecha_max):
-    """Agregar línea indicadora del día actual"""
-    hoy = datetime.now()
-    if fecha_min <= hoy <= fecha_max:
-        fig.add_shape(
-            type="line",
-            x0=hoy,
-            x1=hoy,
-            y0=0,
-            y1=1,
-            yref="paper",
-            line=dict(
-                color="#E1306C",
-                width=3
-            ),
-            opacity=0.9
+    if matriz.empty:
+        st.info("ℹ️ No hay tareas abiertas con asignados en el rango seleccionado")
+    else:
+        fig_carga_diaria = go.Figure(go.Heatmap(
+            z=matriz.to_numpy(),
+            x=matriz.columns,
+            y=matriz.index,
+            colorscale="YlOrRd",
+            colorbar=dict(title="Tareas"),
+            hovertemplate="%{y}<br>%{x|%d/%m/%Y}: %{z} tareas<extra></extra>"
+        ))
+        fig_carga_diaria.update_layout(
+            height=min(200 + 22 * len(matriz), 1200),
+            title=f"Tareas activas por persona y {granularidad.lower()} (días hábiles, sin completadas)"
         )
+        st.plotly_chart(fig_carga_diaria, use_container_width=True)
         
-        # Agregar anotación
-        fig.add_annotation(
-            x=hoy,
-            y=1.02,
-            yref="paper",
-            text="📍 HOY",
-            showarrow=False,
-            font=dict(
-                size=12, 
-                color="#E1306C", 
-                family="Segoe UI"
-            ),
-            bgcolor="rgba(255,255,255,0.9)",
-            bordercolor="#E1306C",
-            borderwidth=1
-        )
+        excesos = sobreasignaciones(matriz, limite_carga)
+        if excesos.empty:
+            st.success(f"✅ Nadie supera {limite_carga} tareas simultáneas")
+        else:
+            st.warning(f"⚠️ {len(excesos)} persona(s) superan {limite_carga} tareas simultáneas")
+            periodo = "días hábiles" if granularidad == "Día" else "semanas"
+            for persona, fila in excesos.head(10).iterrows():
+                st.caption(
+                    f"👤 **{persona}**: pico de {fila['pico']} tareas, {fila['periodos']} {periodo} "
+                    f"sobre el límite (desde {fila['desde']:%d/%m/%Y})"
+                )
 
+@fragmento("seccion_riesgo")
+def seccion_riesgo(df_filtrado, huella_filtrado):
+    """Percentiles de fin por carpeta y lista; la simulación corre solo al pedirla"""
+    from riesgo_cronograma import resumen_riesgo
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        escenarios = st.number_input(
+            "Escenarios:", min_value=500, max_value=50_000, value=5_000, step=500, key="riesgo_escenarios"
+        )
+    with col2:
+        fecha_objetivo = st.date_input(
+            "Fecha objetivo:", df_filtrado['Fecha_Limite'].max().date(), key="riesgo_fecha"
+        )
+    with col3:
+        nivel_riesgo = st.radio("Por:", ["Carpeta", "Lista"], horizontal=True, key="riesgo_nivel")
+    
+    solicitud = (huella_filtrado, int(escenarios))
+    if st.session_state.get('riesgo_solicitado') != solicitud:
+        if st.button("🎲 Simular", key="riesgo_simular"):
+            st.session_state['riesgo_solicitado'] = solicitud
+            contar("simulaciones_riesgo")
+    
+    if st.session_state.get('riesgo_solicitado') == solicitud:
+        with st.spinner(f"Simulando {int(escenarios):,} escenarios..."):
+            resultado_riesgo = obtener_riesgo(huella_filtrado, int(escenarios), df_filtrado)
+        resumen = resumen_riesgo(resultado_riesgo, nivel_riesgo, fecha_objetivo).reset_index()
+        st.dataframe(
+            resumen,
+            column_config={
+                **{f"P{p}": st.column_config.DateColumn(f"P{p}", format="DD/MM/YYYY") for p in (50, 80, 95)},
+                "Probabilidad": st.column_config.ProgressColumn(
+                    f"Terminar al {fecha_objetivo:%d/%m/%Y}", format="%.0f%%", min_value=0, max_value=100
+                ),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption(
+            "P50/P80/P95: fecha en la que termina el 50/80/95% de los escenarios. Las duraciones "
+            "varían según el histórico de su estado y prioridad y respetan las dependencias"
+        )
 
-def agregar_indicadores_mensuales(fig, fecha_min, fecha_max):
-    """Agregar indicadores visuales para los meses"""
-    meses_es = {
-        1: "ENE", 2: "FEB", 3: "MAR", 4: "ABR", 5: "MAY", 6: "JUN",
-        7: "JUL", 8: "AGO", 9: "SEP", 10: "OCT", 11: "NOV", 12: "DIC"
-    }
+@fragmento("seccion_burndown")
+def seccion_burndown(version_hist):
+    """Burndown, burnup y velocidad de la dimensión elegida"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from metricas_historial import DIMENSIONES, burndown, burnup, velocidad_semanal
+    
+    metricas = cargar_metricas_historial(version_hist)
+    col1, col2 = st.columns(2)
+    with col1:
+        dimension = st.selectbox(
+            "Agrupar por:",
+            list(DIMENSIONES),
+            format_func=DIMENSIONES.get,
+            key="burndown_dimension"
+        )
+    valores = sorted(metricas.loc[metricas['dimension'] == dimension, 'valor'].unique().tolist())
+    with col2:
+        valor = st.selectbox("Valor:", valores, key="burndown_valor") if dimension != "total" else DIMENSIONES["total"]
     
-    current_date = fecha_min.replace(day=1)
-    while current_date <= fecha_max:
-        # Agregar etiqueta del mes en la parte superior
-        fig.add_annotation(
-            x=current_date + timedelta(days=15),  # Centrado en el mes
-            y=1.02,  # Arriba del gráfico
-            text=f"<b>{meses_es[current_date.month]}</b>",
-            showarrow=False,
-            yref="paper",
-            font=dict(size=11, color="#657786", family="Segoe UI"),
-            bgcolor="rgba(255,255,255,0.8)",
-            bordercolor="#E1E8ED",
-            borderwidth=1
+    col1, col2 = st.columns(2)
+    with col1:
+        serie = burndown(metricas, dimension, valor)
+        fig_burndown = px.line(
+            serie, y=valor,
+            title=f"Burndown - {valor}",
+            labels={'index': 'Fecha', valor: 'Tareas pendientes'}
         )
-        
-        # Siguiente mes
-        if current_date.month == 12:
-            current_date = current_date.replace(year=current_date.year + 1, month=1)
-        else:
-            current_date = current_date.replace(month=current_date.month + 1)
+        fig_burndown.update_layout(height=350, showlegend=False)
+        st.plotly_chart(fig_burndown, use_container_width=True)
+    
+    with col2:
+        serie_burnup = burnup(metricas, dimension, valor)
+        fig_burnup = go.Figure()
+        fig_burnup.add_trace(go.Scatter(x=serie_burnup.index, y=serie_burnup['total'], name="Alcance", line=dict(color="#764ba2", dash="dash")))
+        fig_burnup.add_trace(go.Scatter(x=serie_burnup.index, y=serie_burnup['completadas'], name="Completadas", fill="tozeroy", line=dict(color="#45B7D1")))
+        fig_burnup.update_layout(title=f"Burnup - {valor}", height=350)
+        st.plotly_chart(fig_burnup, use_container_width=True)
+    
+    velocidad = velocidad_semanal(metricas, dimension)
+    if valor in velocidad and not velocidad.empty:
+        fig_velocidad = px.bar(
+            x=velocidad.index, y=velocidad[valor],
+            title=f"Velocidad semanal - {valor}",
+            labels={'x': 'Semana', 'y': 'Tareas completadas'}
+        )
+        fig_velocidad.update_layout(height=300)
+        st.plotly_chart(fig_velocidad, use_container_width=True)
+    else:
+        st.info("ℹ️ Se necesitan al menos dos semanas de historial para calcular la velocidad")
 
-# Cargar datos
-data = cargar_datos()
+# Cargar datos: primero los cachés por espacio, si no el JSON combinado
+with medir("cargar_datos"):
+    contar("cache_consultas_dataset")
+    dataset = obtener_dataset(config)
 
-if data:
-    # Procesar datos
-    df = procesar_datos_gantt(data)
+if dataset:
+    # DataFrame compartido por todas las sesiones: no se modifica, solo se filtra
+    df = dataset['df']
+    opciones = dataset['opciones']
+    entradas_espacios = dataset['entradas']
+    fijar("dataset_tareas", len(df))
+    
+    # Estado de sincronización por espacio
+    if entradas_espacios:
+        with st.sidebar.expander("🛰️ Espacios sincronizados"):
+            for entrada in entradas_espacios:
+                icono = "✅" if entrada['estado'] == 'ok' else "⚠️"
+                st.write(f"{icono} **{entrada['area']}** ({entrada['space_id']})")
+                st.caption(f"Última sincronización: {entrada.get('ultima_sincronizacion') or 'nunca'}")
+                if entrada.get('error'):
+                    st.caption(f"Error: {entrada['error']}")
     
     # Sidebar con filtros
     st.sidebar.header("🔍 Filtros")
@@ -569,31 +685,51 @@ if data:
         index=2  # Por defecto "Meses"
     )
     
+    # Disposición del diagrama: una fila por tarea o carriles compartidos
+    disposicion = st.sidebar.selectbox(
+        "🧩 Disposición del Gantt:",
+        ["Una fila por tarea", "Compacta por asignado", "Compacta por lista"],
+        help="La vista compacta ubica en la misma fila las tareas que no se solapan en el tiempo"
+    )
+    resaltar_ruta = st.sidebar.checkbox(
+        "🧭 Resaltar ruta crítica",
+        help="Marca las tareas sin holgura según las dependencias de ClickUp"
+    )
+    
+    # Filtro por área (solo si hay varias áreas o espacios)
+    areas_disponibles = opciones['areas']
+    area_seleccionada = "Todas"
+    if len(areas_disponibles) > 1:
+        area_seleccionada = st.sidebar.selectbox("🏢 Área:", ["Todas"] + areas_disponibles)
+    
     # Filtro por carpeta
-    carpetas = ["Todas"] + sorted(df['Carpeta'].unique().tolist())
+    carpetas = ["Todas"] + opciones['carpetas']
     carpeta_seleccionada = st.sidebar.selectbox("📁 Carpeta:", carpetas)
     
     # Filtro por estado
-    estados = ["Todos"] + sorted(df['Estado'].unique().tolist())
+    estados = ["Todos"] + opciones['estados']
     estado_seleccionado = st.sidebar.multiselect("📊 Estado:", estados, default=["Todos"])
     
     # Filtro por prioridad
-    prioridades = ["Todas"] + sorted(df['Prioridad'].unique().tolist())
+    prioridades = ["Todas"] + opciones['prioridades']
     prioridad_seleccionada = st.sidebar.multiselect("⚡ Prioridad:", prioridades, default=["Todas"])
     
     # Filtro por asignado
-    todos_asignados = set()
-    for asignados in df['Asignados']:
-        if asignados != "Sin asignar":
-            todos_asignados.update([a.strip() for a in asignados.split(",")])
-    
-    asignados_list = ["Todos"] + sorted(list(todos_asignados))
+    asignados_list = ["Todos"] + opciones['asignados']
     asignado_seleccionado = st.sidebar.selectbox("👤 Asignado:", asignados_list)
     
+    # Filtro por alertas: columnas ya calculadas al procesar el dataset
+    alertas_seleccionadas = st.sidebar.multiselect(
+        "🚨 Alertas:",
+        list(CATEGORIAS_RIESGO),
+        format_func=CATEGORIAS_RIESGO.get,
+        help=f"Vence pronto: en los próximos {DIAS_AVISO} días hábiles"
+    )
+    
     # Filtro por rango de fechas
     st.sidebar.subheader("📅 Rango de Fechas")
-    fecha_min = df['Fecha_Inicio'].min()
-    fecha_max = df['Fecha_Limite'].max()
+    fecha_min = opciones['fecha_min']
+    fecha_max = opciones['fecha_max']
     
     col1, col2 = st.sidebar.columns(2)
     with col1:
@@ -602,25 +738,21 @@ if data:
         fecha_fin_filtro = st.date_input("Hasta:", fecha_max)
     
     # Aplicar filtros
-    df_filtrado = df.copy()
-    
-    if carpeta_seleccionada != "Todas":
-        df_filtrado = df_filtrado[df_filtrado['Carpeta'] == carpeta_seleccionada]
-    
-    if "Todos" not in estado_seleccionado and estado_seleccionado:
-        df_filtrado = df_filtrado[df_filtrado['Estado'].isin(estado_seleccionado)]
-    
-    if "Todas" not in prioridad_seleccionada and prioridad_seleccionada:
-        df_filtrado = df_filtrado[df_filtrado['Prioridad'].isin(prioridad_seleccionada)]
-    
-    if asignado_seleccionado != "Todos":
-        df_filtrado = df_filtrado[df_filtrado['Asignados'].str.contains(asignado_seleccionado, na=False)]
+    filtros = {
+        'area': area_seleccionada,
+        'carpeta': carpeta_seleccionada,
+        'estados': estado_seleccionado,
+        'prioridades': prioridad_seleccionada,
+        'asignado': asignado_seleccionado,
+        'fechas': (fecha_inicio_filtro, fecha_fin_filtro),
+        'alertas': alertas_seleccionadas,
+    }
+    df_filtrado = aplicar_filtros_gantt(df, filtros)
+    fijar("vista_tareas_filtradas", len(df_filtrado))
     
-    # Filtro por fechas
-    df_filtrado = df_filtrado[
-        (df_filtrado['Fecha_Inicio'].dt.date >= fecha_inicio_filtro) &
-        (df_filtrado['Fecha_Limite'].dt.date <= fecha_fin_filtro)
-    ]
+    # Todos los números del dashboard salen del cubo pre-agregado
+    cubo_vista = cubo_para_filtros(dataset['cubo'], df_filtrado, filtros, (fecha_min, fecha_max))
+    stats = calcular_estadisticas_avanzadas(df_filtrado, cubo_vista)
     
     # Mostrar métricas con diseño moderno
     st.markdown("### 📊 Resumen del Proyecto")
@@ -628,13 +760,11 @@ if data:
     col1, col2, col3, col4 = st.columns(4)
     
     # Calcular métricas
-    total_tareas = len(df_filtrado)
-    pendientes = len(df_filtrado[df_filtrado['Estado'] == 'Pendiente'])
-    en_progreso = len(df_filtrado[df_filtrado['Estado'] == 'En Progreso'])
-    completadas = len(df_filtrado[df_filtrado['Estado'] == 'Completado'])
-    
-    # Calcular porcentaje de progreso
-    progreso_pct = (completadas / total_tareas * 100) if total_tareas > 0 else 0
+    total_tareas = stats['total']
+    pendientes = int(stats['por_estado'].get('Pendiente', 0))
+    en_progreso = int(stats['por_estado'].get('En Progreso', 0))
+    completadas = stats['completadas']
+    progreso_pct = stats['progreso_porcentaje']
     
     with col1:
         st.markdown(
@@ -709,6 +839,11 @@ if data:
             unsafe_allow_html=True
         )
     
+    # Alertas de la vista (conteos sobre las columnas del dataset)
+    conteo_alertas = resumen_alertas(df_filtrado)
+    for columna_metrica, (columna, cantidad) in zip(st.columns(len(conteo_alertas)), conteo_alertas.items()):
+        columna_metrica.metric(CATEGORIAS_RIESGO[columna], cantidad)
+    
     st.markdown("---")
     
     # Mostrar información de la escala temporal con estilo moderno
@@ -796,141 +931,69 @@ if data:
                                 unsafe_allow_html=True
                             )
     
-    # Crear y mostrar el diagrama de Gantt
-    fig = crear_diagrama_gantt(df_filtrado, escala_temporal)
-    if fig:
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Mostrar tabla de datos
-    st.subheader("📋 Detalle de Tareas")
-    
-    # Formatear DataFrame para mostrar
-    df_mostrar = df_filtrado[['Nombre_Completo', 'Carpeta', 'Lista', 'Estado', 'Asignados', 'Prioridad', 'Fecha_Inicio', 'Fecha_Limite']].copy()
-    df_mostrar['Fecha_Inicio'] = df_mostrar['Fecha_Inicio'].dt.strftime('%d/%m/%Y')
-    df_mostrar['Fecha_Limite'] = df_mostrar['Fecha_Limite'].dt.strftime('%d/%m/%Y')
-    
-    df_mostrar.columns = ['Tarea', 'Carpeta', 'Lista', 'Estado', 'Asignados', 'Prioridad', 'Fecha Inicio', 'Fecha Límite']
+    # Módulos de gráficos: se cargan después del primer render (título, filtros y métricas)
+    inicio_graficos = time.perf_counter()
+    import graficos_gantt  # noqa: F401
+    log_debug(
+        f"Primer render en {(inicio_graficos - _INICIO_SCRIPT) * 1000:.0f} ms, "
+        f"módulos de gráficos en {(time.perf_counter() - inicio_graficos) * 1000:.0f} ms",
+        config
+    )
     
-    st.dataframe(
-        df_mostrar,
-        use_container_width=True,
-        hide_index=True
+    # Ruta crítica según las dependencias (los datasets anteriores no traen la columna)
+    huella_filtrado = huella_datos(df_filtrado)
+    con_dependencias = not df_filtrado.empty and 'Dependencias' in df_filtrado.columns
+    ruta, ciclos, criticas = None, [], None
+    if resaltar_ruta and con_dependencias:
+        modelo = modelo_ruta_critica(huella_filtrado, df_filtrado)
+        ruta, ciclos = modelo['ruta'], modelo['programa']['ciclos']
+        criticas = ruta.index[ruta['Critica']].tolist()
+    
+    # Crear y mostrar el diagrama de Gantt (la figura de esta vista se reutiliza entre ejecuciones)
+    fig = figura_gantt(
+        huella_filtrado, escala_temporal, disposicion, criticas is not None, date.today().isoformat(),
+        df_filtrado, criticas
     )
+    if fig:
+        with medir("enviar_gantt"):
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning("⚠️ No hay datos para mostrar con los filtros seleccionados")
     
-    # Opción para descargar datos filtrados
-    col1, col2 = st.columns(2)
+    if ruta is not None:
+        with st.expander(f"🧭 Ruta Crítica ({len(criticas)} tareas sin holgura)"):
+            seccion_ruta_critica(df_filtrado, ruta, ciclos)
     
-    with col1:
-        csv = df_mostrar.to_csv(index=False, encoding='utf-8')
-        st.download_button(
-            label="📥 Descargar CSV",
-            data=csv,
-            file_name=f"tareas_filtradas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+    # Simulación: el efecto de mover una tarea se calcula solo sobre sus sucesoras
+    if con_dependencias:
+        with st.expander("🔮 Simulación: mover una tarea"):
+            mostrar_simulacion(df_filtrado, modelo_ruta_critica(huella_filtrado, df_filtrado))
     
-    with col2:
-        excel_data = exportar_a_excel(df_filtrado)
-        if excel_data:
-            st.download_button(
-                label="📊 Descargar Excel",
-                data=excel_data,
-                file_name=f"tareas_gantt_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+    # Cada sección se vuelve a ejecutar sola cuando cambian sus propios widgets
+    seccion_detalle(df_filtrado, huella_filtrado)
     
-    # Mostrar estadísticas avanzadas si está activado
-    if st.session_state.get('show_stats', False):
-        st.markdown("---")
-        st.subheader("📈 Estadísticas Avanzadas del Proyecto")
-        
-        stats = calcular_estadisticas_avanzadas(df_filtrado)
-        
-        # Métricas de progreso
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric(
-                "📊 Progreso General", 
-                f"{stats['progreso_porcentaje']:.1f}%",
-                delta=f"{stats['progreso_porcentaje']:.1f}%" if stats['progreso_porcentaje'] > 50 else None
-            )
-        
-        with col2:
-            duracion_promedio = np.mean(list(stats['duracion_promedio'].values()))
-            st.metric("⏱️ Duración Promedio", f"{duracion_promedio:.1f} días")
-        
-        with col3:
-            personas_activas = len(stats['carga_trabajo'])
-            st.metric("👥 Personas Activas", personas_activas)
-        
-        # Gráficos de estadísticas
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if stats['carga_trabajo']:
-                st.subheader("👤 Carga de Trabajo por Persona")
-                fig_carga = px.bar(
-                    x=list(stats['carga_trabajo'].values()),
-                    y=list(stats['carga_trabajo'].keys()),
-                    orientation='h',
-                    title="Número de Tareas Asignadas",
-                    labels={'x': 'Número de Tareas', 'y': 'Persona'},
-                    color=list(stats['carga_trabajo'].values()),
-                    color_continuous_scale="viridis"
-                )
-                fig_carga.update_layout(height=400)
-                st.plotly_chart(fig_carga, use_container_width=True)
-        
-        with col2:
-            if stats['duracion_promedio']:
-                st.subheader("⏱️ Duración Promedio por Estado")
-                estados = list(stats['duracion_promedio'].keys())
-                duraciones = list(stats['duracion_promedio'].values())
-                
-                fig_duracion = px.bar(
-                    x=estados,
-                    y=duraciones,
-                    title="Días Promedio por Estado",
-                    labels={'x': 'Estado', 'y': 'Días Promedio'},
-                    color=duraciones,
-                    color_continuous_scale="blues"
-                )
-                fig_duracion.update_layout(height=400)
-                st.plotly_chart(fig_duracion, use_container_width=True)
-    
-    # Mostrar estadísticas adicionales
-    with st.expander("📊 Estadísticas Adicionales"):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("📈 Distribución por Estado")
-            estado_counts = df_filtrado['Estado'].value_counts()
-            fig_pie = px.pie(
-                values=estado_counts.values,
-                names=estado_counts.index,
-                title="Distribución de Tareas por Estado",
-                color_discrete_map={
-                    "Pendiente": "#FF6B6B",
-                    "En Progreso": "#4ECDC4", 
-                    "Completado": "#45B7D1"
-                }
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
-        
-        with col2:
-            st.subheader("⚡ Distribución por Prioridad")
-            prioridad_counts = df_filtrado['Prioridad'].value_counts()
-            fig_bar = px.bar(
-                x=prioridad_counts.index,
-                y=prioridad_counts.values,
-                title="Distribución de Tareas por Prioridad",
-                labels={'x': 'Prioridad', 'y': 'Cantidad de Tareas'},
-                color=prioridad_counts.values,
-                color_continuous_scale="viridis"
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
+    st.markdown("---")
+    seccion_estadisticas(stats)
+    
+    # Carga diaria por persona (tareas activas a la vez según sus fechas)
+    with st.expander("🔥 Carga de Trabajo Diaria por Persona"):
+        seccion_carga(df_filtrado, fecha_inicio_filtro, fecha_fin_filtro)
+    
+    # Riesgo de cronograma: percentiles de fin por carpeta y lista (bajo demanda)
+    if not df_filtrado.empty:
+        with st.expander("🎲 Riesgo del Cronograma (Monte Carlo)"):
+            seccion_riesgo(df_filtrado, huella_filtrado)
+    
+    # Burndown, burnup y velocidad a partir del historial de sincronizaciones
+    version_hist = version_historial()
+    if version_hist:
+        with st.expander("📉 Burndown, Burnup y Velocidad"):
+            seccion_burndown(version_hist)
 
 else:
     st.error("No se pudieron cargar los datos. Asegúrate de que el archivo 'tareas_sin_subtareas.json' esté presente.")
     st.info("💡 **Sugerencia:** Ejecuta primero el script 'main.py' para generar los datos desde ClickUp.")
+
+# Tiempo total de esta ejecución y panel de latencias (solo en modo debug)
+registrar_tiempo("ejecucion_script", time.perf_counter() - _INICIO_SCRIPT)
+mostrar_panel_latencias(config)
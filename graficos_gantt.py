@@ -0,0 +1,469 @@
+"""
+Construcción del diagrama de Gantt con Plotly
+Se importa de forma diferida desde gantt_app para no cargar Plotly antes del primer render
+"""
+import heapq
+from datetime import datetime, timedelta
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from instrumentacion import cronometrado
+
+
+# Borde de las barras en la ruta crítica
+BORDE_CRITICO = dict(color='#D62728', width=4)
+
+
+@cronometrado("diagrama_gantt")
+def crear_diagrama_gantt(df_filtrado, escala_temporal="Meses", criticas=None):
+    """
+    Crear diagrama de Gantt moderno y profesional como en la imagen de referencia.
+    `criticas`: etiquetas del índice de las tareas en la ruta crítica (se resaltan)
+    """
+    if df_filtrado.empty:
+        return None
+    
+    # Paleta de colores moderna y profesional
+    colores_estado = {
+        "Pendiente": "#FF6B6B",      # Rojo coral vibrante
+        "En Progreso": "#4ECDC4",    # Turquesa moderno
+        "Completado": "#45B7D1",     # Azul cielo
+        "Pausado": "#96CEB4",        # Verde menta
+        "Cancelado": "#FECA57"       # Amarillo cálido
+    }
+    
+    # Colores de prioridad para intensidad
+    colores_prioridad = {
+        "Alta": 1.0,
+        "Media": 0.8,
+        "Baja": 0.6,
+        "Crítica": 1.2
+    }
+    
+    # Crear figura principal
+    fig = go.Figure()
+    
+    # Ordenar tareas por fecha de inicio y prioridad
+    df_sorted = df_filtrado.sort_values(['Fecha_Inicio', 'Prioridad'])
+    
+    # Obtener rango de fechas
+    fecha_min = df_sorted['Fecha_Inicio'].min()
+    fecha_max = df_sorted['Fecha_Limite'].max()
+    
+    # Crear barras del diagrama de Gantt
+    estados_agregados = set()
+    criticas = set(criticas or ())
+    
+    for idx, (etiqueta, row) in enumerate(df_sorted.iterrows()):
+        # Obtener color base y ajustar intensidad por prioridad
+        color_base = colores_estado.get(row['Estado'], '#9E9E9E')
+        intensidad = colores_prioridad.get(row['Prioridad'], 0.8)
+        
+        # Calcular altura de la barra (más gruesa para mayor impacto visual)
+        altura_barra = 0.6
+        
+        # Crear etiqueta corta y clara para el eje Y
+        etiqueta_y = f"{idx+1:02d}. {row['Tarea'][:35]}{'...' if len(row['Tarea']) > 35 else ''}"
+        
+        # Agregar la barra del Gantt
+        fig.add_trace(go.Bar(
+            x=[row['Duracion']],
+            y=[etiqueta_y],
+            base=[row['Fecha_Inicio']],
+            orientation='h',
+            name=row['Estado'],
+            marker=dict(
+                color=color_base,
+                opacity=intensidad,
+                line=BORDE_CRITICO if etiqueta in criticas else dict(color='rgba(255,255,255,0.8)', width=2)
+            ),
+            showlegend=row['Estado'] not in estados_agregados,
+            text=f"📋 {row['Asignados'][:15]}{'...' if len(row['Asignados']) > 15 else ''}",
+            textposition='inside',
+            textfont=dict(
+                color='white', 
+                size=9, 
+                family="Segoe UI, Arial"
+            ),
+            width=altura_barra,
+            hovertemplate=f"<b>🎯 {row['Tarea']}</b><br>" +
+                         f"📊 Estado: <b>{row['Estado']}</b><br>" +
+                         f"📅 Inicio: <b>{row['Fecha_Inicio'].strftime('%d/%m/%Y')}</b><br>" +
+                         f"🏁 Fin: <b>{row['Fecha_Limite'].strftime('%d/%m/%Y')}</b><br>" +
+                         f"⏱️ Duración: <b>{row['Duracion']} días</b><br>" +
+                         f"👤 Asignados: <b>{row['Asignados']}</b><br>" +
+                         f"⚡ Prioridad: <b>{row['Prioridad']}</b><br>" +
+                         f"📁 Carpeta: <b>{row['Carpeta']}</b><br>" +
+                         "<extra></extra>"
+        ))
+        
+        estados_agregados.add(row['Estado'])
+    
+    completar_figura(fig, fecha_min, fecha_max, escala_temporal, len(df_sorted))
+    
+    return fig
+
+
+# Columnas por las que se pueden compartir carriles en la vista compacta
+# (Persona sale de separar_asignados: una fila por tarea y asignado)
+AGRUPACIONES_CARRILES = {"Asignado": ["Persona"], "Lista": ["Carpeta", "Lista"]}
+MS_POR_DIA = 86400000
+
+
+def asignar_carriles(inicios, fines):
+    """
+    Partición greedy de intervalos ya ordenados por inicio: cada tarea reutiliza el
+    carril que se libera antes (heap de fines) o abre uno nuevo. Devuelve (carril
+    de cada tarea, cantidad de carriles), que es el mínimo posible
+    """
+    carriles = []
+    ocupados = []  # heap de (fin, carril)
+    for inicio, fin in zip(inicios, fines):
+        if ocupados and ocupados[0][0] <= inicio:
+            carril = heapq.heappop(ocupados)[1]
+        else:
+            carril = len(ocupados)
+        carriles.append(carril)
+        heapq.heappush(ocupados, (fin, carril))
+    return carriles, len(ocupados)
+
+
+def separar_asignados(df):
+    """
+    Una fila por tarea y persona (columna Persona), así una tarea compartida ocupa
+    el carril de cada asignado. "Sin asignar" queda como un grupo más
+    """
+    separadas = df.assign(Persona=df['Asignados'].astype(str).str.split(",")).explode('Persona')
+    separadas['Persona'] = separadas['Persona'].str.strip()
+    return separadas
+
+
+def empaquetar_carriles(df, columnas):
+    """
+    Etiqueta de carril de cada tarea dentro de su grupo (valores de `columnas`). Devuelve
+    (serie de etiquetas alineada con df, etiquetas en orden de dibujo)
+    """
+    import numpy as np
+
+    inicios = df['Fecha_Inicio'].astype('datetime64[ns]').to_numpy().astype('int64')
+    # Las barras ocupan Duracion días desde el inicio (fecha límite inclusive)
+    fines = inicios + df['Duracion'].astype('int64').to_numpy() * (MS_POR_DIA * 1_000_000)
+    clave = df[columnas[0]].astype(str)
+    for columna in columnas[1:]:
+        clave = clave + " / " + df[columna].astype(str)
+    codigos, grupos = pd.factorize(clave, sort=True)
+    # Un solo recorrido ordenado por (grupo, inicio); los límites de grupo parten el arreglo
+    orden = np.lexsort((inicios, codigos))
+    cortes = np.flatnonzero(np.diff(codigos[orden])) + 1
+
+    etiquetas = np.empty(len(df), dtype=object)
+    orden_dibujo = []
+    for posiciones in np.split(orden, cortes):
+        if not len(posiciones):
+            continue
+        grupo = grupos[codigos[posiciones[0]]]
+        carriles, total = asignar_carriles(inicios[posiciones].tolist(), fines[posiciones].tolist())
+        nombres = [grupo] if total == 1 else [f"{grupo} · {c + 1}" for c in range(total)]
+        etiquetas[posiciones] = [nombres[c] for c in carriles]
+        orden_dibujo.extend(nombres)
+    return pd.Series(etiquetas, index=df.index), orden_dibujo
+
+
+@cronometrado("diagrama_gantt_compacto")
+def crear_diagrama_gantt_compacto(df_filtrado, escala_temporal="Meses", agrupar_por="Asignado", criticas=None):
+    """
+    Diagrama de Gantt con carriles compartidos: las tareas de una misma persona o
+    lista que no se solapan en el tiempo van en la misma fila. Por asignado, una
+    tarea con varias personas aparece en el carril de cada una. Una traza por estado
+    """
+    if df_filtrado.empty:
+        return None
+
+    colores_estado = {
+        "Pendiente": "#FF6B6B",
+        "En Progreso": "#4ECDC4",
+        "Completado": "#45B7D1",
+        "Pausado": "#96CEB4",
+        "Cancelado": "#FECA57"
+    }
+
+    if agrupar_por == "Asignado":
+        df_filtrado = separar_asignados(df_filtrado)
+    etiquetas, orden = empaquetar_carriles(df_filtrado, AGRUPACIONES_CARRILES[agrupar_por])
+    en_ruta = df_filtrado.index.isin(criticas or [])
+    fig = go.Figure()
+    for estado, posiciones in df_filtrado.groupby('Estado', sort=True, observed=True).indices.items():
+        tareas = df_filtrado.iloc[posiciones]
+        critica = en_ruta[posiciones]
+        fig.add_trace(go.Bar(
+            x=tareas['Duracion'].astype('int64').to_numpy() * MS_POR_DIA,
+            y=etiquetas.iloc[posiciones].to_numpy(),
+            base=tareas['Fecha_Inicio'].astype('datetime64[ns]').to_numpy(),
+            orientation='h',
+            name=str(estado),
+            marker=dict(
+                color=colores_estado.get(estado, '#9E9E9E'),
+                line=dict(
+                    color=[BORDE_CRITICO['color'] if c else 'rgba(255,255,255,0.8)' for c in critica],
+                    width=[BORDE_CRITICO['width'] if c else 1 for c in critica]
+                )
+            ),
+            text=tareas['Tarea'].astype(str).str.slice(0, 25).to_numpy(),
+            textposition='inside',
+            insidetextanchor='start',
+            textfont=dict(color='white', size=9, family="Segoe UI, Arial"),
+            width=0.6,
+            customdata=tareas[['Tarea', 'Asignados', 'Prioridad', 'Duracion']].astype(str).to_numpy(),
+            hovertemplate="<b>🎯 %{customdata[0]}</b><br>" +
+                          f"📊 Estado: <b>{estado}</b><br>" +
+                          "📅 Inicio: <b>%{base|%d/%m/%Y}</b><br>" +
+                          "⏱️ Duración: <b>%{customdata[3]} días</b><br>" +
+                          "👤 Asignados: <b>%{customdata[1]}</b><br>" +
+                          "⚡ Prioridad: <b>%{customdata[2]}</b><br>" +
+                          "<extra></extra>"
+        ))
+
+    completar_figura(
+        fig, df_filtrado['Fecha_Inicio'].min(), df_filtrado['Fecha_Limite'].max(), escala_temporal, len(orden)
+    )
+    # Los carriles se muestran agrupados y en orden, con el primero arriba
+    fig.update_yaxes(
+        categoryorder='array',
+        categoryarray=orden[::-1],
+        title=f"📋 Carriles por {agrupar_por.lower()}"
+    )
+    fig.update_layout(barmode='overlay')
+    return fig
+
+
+def completar_figura(fig, fecha_min, fecha_max, escala_temporal, filas):
+    """Fondo, layout, ejes, línea de hoy e indicadores comunes a todos los diagramas de Gantt"""
+    # Configurar el fondo y separadores según la escala temporal
+    configurar_fondo_temporal(fig, fecha_min, fecha_max, escala_temporal)
+    
+    # Layout moderno y profesional
+    fig.update_layout(
+        title={
+            'text': f"📅 Cronograma del Proyecto - Vista por {escala_temporal}",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {
+                'size': 24, 
+                'family': 'Segoe UI, Arial Black', 
+                'color': '#2C3E50'
+            },
+            'pad': {'t': 20}
+        },
+        height=max(600, filas * 45 + 200),
+        margin=dict(l=280, r=100, t=120, b=80),
+        plot_bgcolor='#FAFBFC',
+        paper_bgcolor='white',
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.15,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=12, family="Segoe UI"),
+            bordercolor="#E1E8ED",
+            borderwidth=2,
+            bgcolor="rgba(255,255,255,0.95)",
+            itemsizing="constant",
+            itemwidth=30
+        ),
+        font=dict(family="Segoe UI, Arial", size=11),
+        hovermode='closest',
+        bargap=0.3,
+        bargroupgap=0.1
+    )
+    
+    # Configurar ejes con estilo moderno
+    configurar_ejes(fig, escala_temporal, fecha_min, fecha_max)
+    
+    # Agregar línea de "HOY" con estilo destacado
+    agregar_linea_hoy(fig, fecha_min, fecha_max)
+    
+    # Agregar indicadores de progreso visual si es necesario
+    if escala_temporal == "Meses":
+        agregar_indicadores_mensuales(fig, fecha_min, fecha_max)
+
+
+def configurar_fondo_temporal(fig, fecha_min, fecha_max, escala_temporal):
+    """Configurar el fondo según la escala temporal seleccionada"""
+    if escala_temporal == "Meses":
+        # Colores suaves alternados para meses
+        colores_meses = ['#E3F2FD', '#F3E5F5', '#E8F5E8', '#FFF3E0', '#FCE4EC', '#E0F2F1']
+        
+        current_date = fecha_min.replace(day=1)
+        mes_idx = 0
+        
+        while current_date <= fecha_max:
+            # Calcular el siguiente mes
+            if current_date.month == 12:
+                next_month = current_date.replace(year=current_date.year + 1, month=1)
+            else:
+                next_month = current_date.replace(month=current_date.month + 1)
+            
+            # Agregar fondo alternado para cada mes
+            fig.add_vrect(
+                x0=current_date,
+                x1=min(next_month, fecha_max),
+                fillcolor=colores_meses[mes_idx % len(colores_meses)],
+                opacity=0.3,
+                layer="below",
+                line_width=0
+            )
+            
+            current_date = next_month
+            mes_idx += 1
+    
+    elif escala_temporal == "Semanas":
+        # Rayas verticales suaves para semanas
+        current_date = fecha_min
+        while current_date <= fecha_max:
+            fig.add_vline(
+                x=current_date,
+                line_width=1,
+                line_color="#E1E8ED",
+                opacity=0.5,
+                line_dash="dot"
+            )
+            current_date += timedelta(weeks=1)
+
+
+def configurar_ejes(fig, escala_temporal, fecha_min, fecha_max):
+    """Configurar los ejes X e Y con estilos modernos"""
+    
+    # Configuración del eje X según escala temporal
+    if escala_temporal == "Días":
+        fig.update_xaxes(
+            dtick=86400000.0,  # Cada día
+            tickformat="%d/%m",
+            tickangle=45,
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(225, 232, 237, 0.8)',
+            title="📅 Días",
+            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
+            tickfont=dict(size=10, color='#657786')
+        )
+    elif escala_temporal == "Semanas":
+        fig.update_xaxes(
+            dtick=86400000.0 * 7,  # Cada semana
+            tickformat="Sem %U",
+            tickangle=45,
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(225, 232, 237, 0.8)',
+            title="📅 Semanas",
+            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
+            tickfont=dict(size=10, color='#657786')
+        )
+    elif escala_temporal == "Años":
+        fig.update_xaxes(
+            dtick="M12",  # Cada año
+            tickformat="%Y",
+            tickangle=0,
+            showgrid=True,
+            gridwidth=2,
+            gridcolor='rgba(225, 232, 237, 0.8)',
+            title="📅 Años",
+            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
+            tickfont=dict(size=12, color='#657786')
+        )
+    else:  # Meses (por defecto)
+        fig.update_xaxes(
+            dtick="M1",
+            tickformat="%b<br>%Y",
+            tickangle=0,
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(225, 232, 237, 0.8)',
+            title="📅 Cronograma Mensual",
+            title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
+            tickfont=dict(size=10, color='#657786'),
+            showspikes=True,
+            spikecolor="rgba(68, 68, 68, 0.5)",
+            spikesnap="cursor",
+            spikemode="across"
+        )
+    
+    # Configuración del eje Y
+    fig.update_yaxes(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor='rgba(225, 232, 237, 0.5)',
+        tickfont=dict(size=10, color='#14171A', family="Segoe UI"),
+        title="📋 Tareas del Proyecto",
+        title_font=dict(size=14, color='#2C3E50', family="Segoe UI"),
+        categoryorder='total ascending',
+        ticksuffix="  ",
+        automargin=True
+    )
+
+
+def agregar_linea_hoy(fig, fecha_min, fecha_max):
+    """Agregar línea indicadora del día actual"""
+    hoy = datetime.now()
+    if fecha_min <= hoy <= fecha_max:
+        fig.add_shape(
+            type="line",
+            x0=hoy,
+            x1=hoy,
+            y0=0,
+            y1=1,
+            yref="paper",
+            line=dict(
+                color="#E1306C",
+                width=3
+            ),
+            opacity=0.9
+        )
+        
+        # Agregar anotación
+        fig.add_annotation(
+            x=hoy,
+            y=1.02,
+            yref="paper",
+            text="📍 HOY",
+            showarrow=False,
+            font=dict(
+                size=12, 
+                color="#E1306C", 
+                family="Segoe UI"
+            ),
+            bgcolor="rgba(255,255,255,0.9)",
+            bordercolor="#E1306C",
+            borderwidth=1
+        )
+
+
+def agregar_indicadores_mensuales(fig, fecha_min, fecha_max):
+    """Agregar indicadores visuales para los meses"""
+    meses_es = {
+        1: "ENE", 2: "FEB", 3: "MAR", 4: "ABR", 5: "MAY", 6: "JUN",
+        7: "JUL", 8: "AGO", 9: "SEP", 10: "OCT", 11: "NOV", 12: "DIC"
+    }
+    
+    current_date = fecha_min.replace(day=1)
+    while current_date <= fecha_max:
+        # Agregar etiqueta del mes en la parte superior
+        fig.add_annotation(
+            x=current_date + timedelta(days=15),  # Centrado en el mes
+            y=1.02,  # Arriba del gráfico
+            text=f"<b>{meses_es[current_date.month]}</b>",
+            showarrow=False,
+            yref="paper",
+            font=dict(size=11, color="#657786", family="Segoe UI"),
+            bgcolor="rgba(255,255,255,0.8)",
+            bordercolor="#E1E8ED",
+            borderwidth=1
+        )
+        
+        # Siguiente mes
+        if current_date.month == 12:
+            current_date = current_date.replace(year=current_date.year + 1, month=1)
+        else:
+            current_date = current_date.replace(month=current_date.month + 1)
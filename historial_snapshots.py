@@ -0,0 +1,321 @@
+"""
+Historial de sincronizaciones: almacén append-only de snapshots
+Cada sincronización se guarda como un delta por id de tarea (insertadas,
+campos actualizados o quitados, eliminadas) sobre checkpoints completos
+periódicos (una sincronización con checkpoint no guarda delta). Se guardan
+todos los campos de cada tarea (p. ej. dependencias), así la reconstrucción
+devuelve lo que se sincronizó
+Leer una fecha carga el checkpoint anterior y aplica solo los deltas posteriores.
+Una fecha sin hora se registra al comienzo del día y se consulta hasta su final
+
+Uso:
+    python historial_snapshots.py registrar tareas_sin_subtareas.json
+    python historial_snapshots.py reconstruir 2025-06-02 salida.json
+    python historial_snapshots.py cambios 2025-06-02
+"""
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+
+CARPETA_HISTORIAL = "historial"
+ARCHIVO_DELTAS = "deltas.jsonl"
+ARCHIVO_INDICE = "indice.json"
+CARPETA_CHECKPOINTS = "checkpoints"
+
+# Cada cuántas sincronizaciones se guarda un checkpoint completo;
+# acota los deltas a aplicar en una lectura puntual
+INTERVALO_CHECKPOINT = 30
+
+# Ubicación de la tarea en el JSON anidado; el resto de campos se guarda tal cual
+CAMPOS_UBICACION = ("area", "carpeta", "lista")
+# Campos que no se guardan porque se deducen al leer (el id es la clave)
+CAMPOS_DERIVADOS = ("id",)
+
+
+def id_tarea(tarea, area, carpeta, lista):
+    """Id de ClickUp si existe; si no, un hash estable de la ubicación y el nombre"""
+    if tarea.get("id"):
+        return str(tarea["id"])
+    clave = "\x1f".join((area, carpeta, lista, tarea.get("nombre", "")))
+    return "h" + hashlib.sha1(clave.encode("utf-8")).hexdigest()[:16]
+
+
+def aplanar_datos(datos):
+    """Convertir el JSON anidado en {id_tarea: campos de la tarea + ubicación}"""
+    tareas = {}
+    for area, carpetas in datos.items():
+        for carpeta, listas in carpetas.items():
+            for lista, estados in listas.items():
+                for estado, lista_tareas in estados.items():
+                    for tarea in lista_tareas:
+                        base = id_tarea(tarea, area, carpeta, lista)
+                        tid = base
+                        duplicado = 2
+                        # Tareas homónimas en la misma lista (sin id de ClickUp)
+                        while tid in tareas:
+                            tid = f"{base}#{duplicado}"
+                            duplicado += 1
+                        campos = {
+                            campo: list(valor) if isinstance(valor, list) else valor
+                            for campo, valor in tarea.items() if campo not in CAMPOS_DERIVADOS
+                        }
+                        tareas[tid] = {**campos, "area": area, "carpeta": carpeta, "lista": lista, "estado": estado}
+    return tareas
+
+
+def anidar_tareas(tareas):
+    """Convertir {id_tarea: campos} de vuelta al JSON anidado área → carpeta → lista → estado"""
+    datos = {}
+    for tid, t in tareas.items():
+        estados = datos.setdefault(t["area"], {}).setdefault(t["carpeta"], {}).setdefault(t["lista"], {})
+        tarea = {campo: valor for campo, valor in t.items() if campo not in CAMPOS_UBICACION}
+        estados.setdefault(t["estado"], []).append({"id": tid, **tarea})
+    return datos
+
+
+def calcular_delta(anterior, actual):
+    """
+    Diferencias entre dos estados aplanados: insertadas, campos actualizados,
+    campos quitados (que la tarea ya no trae) y eliminadas
+    """
+    insertadas = {tid: campos for tid, campos in actual.items() if tid not in anterior}
+    eliminadas = [tid for tid in anterior if tid not in actual]
+    actualizadas = {}
+    quitados = {}
+    for tid, campos in actual.items():
+        previo = anterior.get(tid)
+        if previo is None or previo == campos:
+            continue
+        cambios = {campo: valor for campo, valor in campos.items() if campo not in previo or previo[campo] != valor}
+        if cambios:
+            actualizadas[tid] = cambios
+        faltantes = [campo for campo in previo if campo not in campos]
+        if faltantes:
+            quitados[tid] = faltantes
+    return {"insertadas": insertadas, "actualizadas": actualizadas, "quitados": quitados, "eliminadas": eliminadas}
+
+
+def aplicar_delta(tareas, delta):
+    """Aplicar un delta sobre un estado aplanado (modifica y devuelve `tareas`)"""
+    for tid in delta["eliminadas"]:
+        tareas.pop(tid, None)
+    for tid, cambios in delta["actualizadas"].items():
+        tareas[tid] = {**tareas.get(tid, {}), **cambios}
+    # Los deltas anteriores a este campo no lo traen
+    for tid, campos in delta.get("quitados", {}).items():
+        if tid in tareas:
+            tareas[tid] = {campo: valor for campo, valor in tareas[tid].items() if campo not in campos}
+    tareas.update(delta["insertadas"])
+    return tareas
+
+
+class HistorialSnapshots:
+    """Almacén append-only de snapshots con checkpoints y deltas"""
+
+    def __init__(self, carpeta=CARPETA_HISTORIAL, intervalo_checkpoint=INTERVALO_CHECKPOINT):
+        self.carpeta = carpeta
+        self.intervalo_checkpoint = intervalo_checkpoint
+        self.ruta_deltas = os.path.join(carpeta, ARCHIVO_DELTAS)
+        self.ruta_indice = os.path.join(carpeta, ARCHIVO_INDICE)
+        self.carpeta_checkpoints = os.path.join(carpeta, CARPETA_CHECKPOINTS)
+        self.indice = self._leer_indice()
+
+    # ----- índice y archivos -----
+    def _leer_indice(self):
+        try:
+            with open(self.ruta_indice, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _guardar_indice(self):
+        temporal = self.ruta_indice + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self.indice, f, ensure_ascii=False)
+        os.replace(temporal, self.ruta_indice)
+
+    def _ruta_checkpoint(self, seq):
+        return os.path.join(self.carpeta_checkpoints, f"{seq:06d}.json.gz")
+
+    def _guardar_checkpoint(self, seq, tareas):
+        os.makedirs(self.carpeta_checkpoints, exist_ok=True)
+        ruta = self._ruta_checkpoint(seq)
+        temporal = ruta + ".tmp"
+        with gzip.open(temporal, "wt", encoding="utf-8") as f:
+            json.dump(tareas, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+    def _leer_checkpoint(self, seq):
+        with gzip.open(self._ruta_checkpoint(seq), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _leer_delta(self, offset):
+        with open(self.ruta_deltas, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    # ----- lectura -----
+    def _posicion(self, fecha):
+        """Índice de la última sincronización con fecha <= `fecha` (-1 si no hay)"""
+        fechas = [entrada["fecha"] for entrada in self.indice]
+        return bisect.bisect_right(fechas, _normalizar_fecha(fecha, fin_del_dia=True)) - 1
+
+    def _reconstruir_posicion(self, pos):
+        if pos < 0:
+            return {}
+        entrada = self.indice[pos]
+        seq_checkpoint = entrada["checkpoint"]
+        tareas = self._leer_checkpoint(seq_checkpoint)
+        # Solo los deltas entre el checkpoint y la fecha pedida
+        for siguiente in self.indice[seq_checkpoint + 1:pos + 1]:
+            aplicar_delta(tareas, self._leer_delta(siguiente["offset"]))
+        return tareas
+
+    def estado_en(self, fecha):
+        """Estado aplanado {id: campos} vigente en `fecha` (datetime o ISO)"""
+        return self._reconstruir_posicion(self._posicion(fecha))
+
+    def snapshot_en(self, fecha):
+        """JSON anidado vigente en `fecha`, en el formato de tareas_sin_subtareas.json"""
+        return anidar_tareas(self.estado_en(fecha))
+
+    def estado_actual(self):
+        return self._reconstruir_posicion(len(self.indice) - 1)
+
+    def cambios_entre(self, desde, hasta=None):
+        """Delta neto entre dos fechas (por defecto, hasta la última sincronización)"""
+        anterior = self.estado_en(desde)
+        actual = self.estado_en(hasta) if hasta else self.estado_actual()
+        return calcular_delta(anterior, actual)
+
+    def iterar_estados(self, desde_seq=0):
+        """Recorrer (entrada de índice, estado aplanado) en orden, reconstruyendo una sola vez"""
+        if desde_seq >= len(self.indice):
+            return
+        tareas = self._reconstruir_posicion(desde_seq)
+        yield self.indice[desde_seq], tareas
+        for entrada in self.indice[desde_seq + 1:]:
+            # Las sincronizaciones con checkpoint propio no tienen delta
+            if entrada["offset"] is None:
+                tareas = self._leer_checkpoint(entrada["seq"])
+            else:
+                aplicar_delta(tareas, self._leer_delta(entrada["offset"]))
+            yield entrada, tareas
+
+    # ----- escritura -----
+    def registrar(self, datos, fecha=None):
+        """
+        Registrar una sincronización. Devuelve la entrada de índice creada,
+        o None si no hubo cambios respecto a la anterior
+        """
+        fecha = _normalizar_fecha(fecha or datetime.now())
+        if self.indice and fecha < self.indice[-1]["fecha"]:
+            raise ValueError(f"El historial es append-only: {fecha} es anterior a {self.indice[-1]['fecha']}")
+
+        actual = aplanar_datos(datos)
+        anterior = self.estado_actual()
+        delta = calcular_delta(anterior, actual)
+        hay_cambios = any(delta.values())
+        if self.indice and not hay_cambios:
+            return None
+
+        os.makedirs(self.carpeta, exist_ok=True)
+        seq = len(self.indice)
+        ultimo_checkpoint = self.indice[-1]["checkpoint"] if self.indice else None
+        if ultimo_checkpoint is None or seq - ultimo_checkpoint >= self.intervalo_checkpoint:
+            self._guardar_checkpoint(seq, actual)
+            ultimo_checkpoint = seq
+
+        # Con checkpoint en esta misma sincronización el delta sería redundante
+        offset = None
+        if ultimo_checkpoint != seq:
+            with open(self.ruta_deltas, "ab") as f:
+                offset = f.tell()
+                linea = json.dumps({"seq": seq, "fecha": fecha, **delta}, ensure_ascii=False)
+                f.write(linea.encode("utf-8") + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        entrada = {
+            "seq": seq,
+            "fecha": fecha,
+            "offset": offset,
+            "checkpoint": ultimo_checkpoint,
+            "tareas": len(actual),
+            "insertadas": len(delta["insertadas"]),
+            "actualizadas": len(delta["actualizadas"]),
+            "eliminadas": len(delta["eliminadas"]),
+        }
+        self.indice.append(entrada)
+        self._guardar_indice()
+        return entrada
+
+
+def _normalizar_fecha(fecha, fin_del_dia=False):
+    """
+    Fechas como texto ISO (comparables lexicográficamente). Una fecha sin hora es
+    el comienzo del día al registrar y el día completo (fin_del_dia) al consultar
+    """
+    if isinstance(fecha, datetime):
+        return fecha.isoformat(timespec="seconds")
+    texto = str(fecha)
+    if len(texto) == 10:
+        return texto + ("T23:59:59" if fin_del_dia else "T00:00:00")
+    return texto
+
+
+def registrar_snapshot(datos, fecha=None, carpeta=CARPETA_HISTORIAL):
+    """Atajo para registrar una sincronización en el historial por defecto"""
+    return HistorialSnapshots(carpeta).registrar(datos, fecha)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historial append-only de snapshots de tareas")
+    parser.add_argument("--historial", default=CARPETA_HISTORIAL, help="Carpeta del historial")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_registrar = sub.add_parser("registrar", help="Registrar un snapshot JSON")
+    p_registrar.add_argument("archivo")
+    p_registrar.add_argument("--fecha", help="Fecha ISO del snapshot (por defecto, ahora)")
+
+    p_reconstruir = sub.add_parser("reconstruir", help="Reconstruir el JSON vigente en una fecha")
+    p_reconstruir.add_argument("fecha")
+    p_reconstruir.add_argument("salida")
+
+    p_cambios = sub.add_parser("cambios", help="Mostrar qué cambió desde una fecha")
+    p_cambios.add_argument("desde")
+    p_cambios.add_argument("--hasta")
+
+    args = parser.parse_args()
+    historial = HistorialSnapshots(args.historial)
+
+    if args.comando == "registrar":
+        with open(args.archivo, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+        entrada = historial.registrar(datos, args.fecha)
+        if entrada:
+            print(f"✅ Snapshot #{entrada['seq']} registrado: +{entrada['insertadas']} ~{entrada['actualizadas']} -{entrada['eliminadas']}")
+        else:
+            print("ℹ️ Sin cambios respecto a la última sincronización")
+    elif args.comando == "reconstruir":
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(historial.snapshot_en(args.fecha), f, ensure_ascii=False, indent=2)
+        print(f"✅ Snapshot vigente en {args.fecha} guardado en '{args.salida}'")
+    elif args.comando == "cambios":
+        delta = historial.cambios_entre(args.desde, args.hasta)
+        print(f"📊 Cambios desde {args.desde}:")
+        print(f"  ➕ Nuevas: {len(delta['insertadas'])}")
+        for t in delta["insertadas"].values():
+            print(f"     • {t['nombre']} ({t['estado']})")
+        print(f"  ✏️ Modificadas: {len(delta['actualizadas'])}")
+        for tid, cambios in delta["actualizadas"].items():
+            print(f"     • {tid}: {', '.join(f'{k}={v}' for k, v in cambios.items())}")
+        print(f"  ➖ Eliminadas: {len(delta['eliminadas'])}")
+
+
+if __name__ == "__main__":
+    main()
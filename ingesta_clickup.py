@@ -0,0 +1,145 @@
+"""
+Ingesta de varios espacios de ClickUp en paralelo
+Cada espacio guarda su propio caché y estado de sincronización en datos_espacios/
+y el resultado combinado se escribe en tareas_sin_subtareas.json
+"""
+import glob
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from instrumentacion import contar, cronometrado
+
+CARPETA_ESPACIOS = "datos_espacios"
+ARCHIVO_COMBINADO = "tareas_sin_subtareas.json"
+MAX_DESCARGAS_PARALELAS = 8
+
+
+def ruta_cache_espacio(space_id, carpeta=CARPETA_ESPACIOS):
+    """Ruta del archivo de caché de un espacio"""
+    return os.path.join(carpeta, f"{space_id}.json")
+
+
+def leer_cache_espacio(space_id, carpeta=CARPETA_ESPACIOS):
+    """Leer el caché de un espacio (None si no existe o está corrupto)"""
+    try:
+        with open(ruta_cache_espacio(space_id, carpeta), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def guardar_cache_espacio(entrada, carpeta=CARPETA_ESPACIOS):
+    """Guardar el caché de un espacio con reemplazo atómico"""
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = ruta_cache_espacio(entrada['space_id'], carpeta)
+    temporal = ruta + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(entrada, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+
+
+def obtener_nombre_espacio(space_id, api_token):
+    """Obtener el nombre del espacio, que se usa como área"""
+    import requests
+
+    contar("clickup_llamadas_api")
+    try:
+        response = requests.get(
+            f"https://api.clickup.com/api/v2/space/{space_id}",
+            headers={'Authorization': api_token, 'Content-Type': 'application/json'},
+            timeout=30
+        )
+        if response.status_code == 200:
+            return response.json().get('name') or f"Espacio {space_id}"
+    except requests.RequestException as e:
+        print(f"Error obteniendo nombre del espacio {space_id}: {e}")
+    return f"Espacio {space_id}"
+
+
+@cronometrado("sincronizar_espacio")
+def sincronizar_espacio(space_id, api_token, carpeta=CARPETA_ESPACIOS):
+    """
+    Descargar y procesar un espacio. Si falla, conserva los datos del último
+    caché válido y registra el error en su estado de sincronización
+    """
+    from utils_gantt_clean import obtener_datos_clickup, procesar_datos_clickup
+
+    anterior = leer_cache_espacio(space_id, carpeta) or {}
+    entrada = {
+        'space_id': space_id,
+        'area': anterior.get('area') or f"Espacio {space_id}",
+        'datos': anterior.get('datos', {}),
+        'ultima_sincronizacion': anterior.get('ultima_sincronizacion'),
+        'ultimo_intento': datetime.now().isoformat(timespec='seconds'),
+        'estado': 'error',
+        'error': None
+    }
+
+    try:
+        contar("clickup_llamadas_api")
+        respuesta = obtener_datos_clickup({'api_token': api_token, 'space_id': space_id})
+        datos = procesar_datos_clickup(respuesta)
+        if datos is None:
+            entrada['error'] = "La API de ClickUp no devolvió tareas"
+        else:
+            entrada['area'] = obtener_nombre_espacio(space_id, api_token)
+            entrada['datos'] = datos
+            entrada['ultima_sincronizacion'] = entrada['ultimo_intento']
+            entrada['estado'] = 'ok'
+    except Exception as e:
+        entrada['error'] = str(e)
+
+    contar(f"sincronizaciones_espacio_{entrada['estado']}")
+    guardar_cache_espacio(entrada, carpeta)
+    return entrada
+
+
+def sincronizar_espacios(config, carpeta=CARPETA_ESPACIOS, max_workers=MAX_DESCARGAS_PARALELAS):
+    """Sincronizar todos los espacios configurados en paralelo (E/S de red)"""
+    space_ids = config.get('space_ids') or ([config['space_id']] if config.get('space_id') else [])
+    if not config.get('api_token') or not space_ids:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(space_ids))) as pool:
+        return list(pool.map(
+            lambda space_id: sincronizar_espacio(space_id, config['api_token'], carpeta),
+            space_ids
+        ))
+
+
+def cargar_espacios(space_ids=None, carpeta=CARPETA_ESPACIOS):
+    """Cargar las entradas de caché de los espacios indicados (o de todos los disponibles)"""
+    if space_ids is None:
+        rutas = sorted(glob.glob(os.path.join(glob.escape(carpeta), "*.json")))
+        space_ids = [os.path.splitext(os.path.basename(ruta))[0] for ruta in rutas]
+    entradas = [leer_cache_espacio(space_id, carpeta) for space_id in space_ids]
+    return [entrada for entrada in entradas if entrada]
+
+
+def combinar_espacios(entradas, areas=None):
+    """
+    Combinar los espacios en el formato área → carpeta → lista → estado → tareas.
+    Devuelve (datos, mapa área → space_id)
+    """
+    datos = {}
+    espacios = {}
+    for entrada in entradas:
+        area = entrada['area']
+        if areas and area not in areas:
+            continue
+        # Dos espacios con el mismo nombre no deben mezclarse
+        if area in datos:
+            area = f"{area} ({entrada['space_id']})"
+        datos[area] = entrada['datos']
+        espacios[area] = entrada['space_id']
+    return datos, espacios
+
+
+def guardar_combinado(datos, archivo=ARCHIVO_COMBINADO):
+    """Escribir el JSON combinado con reemplazo atómico"""
+    temporal = archivo + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, archivo)
@@ -0,0 +1,160 @@
+"""
+Instrumentación liviana del pipeline (carga, procesamiento, filtros, gráficos y exportaciones)
+Temporizadores como context manager o decorador y contadores. Cada medición se
+guarda en la corrida actual (para el panel de debug) y en una ventana móvil del
+proceso de la que se obtienen p50/p95 por etapa
+"""
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+VENTANA_PERCENTILES = 500
+
+# Límites superiores (segundos) de los buckets de los histogramas por etapa
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_bloqueo = threading.Lock()
+_ventanas = defaultdict(lambda: deque(maxlen=VENTANA_PERCENTILES))
+_totales = defaultdict(lambda: [0, 0.0])  # etapa → [cantidad, segundos acumulados]
+_buckets = defaultdict(lambda: [0] * len(BUCKETS_SEGUNDOS))
+_contadores = defaultdict(int)
+_indicadores = {}
+
+# Streamlit ejecuta cada sesión en su propio hilo: la corrida actual es por hilo
+_corrida = threading.local()
+
+
+def iniciar_corrida():
+    """Empezar a registrar las mediciones de una nueva ejecución del script"""
+    _corrida.mediciones = []
+    _corrida.profundidad = 0
+
+
+def mediciones_corrida():
+    """Lista de (etapa, segundos, profundidad) de la corrida actual en orden de finalización"""
+    return list(getattr(_corrida, 'mediciones', []))
+
+
+def registrar_tiempo(etapa, segundos):
+    """Registrar una duración ya medida"""
+    with _bloqueo:
+        _ventanas[etapa].append(segundos)
+        total = _totales[etapa]
+        total[0] += 1
+        total[1] += segundos
+        buckets = _buckets[etapa]
+        for i, limite in enumerate(BUCKETS_SEGUNDOS):
+            if segundos <= limite:
+                buckets[i] += 1
+    if hasattr(_corrida, 'mediciones'):
+        _corrida.mediciones.append((etapa, segundos, getattr(_corrida, 'profundidad', 0)))
+
+
+@contextmanager
+def medir(etapa):
+    """Medir el bloque `with medir("etapa"):`"""
+    profundidad = getattr(_corrida, 'profundidad', 0)
+    _corrida.profundidad = profundidad + 1
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _corrida.profundidad = profundidad
+        registrar_tiempo(etapa, time.perf_counter() - inicio)
+
+
+def cronometrado(etapa):
+    """Decorador que mide cada llamada a la función como `etapa`"""
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(etapa):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def contar(nombre, cantidad=1):
+    """Incrementar un contador del proceso"""
+    with _bloqueo:
+        _contadores[nombre] += cantidad
+
+
+def contadores():
+    """Copia de los contadores del proceso"""
+    with _bloqueo:
+        return dict(_contadores)
+
+
+def fijar(nombre, valor):
+    """Fijar el valor actual de un indicador (tamaño del dataset, etc.)"""
+    with _bloqueo:
+        _indicadores[nombre] = valor
+
+
+def indicadores():
+    """Copia de los indicadores del proceso"""
+    with _bloqueo:
+        return dict(_indicadores)
+
+
+def histogramas():
+    """{etapa: (conteos acumulados por bucket de BUCKETS_SEGUNDOS, cantidad, suma)} desde el arranque"""
+    with _bloqueo:
+        return {
+            etapa: (list(_buckets[etapa]), total[0], total[1])
+            for etapa, total in _totales.items()
+        }
+
+
+def _percentil(ordenados, p):
+    """Percentil por rango más cercano sobre una lista ordenada"""
+    return ordenados[max(0, math.ceil(p * len(ordenados)) - 1)]
+
+
+def resumen_etapas():
+    """{etapa: {cantidad, p50, p95, ultimo, total}} en segundos para todo el proceso"""
+    with _bloqueo:
+        ventanas = {etapa: list(valores) for etapa, valores in _ventanas.items()}
+        totales = {etapa: tuple(total) for etapa, total in _totales.items()}
+
+    resumen = {}
+    for etapa, valores in ventanas.items():
+        ordenados = sorted(valores)
+        resumen[etapa] = {
+            'cantidad': totales[etapa][0],
+            'p50': _percentil(ordenados, 0.50),
+            'p95': _percentil(ordenados, 0.95),
+            'ultimo': valores[-1],
+            'total': totales[etapa][1],
+        }
+    return resumen
+
+
+def mostrar_panel_latencias(config):
+    """Panel plegable con los tiempos de esta ejecución y los percentiles del proceso (solo en debug)"""
+    if not config.get('debug_mode', False):
+        return
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Latencias (debug)"):
+        st.markdown("**Esta ejecución**")
+        for etapa, segundos, profundidad in mediciones_corrida():
+            sangria = "└ " * profundidad
+            st.caption(f"{sangria}{etapa}: {segundos * 1000:.1f} ms")
+
+        st.markdown(f"**Proceso (últimas {VENTANA_PERCENTILES} por etapa)**")
+        for etapa, datos in sorted(resumen_etapas().items()):
+            st.caption(
+                f"{etapa}: p50 {datos['p50'] * 1000:.1f} ms · "
+                f"p95 {datos['p95'] * 1000:.1f} ms · n={datos['cantidad']}"
+            )
+
+        valores = contadores()
+        if valores:
+            st.markdown("**Contadores**")
+            for nombre, valor in sorted(valores.items()):
+                st.caption(f"{nombre}: {valor}")
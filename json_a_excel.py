@@ -1,33 +1,189 @@
+"""
+Conversor por lotes de snapshots JSON de ClickUp a XLSX, CSV, Parquet o Arrow IPC
+Los snapshots son JSON área → carpeta → lista → estado, como tareas_sin_subtareas.json
+o los que escribe `python historial_snapshots.py reconstruir FECHA snapshots/FECHA.json`.
+Los JSON con otra forma (p. ej. historial/indice.json) se omiten
+
+Uso: python json_a_excel.py "snapshots/*.json" --formato xlsx --salida exportaciones
+"""
+import argparse
+import csv
+import glob
 import json
-import pandas as pd
-
-# Cargar el JSON generado previamente
-with open("tareas_sin_subtareas.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-# Lista para almacenar filas planas
-filas = []
-
-# Navegar por la estructura anidada
-for carpeta, listas in data["Administración y Sistemas"].items():
-    for lista, estados in listas.items():
-        for estado, tareas in estados.items():
-            for tarea in tareas:
-                filas.append({
-                    "Carpeta": carpeta,
-                    "Lista": lista,
-                    "Estado": estado,
-                    "Nombre de tarea": tarea["nombre"],
-                    "Asignados": ", ".join(tarea["asignados"]),
-                    "Fecha inicio": tarea.get("fecha_inicio"),
-                    "Fecha límite": tarea.get("fecha_limite"),
-                    "Prioridad": tarea.get("prioridad")
-                })
-
-# Crear DataFrame
-df = pd.DataFrame(filas)
-
-# Guardar como Excel
-df.to_excel("tareas_clickup.xlsx", index=False)
-
-print("✅ Archivo 'tareas_clickup.xlsx' creado con éxito.")
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from exportador_excel import COLUMNAS_JSON, escribir_excel_streaming, iterar_filas_json
+
+EXTENSIONES = {'xlsx': 'xlsx', 'csv': 'csv', 'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+def nombre_seguro(texto):
+    """Convertir un nombre de área en un fragmento válido de nombre de archivo"""
+    return re.sub(r'[^\w-]+', '_', texto).strip('_') or 'area'
+
+
+def escribir_csv_streaming(filas, destino, columnas):
+    """Escribir filas (hoja, valores) en CSV. Devuelve el total de filas"""
+    total = 0
+    with open(destino, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([titulo for titulo, _tipo, _ancho in columnas])
+        for _hoja, valores in filas:
+            writer.writerow([
+                valor.strftime('%d/%m/%Y') if tipo == 'fecha' and valor else valor
+                for valor, (_titulo, tipo, _ancho) in zip(valores, columnas)
+            ])
+            total += 1
+    return total
+
+
+def escribir_salida(filas, destino, formato):
+    """Despachar la escritura según el formato de salida"""
+    if formato == 'xlsx':
+        return escribir_excel_streaming(filas, destino, COLUMNAS_JSON)
+    if formato == 'csv':
+        return escribir_csv_streaming(filas, destino, COLUMNAS_JSON)
+    if formato in ('parquet', 'arrow'):
+        from exportador_arrow import CATEGORICAS_JSON, escribir_tabla_streaming
+        return escribir_tabla_streaming(filas, destino, COLUMNAS_JSON, formato, CATEGORICAS_JSON)
+    raise ValueError(f"Formato no soportado: {formato}")
+
+
+def leer_snapshot(entrada):
+    """JSON del snapshot, o None si no tiene la forma área → carpeta → lista"""
+    with open(entrada, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        return None
+    for carpetas in data.values():
+        if not isinstance(carpetas, dict) or not all(isinstance(listas, dict) for listas in carpetas.values()):
+            return None
+    return data
+
+
+def salida_area(entrada, carpeta_salida, area, formato):
+    """Ruta del archivo de salida de un área del snapshot"""
+    base = os.path.splitext(os.path.basename(entrada))[0]
+    return os.path.join(carpeta_salida, f"{base}__{nombre_seguro(area)}.{EXTENSIONES[formato]}")
+
+
+def salidas_existentes(entrada, carpeta_salida, formato):
+    """Archivos de salida ya generados para un snapshot"""
+    base = os.path.splitext(os.path.basename(entrada))[0]
+    patron = os.path.join(glob.escape(carpeta_salida), f"{glob.escape(base)}__*.{EXTENSIONES[formato]}")
+    return glob.glob(patron)
+
+
+def esta_actualizado(entrada, carpeta_salida, formato):
+    """
+    True si existe la salida de cada área del snapshot y todas son más recientes
+    que el JSON. El JSON solo se lee si las fechas ya están al día
+    """
+    salidas = salidas_existentes(entrada, carpeta_salida, formato)
+    if not salidas:
+        return False
+    mtime_entrada = os.path.getmtime(entrada)
+    if any(os.path.getmtime(salida) < mtime_entrada for salida in salidas):
+        return False
+    data = leer_snapshot(entrada)
+    if data is None:
+        return False
+    esperadas = {salida_area(entrada, carpeta_salida, area, formato) for area in data}
+    return esperadas <= set(salidas)
+
+
+def convertir_snapshot(entrada, carpeta_salida, formato):
+    """
+    Convertir todas las áreas de un snapshot. Devuelve (archivos, tareas, bytes),
+    o None si el JSON no es un snapshot
+    """
+    data = leer_snapshot(entrada)
+    if data is None:
+        return None
+
+    archivos = 0
+    tareas = 0
+    bytes_escritos = 0
+
+    for area, carpetas in data.items():
+        destino = salida_area(entrada, carpeta_salida, area, formato)
+        temporal = destino + ".tmp"
+        tareas += escribir_salida(iterar_filas_json(carpetas), temporal, formato)
+        # Reemplazo atómico: una salida a medias nunca parece actualizada
+        os.replace(temporal, destino)
+        archivos += 1
+        bytes_escritos += os.path.getsize(destino)
+
+    return archivos, tareas, bytes_escritos
+
+
+def expandir_entradas(patrones):
+    """Expandir globs a una lista ordenada y sin duplicados de archivos JSON"""
+    entradas = set()
+    for patron in patrones:
+        coincidencias = glob.glob(patron, recursive=True)
+        if not coincidencias and os.path.isfile(patron):
+            coincidencias = [patron]
+        entradas.update(coincidencias)
+    return sorted(entradas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte snapshots JSON de ClickUp a XLSX, CSV, Parquet o Arrow IPC (todas las áreas)")
+    parser.add_argument("entradas", nargs="*", default=["tareas_sin_subtareas.json"], help="Archivos o globs de snapshots JSON")
+    parser.add_argument("--formato", choices=sorted(EXTENSIONES), default="xlsx", help="Formato de salida")
+    parser.add_argument("--salida", default=".", help="Carpeta de salida")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="Número de procesos en paralelo")
+    parser.add_argument("--forzar", action="store_true", help="Regenerar aunque la salida esté actualizada")
+    args = parser.parse_args()
+
+    entradas = expandir_entradas(args.entradas)
+    if not entradas:
+        print("❌ No se encontraron snapshots para los patrones indicados")
+        return 1
+
+    os.makedirs(args.salida, exist_ok=True)
+
+    pendientes = [e for e in entradas if args.forzar or not esta_actualizado(e, args.salida, args.formato)]
+    omitidos = len(entradas) - len(pendientes)
+
+    inicio = time.perf_counter()
+    total_archivos = total_tareas = total_bytes = errores = no_snapshots = 0
+
+    with ProcessPoolExecutor(max_workers=max(1, args.procesos)) as pool:
+        futuros = {pool.submit(convertir_snapshot, e, args.salida, args.formato): e for e in pendientes}
+        for futuro in as_completed(futuros):
+            entrada = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                errores += 1
+                print(f"❌ {entrada}: {e}")
+                continue
+            if resultado is None:
+                no_snapshots += 1
+                print(f"⚠️ {entrada}: no es un snapshot área → carpeta → lista, se omite")
+                continue
+            archivos, tareas, bytes_escritos = resultado
+            total_archivos += archivos
+            total_tareas += tareas
+            total_bytes += bytes_escritos
+            print(f"✅ {entrada}: {archivos} área(s), {tareas} tareas")
+
+    duracion = time.perf_counter() - inicio
+
+    print("\n📊 RESUMEN")
+    print(f"  Snapshots procesados: {len(pendientes) - errores - no_snapshots}/{len(entradas)} (omitidos por estar actualizados: {omitidos}, no son snapshots: {no_snapshots}, errores: {errores})")
+    print(f"  Archivos generados: {total_archivos} ({total_bytes / 1024 / 1024:.2f} MB, formato {args.formato})")
+    print(f"  Tareas exportadas: {total_tareas}")
+    if duracion > 0 and pendientes:
+        print(f"  Tiempo: {duracion:.2f} s → {total_tareas / duracion:,.0f} tareas/s, {len(pendientes) / duracion:.2f} snapshots/s")
+
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
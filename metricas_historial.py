@@ -0,0 +1,169 @@
+"""
+Burndown, burnup y velocidad semanal a partir del historial de sincronizaciones
+Cada snapshot se resume en conteos por carpeta, lista y asignado (group-bys
+vectorizados). Los resúmenes se guardan y solo se calculan los snapshots nuevos
+"""
+import json
+import os
+
+import pandas as pd
+
+from historial_snapshots import CARPETA_HISTORIAL, HistorialSnapshots
+
+CARPETA_METRICAS = "metricas"
+ARCHIVO_ESTADO_METRICAS = "metricas_estado.json"
+
+ESTADOS_COMPLETADOS = {"completado", "complete", "completed", "closed", "cerrado", "done"}
+
+DIMENSIONES = {
+    "total": "Todas",
+    "carpeta": "Carpeta",
+    "lista": "Lista",
+    "asignado": "Asignado",
+}
+
+COLUMNAS_METRICAS = ["fecha", "seq", "dimension", "valor", "total", "completadas"]
+
+
+def resumir_estado(tareas, fecha, seq):
+    """Conteos total/completadas por dimensión para un estado aplanado {id: campos}"""
+    if not tareas:
+        return pd.DataFrame(columns=COLUMNAS_METRICAS)
+
+    df = pd.DataFrame.from_dict(tareas, orient="index", columns=["carpeta", "lista", "estado", "asignados"])
+    df["completada"] = df["estado"].str.lower().isin(ESTADOS_COMPLETADOS)
+
+    partes = [pd.DataFrame({
+        "dimension": ["total"],
+        "valor": [DIMENSIONES["total"]],
+        "total": [len(df)],
+        "completadas": [int(df["completada"].sum())],
+    })]
+    for dimension, columna in (("carpeta", "carpeta"), ("lista", "lista")):
+        agrupado = df.groupby(columna, sort=False)["completada"].agg(["size", "sum"])
+        partes.append(pd.DataFrame({
+            "dimension": dimension,
+            "valor": agrupado.index.astype(str),
+            "total": agrupado["size"].to_numpy(),
+            "completadas": agrupado["sum"].to_numpy(),
+        }))
+
+    # Una fila por (tarea, asignado); las tareas sin asignar cuentan como tal
+    asignados = df[["asignados", "completada"]].explode("asignados")
+    asignados["asignados"] = asignados["asignados"].fillna("Sin asignar")
+    agrupado = asignados.groupby("asignados", sort=False)["completada"].agg(["size", "sum"])
+    partes.append(pd.DataFrame({
+        "dimension": "asignado",
+        "valor": agrupado.index.astype(str),
+        "total": agrupado["size"].to_numpy(),
+        "completadas": agrupado["sum"].to_numpy(),
+    }))
+
+    resumen = pd.concat(partes, ignore_index=True)
+    resumen.insert(0, "seq", seq)
+    resumen.insert(0, "fecha", pd.Timestamp(fecha))
+    return resumen[COLUMNAS_METRICAS]
+
+
+class MetricasHistorial:
+    """Resúmenes por snapshot persistidos junto al historial y actualizados de forma incremental"""
+
+    def __init__(self, carpeta=CARPETA_HISTORIAL):
+        self.carpeta = carpeta
+        self.carpeta_metricas = os.path.join(carpeta, CARPETA_METRICAS)
+        self.ruta_estado = os.path.join(carpeta, ARCHIVO_ESTADO_METRICAS)
+
+    def _ultimo_seq(self):
+        try:
+            with open(self.ruta_estado, "r", encoding="utf-8") as f:
+                return json.load(f)["ultimo_seq"]
+        except FileNotFoundError:
+            return -1
+
+    def cargar(self):
+        """Leer todas las partes de métricas guardadas"""
+        if not os.path.isdir(self.carpeta_metricas) or not os.listdir(self.carpeta_metricas):
+            return pd.DataFrame(columns=COLUMNAS_METRICAS)
+        return pd.read_parquet(self.carpeta_metricas)
+
+    def actualizar(self, historial=None):
+        """Resumir solo los snapshots posteriores al último procesado. Devuelve las métricas completas"""
+        historial = historial or HistorialSnapshots(self.carpeta)
+        ultimo_seq = self._ultimo_seq()
+        metricas = self.cargar()
+
+        nuevos = [
+            resumir_estado(tareas, entrada["fecha"], entrada["seq"])
+            for entrada, tareas in historial.iterar_estados(ultimo_seq + 1)
+        ]
+        if not nuevos:
+            return metricas
+
+        nuevas = pd.concat(nuevos, ignore_index=True)
+        nuevas["fecha"] = pd.to_datetime(nuevas["fecha"])
+        nuevas[["seq", "total", "completadas"]] = nuevas[["seq", "total", "completadas"]].astype("int64")
+
+        # Cada actualización se guarda como una parte nueva: no se reescribe lo anterior
+        os.makedirs(self.carpeta_metricas, exist_ok=True)
+        primer_seq = int(nuevas["seq"].min())
+        ultimo = int(nuevas["seq"].max())
+        nombre = f"parte_{primer_seq:06d}_{ultimo:06d}.parquet"
+        # El temporal empieza con '.' para que la lectura de la carpeta lo ignore
+        temporal = os.path.join(self.carpeta_metricas, f".{nombre}.tmp")
+        nuevas.to_parquet(temporal, index=False)
+        os.replace(temporal, os.path.join(self.carpeta_metricas, nombre))
+        with open(self.ruta_estado, "w", encoding="utf-8") as f:
+            json.dump({"ultimo_seq": ultimo}, f)
+
+        return pd.concat([metricas, nuevas], ignore_index=True) if len(metricas) else nuevas
+
+
+def series_diarias(metricas, dimension, columna):
+    """
+    Tabla ancha fecha (diaria) × valor de la dimensión para `columna`
+    ('total', 'completadas' o 'pendientes'). Los días sin sincronización
+    heredan el último valor conocido
+    """
+    datos = metricas[metricas["dimension"] == dimension]
+    if datos.empty:
+        return pd.DataFrame()
+
+    datos = datos.assign(dia=datos["fecha"].dt.normalize())
+    if columna == "pendientes":
+        datos = datos.assign(pendientes=datos["total"] - datos["completadas"])
+
+    # Si hubo varias sincronizaciones en un día, vale la última
+    datos = datos.sort_values("seq").drop_duplicates(["dia", "valor"], keep="last")
+    tabla = datos.pivot(index="dia", columns="valor", values=columna)
+    # Tras la primera aparición, una ausencia significa 0 tareas en ese grupo
+    presentes = datos.pivot(index="dia", columns="valor", values="seq").notna()
+    tabla = tabla.where(presentes, 0).where(presentes.cumsum() > 0)
+
+    dias = pd.date_range(tabla.index.min(), tabla.index.max(), freq="D")
+    return tabla.reindex(dias).ffill()
+
+
+def burndown(metricas, dimension="total", valor=None):
+    """Pendientes por día (una columna por valor, o solo `valor`)"""
+    tabla = series_diarias(metricas, dimension, "pendientes")
+    return tabla[[valor]] if valor is not None and valor in tabla else tabla
+
+
+def burnup(metricas, dimension="total", valor=None):
+    """DataFrame diario con alcance total y completadas para un valor de la dimensión"""
+    valor = valor if valor is not None else DIMENSIONES["total"]
+    total = series_diarias(metricas, dimension, "total")
+    completadas = series_diarias(metricas, dimension, "completadas")
+    if valor not in total:
+        return pd.DataFrame(columns=["total", "completadas"])
+    return pd.DataFrame({"total": total[valor], "completadas": completadas[valor]})
+
+
+def velocidad_semanal(metricas, dimension="total"):
+    """Tareas completadas por semana (variación neta del acumulado) para todos los valores"""
+    completadas = series_diarias(metricas, dimension, "completadas")
+    if completadas.empty:
+        return completadas
+    semanal = completadas.resample("W-MON", label="left", closed="left").last()
+    # La primera semana no tiene referencia previa
+    return semanal.diff().iloc[1:]
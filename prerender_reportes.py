@@ -0,0 +1,305 @@
+"""
+Reportes HTML del dashboard generados sin Streamlit
+El dataset se carga una vez y cada combinación carpeta × escala (más un resumen
+de estadísticas por carpeta) se renderiza en un proceso del pool. Las páginas
+comparten un único plotly.min.js en la carpeta del reporte en lugar de llevar
+una copia cada una. Se ejecuta después de cada sincronización
+
+Uso: python prerender_reportes.py [--procesos P] [--carpeta reportes]
+"""
+import argparse
+import glob
+import html
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+CARPETA_REPORTES = "reportes"
+ARCHIVO_PLOTLY = "plotly.min.js"
+ESCALAS = ("Días", "Semanas", "Meses", "Años")
+# Reportes diarios que se conservan (los más antiguos se borran)
+REPORTES_CONSERVADOS = 30
+# Intentos de publicar la carpeta si otra corrida publica a la vez
+INTENTOS_PUBLICAR = 5
+
+PLANTILLA_PAGINA = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+{script}
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 24px 40px; color: #2c3e50; }}
+h1 {{ color: #667eea; }}
+a {{ color: #764ba2; }}
+table {{ border-collapse: collapse; }}
+th, td {{ padding: 6px 14px; border-bottom: 1px solid #e1e5eb; text-align: left; }}
+.metricas {{ display: flex; gap: 16px; flex-wrap: wrap; margin: 16px 0; }}
+.metrica {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;
+            padding: 14px 22px; border-radius: 12px; text-align: center; }}
+.metrica b {{ display: block; font-size: 24px; }}
+</style>
+</head>
+<body>
+{navegacion}
+<h1>{titulo}</h1>
+<p>{subtitulo}</p>
+{contenido}
+</body>
+</html>
+"""
+
+
+def nombre_seguro(texto):
+    """Texto en minúsculas ASCII apto para nombres de archivo"""
+    ascii_ = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return re.sub(r"[^\w-]+", "_", ascii_).strip("_").lower()
+
+
+def nombre_archivo(posicion, carpeta, escala=None):
+    """Nombre del HTML de una combinación (la posición evita choques entre carpetas)"""
+    return f"{posicion:02d}_{nombre_seguro(carpeta) or 'carpeta'}_{nombre_seguro(escala) if escala else 'resumen'}.html"
+
+
+def trabajos_reporte(df):
+    """(carpeta, escala o None para el resumen, archivo) de cada página a generar"""
+    carpetas = ["Todas"] + sorted(df['Carpeta'].dropna().unique().tolist())
+    return [
+        (carpeta, escala, nombre_archivo(posicion, carpeta, escala))
+        for posicion, carpeta in enumerate(carpetas)
+        for escala in (None, *ESCALAS)
+    ]
+
+
+def pagina_html(titulo, subtitulo, contenido, volver=("index.html", "← Índice"), con_graficos=True):
+    """Página completa; los gráficos usan el plotly.min.js de la misma carpeta"""
+    return PLANTILLA_PAGINA.format(
+        titulo=html.escape(titulo),
+        subtitulo=html.escape(subtitulo),
+        script=f'<script src="{ARCHIVO_PLOTLY}"></script>' if con_graficos else "",
+        navegacion=f'<p><a href="{volver[0]}">{volver[1]}</a></p>' if volver else "",
+        contenido=contenido,
+    )
+
+
+def figura_html(fig):
+    """Fragmento HTML de una figura, sin plotly.js"""
+    return fig.to_html(full_html=False, include_plotlyjs=False, config={'displaylogo': False})
+
+
+def pagina_gantt(df, carpeta, escala):
+    """HTML del Gantt de una carpeta en una escala temporal"""
+    from graficos_gantt import crear_diagrama_gantt
+
+    fig = crear_diagrama_gantt(df, escala)
+    contenido = figura_html(fig) if fig else "<p>⚠️ No hay tareas en esta carpeta</p>"
+    return pagina_html(f"📅 {carpeta} · {escala}", f"{len(df)} tareas", contenido)
+
+
+def pagina_resumen(df, carpeta):
+    """HTML con las métricas, alertas y gráficos de estadísticas de una carpeta"""
+    import plotly.express as px
+    from alertas_tareas import CATEGORIAS_RIESGO, resumen_alertas
+    from utils_gantt import calcular_estadisticas_avanzadas
+
+    stats = calcular_estadisticas_avanzadas(df)
+    metricas = [
+        ("📋 Total Tareas", stats['total']),
+        ("✅ Completadas", f"{stats['completadas']} ({stats['progreso_porcentaje']:.1f}%)"),
+        ("⏳ Pendientes", int(stats['por_estado'].get('Pendiente', 0))),
+        ("🔄 En Progreso", int(stats['por_estado'].get('En Progreso', 0))),
+    ] + [(CATEGORIAS_RIESGO[columna], cantidad) for columna, cantidad in resumen_alertas(df).items()]
+    partes = ['<div class="metricas">'] + [
+        f'<div class="metrica"><b>{html.escape(str(valor))}</b>{html.escape(etiqueta)}</div>'
+        for etiqueta, valor in metricas
+    ] + ['</div>']
+
+    if stats['total']:
+        partes.append(figura_html(px.pie(
+            values=stats['por_estado'].values, names=stats['por_estado'].index,
+            title="Distribución de Tareas por Estado",
+            color_discrete_map={"Pendiente": "#FF6B6B", "En Progreso": "#4ECDC4", "Completado": "#45B7D1"}
+        )))
+        partes.append(figura_html(px.bar(
+            x=stats['por_prioridad'].index, y=stats['por_prioridad'].values,
+            title="Distribución de Tareas por Prioridad",
+            labels={'x': 'Prioridad', 'y': 'Cantidad de Tareas'}
+        )))
+    if stats['carga_trabajo']:
+        partes.append(figura_html(px.bar(
+            x=list(stats['carga_trabajo'].values()), y=list(stats['carga_trabajo'].keys()),
+            orientation='h', title="Número de Tareas Asignadas",
+            labels={'x': 'Número de Tareas', 'y': 'Persona'}
+        ).update_layout(height=max(400, 24 * len(stats['carga_trabajo'])))))
+    return pagina_html(f"📊 {carpeta} · Resumen", f"{stats['total']} tareas", "\n".join(partes))
+
+
+def escribir_plotly(destino):
+    """Una sola copia de plotly.js para todas las páginas de `destino` (si ya está, no se reescribe)"""
+    from plotly.offline import get_plotlyjs
+
+    ruta = os.path.join(destino, ARCHIVO_PLOTLY)
+    if not os.path.exists(ruta):
+        with open(f"{ruta}.tmp", "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+        os.replace(f"{ruta}.tmp", ruta)
+    return ruta
+
+
+_DATASET_PROCESO = None
+
+
+def _iniciar_proceso(df):
+    global _DATASET_PROCESO
+    _DATASET_PROCESO = df
+
+
+def renderizar(df, trabajo, destino):
+    """Escribir la página de un trabajo en `destino`. Devuelve (trabajo, tareas)"""
+    from utils_gantt import aplicar_filtro
+
+    carpeta, escala, archivo = trabajo
+    vista = aplicar_filtro(df, 'carpeta', carpeta)
+    contenido = pagina_resumen(vista, carpeta) if escala is None else pagina_gantt(vista, carpeta, escala)
+    with open(os.path.join(destino, archivo), "w", encoding="utf-8") as f:
+        f.write(contenido)
+    return trabajo, len(vista)
+
+
+def _renderizar_proceso(trabajo, destino):
+    return renderizar(_DATASET_PROCESO, trabajo, destino)
+
+
+def escribir_indice(destino, resultados, generado):
+    """index.html del reporte: una fila por carpeta y un enlace por página"""
+    filas = {}
+    for (carpeta, escala, archivo), tareas in resultados:
+        fila = filas.setdefault(carpeta, [f"<td>{html.escape(carpeta)}</td>", f"<td>{tareas}</td>"])
+        fila.append(f'<td><a href="{archivo}">{html.escape(escala or "Resumen")}</a></td>')
+    encabezado = "".join(f"<th>{titulo}</th>" for titulo in ("Carpeta", "Tareas", "Resumen", *ESCALAS))
+    tabla = f"<table><tr>{encabezado}</tr>" + "".join(f"<tr>{''.join(f)}</tr>" for f in filas.values()) + "</table>"
+    contenido = pagina_html(
+        "📊 Reporte de Tareas", f"Generado el {generado:%d/%m/%Y %H:%M}", tabla,
+        volver=("../index.html", "← Reportes"), con_graficos=False
+    )
+    with open(os.path.join(destino, "index.html"), "w", encoding="utf-8") as f:
+        f.write(contenido)
+
+
+def escribir_indice_reportes(carpeta=CARPETA_REPORTES, conservar=REPORTES_CONSERVADOS):
+    """index.html de `carpeta` con los reportes diarios; borra los que exceden `conservar`"""
+    indices = glob.glob(os.path.join(glob.escape(carpeta), "????-??-??", "index.html"))
+    reportes = sorted((os.path.basename(os.path.dirname(ruta)) for ruta in indices), reverse=True)
+    for antiguo in reportes[conservar:]:
+        shutil.rmtree(os.path.join(carpeta, antiguo), ignore_errors=True)
+    enlaces = "".join(f'<li><a href="{nombre}/index.html">{nombre}</a></li>' for nombre in reportes[:conservar])
+    contenido = pagina_html(
+        "📚 Reportes Diarios", f"{len(reportes[:conservar])} reportes", f"<ul>{enlaces}</ul>",
+        volver=None, con_graficos=False
+    )
+    escribir_atomico(os.path.join(carpeta, "index.html"), contenido)
+
+
+def escribir_atomico(ruta, contenido):
+    """Escribir `ruta` vía un temporal propio de la corrida (otras corridas pueden escribirla a la vez)"""
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".", suffix=".tmp")
+    with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+        f.write(contenido)
+    os.chmod(temporal, 0o644)
+    os.replace(temporal, ruta)
+
+
+def publicar_carpeta(destino, final):
+    """
+    Reemplazar la carpeta `final` por `destino`. La anterior se aparta con un nombre
+    propio antes de borrarla; si otra corrida publica entre medio, se reemplaza la suya
+    """
+    for _ in range(INTENTOS_PUBLICAR):
+        apartada = f"{destino}.anterior"
+        try:
+            os.replace(final, apartada)
+        except FileNotFoundError:
+            pass
+        else:
+            shutil.rmtree(apartada, ignore_errors=True)
+        try:
+            os.replace(destino, final)
+            return
+        except OSError:
+            continue
+    raise OSError(f"No se pudo publicar {final}: otras corridas la reemplazan continuamente")
+
+
+def generar_reportes(df, carpeta=CARPETA_REPORTES, procesos=None, generado=None):
+    """
+    Renderizar todas las páginas en carpeta/AAAA-MM-DD/ (un reporte por día; se
+    reemplaza completo al final, así nunca queda uno a medias). Cada corrida prepara
+    las páginas en su propia carpeta temporal, así dos sincronizaciones seguidas no
+    se pisan. Devuelve la ruta del índice
+    """
+    generado = generado or datetime.now()
+    final = os.path.join(carpeta, f"{generado:%Y-%m-%d}")
+    os.makedirs(carpeta, exist_ok=True)
+    destino = tempfile.mkdtemp(dir=carpeta, prefix=f"{generado:%Y-%m-%d}.", suffix=".tmp")
+    # mkdtemp crea la carpeta solo para el usuario; el reporte publicado se sirve a otros
+    os.chmod(destino, 0o755)
+    try:
+        escribir_plotly(destino)
+        trabajos = trabajos_reporte(df)
+        procesos = min(procesos or os.cpu_count() or 1, len(trabajos))
+        if procesos > 1:
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso, initargs=(df,)) as pool:
+                resultados = list(pool.map(_renderizar_proceso, trabajos, [destino] * len(trabajos)))
+        else:
+            resultados = [renderizar(df, trabajo, destino) for trabajo in trabajos]
+        escribir_indice(destino, resultados, generado)
+        publicar_carpeta(destino, final)
+    except BaseException:
+        shutil.rmtree(destino, ignore_errors=True)
+        raise
+    escribir_indice_reportes(carpeta)
+    return os.path.join(final, "index.html")
+
+
+def programar_prerender():
+    """Lanzar la generación en segundo plano (después de sincronizar) sin bloquear la app"""
+    script = os.path.abspath(__file__)
+    return subprocess.Popen(
+        [sys.executable, script],
+        cwd=os.path.dirname(script),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reportes HTML del dashboard sin Streamlit")
+    parser.add_argument("--procesos", type=int, default=0, help=f"0 = todos los núcleos ({os.cpu_count()})")
+    parser.add_argument("--carpeta", default=CARPETA_REPORTES)
+    args = parser.parse_args()
+
+    import time
+    from config import get_config
+    from almacen_dataset import construir_dataset, rutas_fuentes
+
+    config = get_config()
+    df, _ = construir_dataset(rutas_fuentes(config), config.get('space_id'), config.get('areas') or ())
+    if df is None or df.empty:
+        print("❌ No hay datos para generar reportes")
+        return 1
+
+    inicio = time.perf_counter()
+    indice = generar_reportes(df, args.carpeta, args.procesos)
+    print(f"📄 Reporte de {len(df):,} tareas en {time.perf_counter() - inicio:.1f} s → {indice}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+"""
+Reporte del costo de importación por módulo al arrancar gantt_app
+Usa `python -X importtime` en un proceso limpio, en el mismo orden que la app:
+primero lo necesario para el primer render y luego los módulos diferidos. Las
+listas salen de las importaciones de gantt_app.py: las de primer nivel del
+módulo se cargan antes del primer render y las que están dentro de funciones
+o bloques se difieren
+
+Uso: python reporte_arranque.py [--aislado] [--top 15]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+SCRIPT_APP = "gantt_app.py"
+
+
+def modulos_app(ruta=SCRIPT_APP):
+    """
+    (módulos del primer render, módulos diferidos) importados por `ruta`, en el
+    orden en que aparecen. Un módulo ya cargado en el primer render no se repite
+    """
+    with open(ruta, encoding="utf-8") as f:
+        arbol = ast.parse(f.read(), filename=ruta)
+
+    def nombres(nodo):
+        if isinstance(nodo, ast.Import):
+            return [alias.name for alias in nodo.names]
+        if isinstance(nodo, ast.ImportFrom) and nodo.module and not nodo.level:
+            return [nodo.module]
+        return []
+
+    primer_nivel = {id(nodo) for nodo in arbol.body}
+    importaciones = sorted(
+        (n for n in ast.walk(arbol) if isinstance(n, (ast.Import, ast.ImportFrom))), key=lambda n: n.lineno
+    )
+    primer_render, diferidos = [], []
+    for nodo in importaciones:
+        destino = primer_render if id(nodo) in primer_nivel else diferidos
+        for modulo in nombres(nodo):
+            if modulo not in primer_render and modulo not in diferidos:
+                destino.append(modulo)
+    return primer_render, diferidos
+
+
+def medir_importaciones(modulos):
+    """
+    Importar `modulos` en orden en un proceso nuevo. Devuelve ({modulo: (propio_us, acumulado_us)}
+    de todos los módulos, {modulo: ...} solo de las importaciones de primer nivel)
+    """
+    codigo = "; ".join(f"import {modulo}" for modulo in modulos)
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(resultado.stderr.strip().splitlines()[-1])
+
+    tiempos = {}
+    primer_nivel = {}
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        valores = (int(propio), int(acumulado))
+        tiempos[nombre.strip()] = valores
+        # Las importaciones anidadas llevan sangría extra en la columna del nombre
+        if not nombre[1:].startswith(" "):
+            primer_nivel[nombre.strip()] = valores
+    return tiempos, primer_nivel
+
+
+def imprimir_tabla(titulo, filas):
+    print(f"\n{titulo}")
+    print("=" * 60)
+    print(f"  {'Módulo':<32}{'Acumulado (ms)':>14}{'Propio (ms)':>13}")
+    for nombre, (propio, acumulado) in filas:
+        print(f"  {nombre:<32}{acumulado / 1000:>14.1f}{propio / 1000:>13.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte del costo de importación de gantt_app")
+    parser.add_argument("--aislado", action="store_true", help="Medir además cada módulo en un proceso propio")
+    parser.add_argument("--top", type=int, default=15, help="Cantidad de módulos más costosos a listar")
+    args = parser.parse_args()
+
+    modulos_primer_render, modulos_diferidos = modulos_app(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), SCRIPT_APP)
+    )
+    orden = modulos_primer_render + modulos_diferidos
+    tiempos, primer_nivel = medir_importaciones(orden)
+
+    # En orden de la app, el acumulado de primer nivel es el costo incremental
+    # (0 si un módulo anterior ya lo había cargado)
+    primer_render = [(m, primer_nivel.get(m, (0, 0))) for m in modulos_primer_render]
+    diferidos = [(m, primer_nivel.get(m, (0, 0))) for m in modulos_diferidos]
+    total_primer_render = sum(acumulado for _, (_, acumulado) in primer_render)
+    total_diferidos = sum(acumulado for _, (_, acumulado) in diferidos)
+
+    print("🚀 REPORTE DE ARRANQUE - gantt_app")
+    imprimir_tabla("📋 Antes del primer render", primer_render)
+    imprimir_tabla("⏳ Diferidos (después del primer render)", diferidos)
+    print(f"\n  Primer render: {total_primer_render / 1000:.1f} ms de importaciones")
+    print(f"  Diferido:      {total_diferidos / 1000:.1f} ms de importaciones")
+
+    mas_costosos = sorted(tiempos.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    imprimir_tabla(f"🔥 Top {args.top} por tiempo propio", mas_costosos)
+
+    if args.aislado:
+        aislados = []
+        for modulo in orden:
+            try:
+                aislados.append((modulo, medir_importaciones([modulo])[1].get(modulo, (0, 0))))
+            except RuntimeError as e:
+                print(f"❌ {modulo}: {e}")
+        imprimir_tabla("🧪 Cada módulo en un proceso limpio", aislados)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""
+Reportes de análisis por proyecto (fases, dependencias y distribuciones)
+Versión parametrizada de analisis_proyecto_gantt.ipynb: en lugar de tareas y
+una fecha base fijas, cada archivo de tareas (JSON combinado, caché de espacio
+o snapshot reconstruido con historial_snapshots.py) se procesa a una fecha de
+corte y se divide en proyectos (carpetas, áreas o el archivo completo). Las
+fases son las listas de cada proyecto.
+
+La ruta crítica y la holgura salen de las dependencias de cada tarea. Un
+snapshot reconstruido solo las trae si el historial las guardó: en los deltas
+registrados antes de que el historial guardara todos los campos no están, y
+en esos reportes la holgura es solo la distancia al fin del proyecto (el
+reporte lo avisa).
+
+La tabla procesada de cada archivo (fechas, alertas y ruta crítica) se guarda
+en caché por contenido y fecha de corte, y un reporte solo se vuelve a generar
+si cambió su tabla. Archivos y proyectos se reparten entre procesos
+
+Uso: python reporte_proyectos.py ARCHIVO [ARCHIVO ...] [--por carpeta|area|archivo]
+     [--fecha-corte DD/MM/AAAA] [--procesos P] [--salida reportes_proyectos]
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+
+CARPETA_SALIDA = "reportes_proyectos"
+CARPETA_CACHE = ".cache"
+ARCHIVO_MANIFIESTO = "manifiesto.json"
+# Cambiar al modificar las tablas intermedias invalida la caché
+VERSION_TABLAS = 2
+COLUMNAS_PROYECTO = {'carpeta': 'Carpeta', 'area': 'Área', 'archivo': 'Fuente'}
+ESTADO_COMPLETADO = "Completado"
+COLORES_ESTADO = {"Completado": "#4CAF50", "En Progreso": "#FF9800", "Pendiente": "#F44336"}
+
+
+def leer_fuente(ruta):
+    """Datos área → carpeta → lista → estado → tareas de un archivo (.json o .json.gz)"""
+    abrir = gzip.open if ruta.endswith(".gz") else open
+    with abrir(ruta, "rt", encoding="utf-8") as f:
+        datos = json.load(f)
+    # Caché de un espacio (datos_espacios/): una sola área
+    if 'datos' in datos and 'space_id' in datos:
+        return {datos.get('area') or datos['space_id']: datos['datos']}
+    return datos
+
+
+def clave_tabla(ruta, fecha_corte):
+    """Huella del contenido del archivo, la fecha de corte y el calendario laboral"""
+    from config import obtener_calendario_laboral
+
+    huella = hashlib.sha1()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            huella.update(bloque)
+    huella.update(f"|{fecha_corte}|{obtener_calendario_laboral()}|{VERSION_TABLAS}".encode())
+    return huella.hexdigest()[:20]
+
+
+def construir_tabla(ruta, fecha_corte):
+    """Tareas procesadas a la fecha de corte con alertas, holgura y ruta crítica"""
+    import pandas as pd
+    from ruta_critica import calcular_ruta_critica
+    from utils_gantt import procesar_datos_gantt
+
+    df = procesar_datos_gantt(leer_fuente(ruta), hoy=fecha_corte)
+    if df.empty:
+        return df
+    ruta_critica, _ = calcular_ruta_critica(df)
+    ruta_critica = ruta_critica.reindex(df.index)
+    return df.assign(
+        Holgura=pd.to_numeric(ruta_critica['Holgura']).fillna(0).astype('int64'),
+        Critica=ruta_critica['Critica'].fillna(False).astype(bool),
+    )
+
+
+def preparar_tabla(ruta, fecha_corte, carpeta_cache):
+    """
+    Ruta del parquet con la tabla de `ruta` a la fecha de corte; se construye
+    solo si no está en caché. Devuelve (ruta del parquet, clave, reutilizada)
+    """
+    clave = clave_tabla(ruta, fecha_corte)
+    destino = os.path.join(carpeta_cache, f"{clave}.parquet")
+    if os.path.exists(destino):
+        return destino, clave, True
+    tabla = construir_tabla(ruta, fecha_corte)
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    tabla.to_parquet(temporal, index=False)
+    os.replace(temporal, destino)
+    return destino, clave, False
+
+
+@lru_cache(maxsize=4)
+def leer_tabla(ruta_tabla):
+    import pandas as pd
+
+    return pd.read_parquet(ruta_tabla)
+
+
+def tabla_fuente(ruta_tabla, fuente):
+    """
+    Tabla en caché con la columna Fuente (nombre del archivo de origen). La caché es
+    por contenido: archivos idénticos comparten tabla, así que el nombre no se guarda en ella
+    """
+    return leer_tabla(ruta_tabla).assign(Fuente=fuente)
+
+
+# ===== ANÁLISIS (las celdas del notebook) =====
+def resumen_fases(df):
+    """Por fase (lista): tareas, días hábiles, completadas y % de progreso, en orden de inicio"""
+    completadas = (df['Estado'] == ESTADO_COMPLETADO)
+    resumen = df.assign(Completadas=completadas).groupby('Lista', observed=True).agg(
+        Tareas=('Tarea', 'size'),
+        Dias_Habiles=('Dias_Habiles', 'sum'),
+        Completadas=('Completadas', 'sum'),
+        Inicio=('Fecha_Inicio', 'min'),
+        Fin=('Fecha_Limite', 'max'),
+    )
+    resumen['Progreso_%'] = (resumen['Completadas'] / resumen['Tareas'] * 100).round(1)
+    return resumen.sort_values('Inicio')
+
+
+def progreso_responsables(df):
+    """Por persona asignada: tareas totales, completadas y % de progreso"""
+    import pandas as pd
+
+    personas = df['Asignados'].astype(str).str.split(",").explode().str.strip()
+    personas = personas[personas != ""]
+    completadas = (df['Estado'] == ESTADO_COMPLETADO).reindex(personas.index)
+    resumen = pd.DataFrame({'Responsable': personas.to_numpy(), 'Completadas': completadas.to_numpy()})
+    resumen = resumen.groupby('Responsable').agg(Total_Tareas=('Completadas', 'size'), Completadas=('Completadas', 'sum'))
+    resumen['Progreso_%'] = (resumen['Completadas'] / resumen['Total_Tareas'] * 100).round(1)
+    return resumen.sort_values('Total_Tareas', ascending=False)
+
+
+def figura_gantt_fases(df, fecha_corte):
+    """Gantt por estado con las tareas agrupadas por fase; la ruta crítica con borde rojo"""
+    import plotly.graph_objects as go
+    from graficos_gantt import BORDE_CRITICO
+
+    df = df.sort_values(['Lista', 'Fecha_Inicio'])
+    etiquetas = (df['Lista'].astype(str) + " · " + df['Tarea'].astype(str)).tolist()
+    duracion_ms = ((df['Fecha_Limite'] - df['Fecha_Inicio']).dt.total_seconds() * 1000 + 86_400_000).tolist()
+    fig = go.Figure()
+    for estado, posiciones in df.reset_index(drop=True).groupby('Estado', observed=True).indices.items():
+        grupo = df.iloc[posiciones]
+        critica = grupo['Critica'].to_numpy()
+        fig.add_trace(go.Bar(
+            x=[duracion_ms[p] for p in posiciones],
+            y=[etiquetas[p] for p in posiciones],
+            base=grupo['Fecha_Inicio'].dt.strftime('%Y-%m-%d').tolist(),
+            orientation='h',
+            name=estado,
+            marker=dict(
+                color=COLORES_ESTADO.get(estado, "#9E9E9E"),
+                line=dict(
+                    color=[BORDE_CRITICO['color'] if c else "white" for c in critica],
+                    width=[BORDE_CRITICO['width'] if c else 1 for c in critica],
+                ),
+            ),
+            customdata=grupo[['Asignados', 'Prioridad', 'Dias_Habiles', 'Holgura']].to_numpy(),
+            hovertemplate="<b>%{y}</b><br>Inicio: %{base|%d/%m/%y}<br>"
+                          "Responsable: %{customdata[0]}<br>Prioridad: %{customdata[1]}<br>"
+                          "Duración: %{customdata[2]} días hábiles<br>Holgura: %{customdata[3]} días<extra></extra>",
+        ))
+    fig.add_vline(x=fecha_corte.isoformat(), line=dict(color="#2C3E50", dash="dash"))
+    fig.update_layout(
+        title="📅 Diagrama de Gantt por Fase",
+        barmode='overlay',
+        height=max(400, 22 * len(df) + 150),
+        xaxis=dict(type="date", tickformat="%d/%m/%y", gridcolor="#E5E5E5"),
+        yaxis=dict(autorange="reversed", categoryorder="array", categoryarray=etiquetas, tickfont=dict(size=10)),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=350, r=50, t=100, b=50),
+        plot_bgcolor="white",
+    )
+    return fig
+
+
+def figuras_distribucion(fases, responsables):
+    """Distribución de tareas por fase, progreso por responsable e hitos (fin de cada fase)"""
+    import plotly.express as px
+
+    figuras = [px.pie(
+        values=fases['Tareas'], names=fases.index, title="📊 Distribución de Tareas por Fase", hole=0.4
+    ).update_traces(textposition='inside', textinfo='percent+label')]
+    if len(responsables):
+        figuras.append(px.bar(
+            responsables.reset_index(), x='Responsable', y=['Completadas', 'Total_Tareas'],
+            title="👥 Progreso por Responsable", barmode='overlay',
+            labels={'value': 'Número de Tareas', 'variable': 'Estado'},
+            color_discrete_map={'Completadas': '#4CAF50', 'Total_Tareas': '#E0E0E0'},
+        ).update_layout(xaxis_tickangle=-45))
+    hitos = fases.assign(
+        Hito=[f"{'✅' if p == 100 else '🎯'} Fin de {fase}" for fase, p in zip(fases.index, fases['Progreso_%'])]
+    )
+    figuras.append(px.scatter(
+        hitos.reset_index(), x='Fin', y='Hito', color='Lista', title="🎯 Hitos por Fase"
+    ).update_traces(marker=dict(size=15, line=dict(width=2, color='white'))).update_layout(showlegend=False))
+    return figuras
+
+
+def reporte_proyecto(df, titulo, fecha_corte):
+    """HTML del reporte de un proyecto a la fecha de corte"""
+    from alertas_tareas import CATEGORIAS_RIESGO, resumen_alertas
+    from prerender_reportes import figura_html, pagina_html
+
+    fases = resumen_fases(df)
+    responsables = progreso_responsables(df)
+    completadas = int((df['Estado'] == ESTADO_COMPLETADO).sum())
+    metricas = [
+        ("📋 Tareas", len(df)),
+        ("✅ Completadas", f"{completadas} ({completadas / len(df) * 100:.1f}%)"),
+        ("📅 Duración", f"{(df['Fecha_Limite'].max() - df['Fecha_Inicio'].min()).days + 1} días"),
+        ("🧭 En ruta crítica", int(df['Critica'].sum())),
+    ] + [(CATEGORIAS_RIESGO[columna], cantidad) for columna, cantidad in resumen_alertas(df).items()]
+    partes = ['<div class="metricas">'] + [
+        f'<div class="metrica"><b>{html.escape(str(valor))}</b>{html.escape(etiqueta)}</div>'
+        for etiqueta, valor in metricas
+    ] + ['</div>']
+    if 'Dependencias' not in df.columns or not (df['Dependencias'].astype(str) != "").any():
+        partes.append(
+            "<p>⚠️ Las tareas no tienen dependencias: la ruta crítica y la holgura "
+            "solo reflejan el fin del proyecto</p>"
+        )
+    partes += ["<h2>📈 Resumen por Fase</h2>", fases.to_html(
+        formatters={'Inicio': '{:%d/%m/%Y}'.format, 'Fin': '{:%d/%m/%Y}'.format}, border=0
+    )]
+    partes.append(figura_html(figura_gantt_fases(df, fecha_corte)))
+    partes.extend(figura_html(fig) for fig in figuras_distribucion(fases, responsables))
+    return pagina_html(titulo, f"Fecha de corte: {fecha_corte:%d/%m/%Y}", "\n".join(partes))
+
+
+# ===== EJECUCIÓN EN LOTE =====
+def proyectos_de_tabla(tabla, por):
+    """Valores de la columna de proyecto presentes en la tabla"""
+    if tabla.empty:
+        return []
+    return sorted(tabla[COLUMNAS_PROYECTO[por]].dropna().astype(str).unique())
+
+
+def nombres_fuentes(rutas):
+    """
+    {ruta: (fuente, prefijo)}: el nombre que se muestra y el prefijo de sus reportes.
+    Archivos homónimos en carpetas distintas se muestran con la ruta relativa a la
+    carpeta común y su prefijo lleva un hash corto de la ruta
+    """
+    from collections import Counter
+    from prerender_reportes import nombre_seguro
+
+    tallos = {ruta: nombre_seguro(os.path.basename(ruta).split('.')[0]) or 'fuente' for ruta in rutas}
+    repetidos = Counter(tallos.values())
+    absolutas = {ruta: os.path.abspath(ruta) for ruta in rutas}
+    comun = os.path.commonpath([os.path.dirname(a) for a in absolutas.values()]) if rutas else ""
+    nombres = {}
+    for ruta, tallo in tallos.items():
+        if repetidos[tallo] == 1:
+            nombres[ruta] = (os.path.basename(ruta), tallo)
+        else:
+            huella = hashlib.sha1(absolutas[ruta].encode("utf-8")).hexdigest()[:6]
+            nombres[ruta] = (os.path.relpath(absolutas[ruta], comun), f"{tallo}_{huella}")
+    return nombres
+
+
+def generar_reporte(ruta_tabla, fuente, por, proyecto, archivo, fecha_corte):
+    """Escribir el reporte de un proyecto de la fuente. Devuelve su fila del índice"""
+    tabla = tabla_fuente(ruta_tabla, fuente)
+    df = tabla[tabla[COLUMNAS_PROYECTO[por]].astype(str) == proyecto]
+    fuente = df['Fuente'].iloc[0]
+    titulo = f"📊 {proyecto}" if por == "archivo" else f"📊 {proyecto} · {fuente}"
+    temporal = f"{archivo}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        f.write(reporte_proyecto(df, titulo, fecha_corte))
+    os.replace(temporal, archivo)
+    return fila_indice(df, proyecto, os.path.basename(archivo))
+
+
+def fila_indice(df, proyecto, archivo):
+    return {
+        'archivo': archivo,
+        'fuente': df['Fuente'].iloc[0],
+        'proyecto': proyecto,
+        'tareas': len(df),
+        'progreso': round(float((df['Estado'] == ESTADO_COMPLETADO).mean() * 100), 1),
+        'vencidas': int(df['Vencida'].sum()),
+    }
+
+
+def _preparar_tabla_proceso(argumentos):
+    return preparar_tabla(*argumentos)
+
+
+def _generar_reporte_proceso(argumentos):
+    return generar_reporte(*argumentos)
+
+
+def _mapear(funcion, trabajos, procesos):
+    if procesos > 1 and len(trabajos) > 1:
+        with ProcessPoolExecutor(max_workers=min(procesos, len(trabajos))) as pool:
+            return list(pool.map(funcion, trabajos, chunksize=max(1, len(trabajos) // (4 * procesos))))
+    return [funcion(trabajo) for trabajo in trabajos]
+
+
+def escribir_indice(salida, filas, fecha_corte):
+    from prerender_reportes import pagina_html
+
+    encabezado = "".join(f"<th>{t}</th>" for t in ("Archivo", "Proyecto", "Tareas", "Progreso", "Vencidas"))
+    cuerpo = "".join(
+        f"<tr><td>{html.escape(f['fuente'])}</td>"
+        f"<td><a href=\"{f['archivo']}\">{html.escape(f['proyecto'])}</a></td>"
+        f"<td>{f['tareas']}</td><td>{f['progreso']}%</td><td>{f['vencidas']}</td></tr>"
+        for f in sorted(filas, key=lambda f: (f['fuente'], f['proyecto']))
+    )
+    contenido = pagina_html(
+        "📚 Reportes por Proyecto", f"{len(filas)} reportes · fecha de corte {fecha_corte:%d/%m/%Y}",
+        f"<table><tr>{encabezado}</tr>{cuerpo}</table>", volver=None, con_graficos=False
+    )
+    with open(os.path.join(salida, "index.html"), "w", encoding="utf-8") as f:
+        f.write(contenido)
+
+
+def generar_reportes_proyectos(rutas, por="carpeta", fecha_corte=None, salida=CARPETA_SALIDA, procesos=1):
+    """
+    Generar los reportes de todos los proyectos de `rutas` a `fecha_corte`.
+    Devuelve un resumen con la ruta del índice y cuántas tablas y reportes se reutilizaron
+    """
+    from prerender_reportes import escribir_plotly, nombre_seguro
+
+    fecha_corte = fecha_corte or date.today()
+    carpeta_cache = os.path.join(salida, CARPETA_CACHE)
+    os.makedirs(carpeta_cache, exist_ok=True)
+    escribir_plotly(salida)
+
+    tablas = _mapear(_preparar_tabla_proceso, [(ruta, fecha_corte, carpeta_cache) for ruta in rutas], procesos)
+
+    ruta_manifiesto = os.path.join(salida, ARCHIVO_MANIFIESTO)
+    try:
+        with open(ruta_manifiesto, "r", encoding="utf-8") as f:
+            manifiesto = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifiesto = {}
+
+    # Un reporte cuya tabla no cambió se reutiliza tal cual
+    filas, pendientes, nuevo_manifiesto = [], [], {}
+    nombres = nombres_fuentes(rutas)
+    for ruta, (ruta_tabla, clave, _) in zip(rutas, tablas):
+        fuente, prefijo = nombres[ruta]
+        tabla = tabla_fuente(ruta_tabla, fuente)
+        for proyecto in proyectos_de_tabla(tabla, por):
+            # Por archivo el proyecto es la fuente: el prefijo ya lo nombra
+            if por == "archivo":
+                archivo = f"{prefijo}.html"
+            else:
+                archivo = f"{prefijo}_{nombre_seguro(proyecto) or 'proyecto'}.html"
+            clave_reporte = f"{clave}:{por}:{fuente}"
+            nuevo_manifiesto[archivo] = {'clave': clave_reporte}
+            previo = manifiesto.get(archivo)
+            if previo and previo['clave'] == clave_reporte and os.path.exists(os.path.join(salida, archivo)):
+                filas.append(previo['fila'])
+                nuevo_manifiesto[archivo]['fila'] = previo['fila']
+            else:
+                pendientes.append((ruta_tabla, fuente, por, proyecto, os.path.join(salida, archivo), fecha_corte))
+
+    for fila in _mapear(_generar_reporte_proceso, pendientes, procesos):
+        filas.append(fila)
+        nuevo_manifiesto[fila['archivo']]['fila'] = fila
+
+    escribir_indice(salida, filas, fecha_corte)
+    temporal = f"{ruta_manifiesto}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(nuevo_manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta_manifiesto)
+    return {
+        'indice': os.path.join(salida, "index.html"),
+        'reportes': len(filas),
+        'generados': len(pendientes),
+        'tablas_reutilizadas': sum(reutilizada for _, _, reutilizada in tablas),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reportes de análisis por proyecto")
+    parser.add_argument("archivos", nargs="+", help="Archivos JSON de tareas (se aceptan comodines)")
+    parser.add_argument("--por", choices=list(COLUMNAS_PROYECTO), default="carpeta", help="Qué es un proyecto")
+    parser.add_argument("--fecha-corte", help="DD/MM/AAAA (por defecto, hoy)")
+    parser.add_argument("--procesos", type=int, default=0, help=f"0 = todos los núcleos ({os.cpu_count()})")
+    parser.add_argument("--salida", default=CARPETA_SALIDA)
+    args = parser.parse_args()
+
+    import time
+
+    rutas = sorted({ruta for patron in args.archivos for ruta in glob.glob(patron)})
+    if not rutas:
+        print("❌ No se encontraron archivos de tareas")
+        return 1
+    fecha_corte = datetime.strptime(args.fecha_corte, "%d/%m/%Y").date() if args.fecha_corte else None
+
+    inicio = time.perf_counter()
+    resultado = generar_reportes_proyectos(rutas, args.por, fecha_corte, args.salida, args.procesos or os.cpu_count())
+    print(
+        f"📊 {resultado['reportes']} reportes de {len(rutas)} archivo(s) en {time.perf_counter() - inicio:.1f} s "
+        f"({resultado['generados']} generados, {resultado['tablas_reutilizadas']} tablas desde caché) → {resultado['indice']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""
+Simulación Monte Carlo del riesgo de cronograma por carpeta y lista
+La duración de cada tarea (días hábiles) se muestrea de una lognormal con mediana
+en su duración planificada y la dispersión del histórico de su estado y prioridad
+(las tareas completadas no varían). Cada lote es una matriz escenarios × tareas de
+NumPy; las dependencias se respetan recorriendo los niveles topológicos del grafo,
+con una operación vectorizada por nivel y no por escenario
+
+Uso: python riesgo_cronograma.py [--escenarios N] [--procesos P] [--fecha DD/MM/AAAA]
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+ESCENARIOS_POR_DEFECTO = 10_000
+TAMANO_LOTE = 500
+PERCENTILES = (50, 80, 95)
+ESTADOS_CERRADOS = ("Completado",)
+# Grupos estado × prioridad con menos tareas usan la dispersión global
+MINIMO_TAREAS_GRUPO = 5
+
+
+def dispersion_por_grupo(df):
+    """Desviación estándar del logaritmo de la duración en días hábiles por estado y prioridad"""
+    from calendario_laboral import dias_habiles_tareas
+
+    log_duracion = pd.Series(np.log(dias_habiles_tareas(df).astype('float64')), index=df.index)
+    dispersion_global = float(log_duracion.std(ddof=0)) if len(df) > 1 else 0.0
+    grupos = log_duracion.groupby([df['Estado'], df['Prioridad']], observed=True)
+    dispersion = grupos.std(ddof=0).where(grupos.size() >= MINIMO_TAREAS_GRUPO)
+    return dispersion.fillna(dispersion_global)
+
+
+def niveles_dependencias(grafo):
+    """
+    Aristas agrupadas por nivel topológico de la sucesora: lista de (sucesoras con
+    predecesoras en el nivel, predecesoras de cada arista, cortes por sucesora).
+    Las tareas en ciclos se programan sin dependencias
+    """
+    orden, _ = grafo.orden_topologico()
+    punteros, destino = grafo.listas()
+    nivel = [0] * grafo.n
+    for nodo in orden:
+        for arista in range(punteros[nodo], punteros[nodo + 1]):
+            nivel[destino[arista]] = max(nivel[destino[arista]], nivel[nodo] + 1)
+
+    validas = np.zeros(grafo.n, dtype=bool)
+    validas[orden] = True
+    usar = validas[grafo.origen] & validas[grafo.destino]
+    origen, destino_arr = grafo.origen[usar], grafo.destino[usar]
+    nivel = np.asarray(nivel)[destino_arr]
+    orden_aristas = np.lexsort((destino_arr, nivel))
+    origen, destino_arr, nivel = origen[orden_aristas], destino_arr[orden_aristas], nivel[orden_aristas]
+
+    niveles = []
+    for posiciones in np.split(np.arange(len(nivel)), np.flatnonzero(np.diff(nivel)) + 1):
+        if not len(posiciones):
+            continue
+        sucesoras, cortes = np.unique(destino_arr[posiciones], return_index=True)
+        niveles.append((sucesoras, origen[posiciones], cortes))
+    return niveles
+
+
+def preparar_modelo(df, grafo=None):
+    """Arreglos que necesita cada lote (se envían una vez a cada proceso)"""
+    from ruta_critica import origen_y_plan
+
+    origen_proyecto, inicio, duracion = origen_y_plan(df)
+    dispersion = dispersion_por_grupo(df)
+    sigma = dispersion.reindex(pd.MultiIndex.from_arrays([df['Estado'], df['Prioridad']])).to_numpy()
+    sigma = np.where(df['Estado'].isin(ESTADOS_CERRADOS).to_numpy(), 0.0, sigma).astype(np.float32)
+
+    # Tareas ordenadas por carpeta y lista: los fines se reducen por tramos contiguos
+    codigos_lista, listas = pd.factorize(pd.MultiIndex.from_arrays([df['Carpeta'], df['Lista']]), sort=True)
+    listas = listas.set_names(['Carpeta', 'Lista'])
+    orden = np.argsort(codigos_lista, kind="stable")
+    cortes_lista = np.flatnonzero(np.diff(codigos_lista[orden], prepend=-1))
+    carpetas_de_lista = listas.get_level_values(0)
+    cortes_carpeta = np.flatnonzero(np.r_[True, carpetas_de_lista[1:] != carpetas_de_lista[:-1]])
+
+    return {
+        'origen': origen_proyecto,
+        'inicio': inicio.astype(np.int32),
+        'duracion': duracion.astype(np.float32),
+        'sigma': sigma,
+        'niveles': niveles_dependencias(grafo) if grafo is not None and len(grafo.origen) else [],
+        'orden': orden,
+        'cortes_lista': cortes_lista,
+        'cortes_carpeta': cortes_carpeta,
+        'listas': listas,
+        'carpetas': pd.Index(carpetas_de_lista[cortes_carpeta], name='Carpeta'),
+    }
+
+
+def simular_lote(modelo, escenarios, semilla):
+    """Días de fin (exclusivos, desde el origen) de cada lista y carpeta: (escenarios × listas, × carpetas)"""
+    azar = np.random.default_rng(semilla)
+    ruido = azar.standard_normal((escenarios, len(modelo['duracion'])), dtype=np.float32)
+    duracion = np.maximum(1, np.rint(modelo['duracion'] * np.exp(modelo['sigma'] * ruido))).astype(np.int32)
+    inicio = np.broadcast_to(modelo['inicio'], duracion.shape).copy()
+
+    # Cada nivel toma el máximo fin de sus predecesoras (ya resueltas) por escenario
+    for sucesoras, predecesoras, cortes in modelo['niveles']:
+        fines = inicio[:, predecesoras] + duracion[:, predecesoras]
+        inicio[:, sucesoras] = np.maximum(inicio[:, sucesoras], np.maximum.reduceat(fines, cortes, axis=1))
+
+    fin = (inicio + duracion)[:, modelo['orden']]
+    fin_listas = np.maximum.reduceat(fin, modelo['cortes_lista'], axis=1)
+    return fin_listas, np.maximum.reduceat(fin_listas, modelo['cortes_carpeta'], axis=1)
+
+
+_MODELO_PROCESO = None
+
+
+def _iniciar_proceso(modelo):
+    global _MODELO_PROCESO
+    _MODELO_PROCESO = modelo
+
+
+def _simular_lote_proceso(escenarios, semilla):
+    return simular_lote(_MODELO_PROCESO, escenarios, semilla)
+
+
+def simular_riesgo(df, escenarios=ESCENARIOS_POR_DEFECTO, semilla=0, procesos=1, grafo=None):
+    """
+    Correr `escenarios` escenarios en lotes. Con `procesos` > 1 los lotes se
+    reparten entre procesos; el resultado es el mismo para la misma semilla
+    """
+    if grafo is None and 'Dependencias' in df.columns:
+        from ruta_critica import GrafoDependencias
+        grafo = GrafoDependencias.desde_dataframe(df)
+    modelo = preparar_modelo(df, grafo)
+
+    tamanos = [min(TAMANO_LOTE, escenarios - inicio) for inicio in range(0, escenarios, TAMANO_LOTE)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    if procesos > 1 and len(tamanos) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(procesos, len(tamanos)), initializer=_iniciar_proceso, initargs=(modelo,)
+        ) as pool:
+            lotes = list(pool.map(_simular_lote_proceso, tamanos, semillas))
+    else:
+        lotes = [simular_lote(modelo, tamano, semilla_lote) for tamano, semilla_lote in zip(tamanos, semillas)]
+
+    return {
+        'origen': modelo['origen'],
+        'listas': modelo['listas'],
+        'carpetas': modelo['carpetas'],
+        'fin_listas': np.concatenate([lote[0] for lote in lotes]),
+        'fin_carpetas': np.concatenate([lote[1] for lote in lotes]),
+    }
+
+
+def resumen_riesgo(resultado, nivel="Carpeta", fecha_objetivo=None):
+    """
+    Fechas de fin P50/P80/P95 por carpeta o por lista y, si se da `fecha_objetivo`,
+    la probabilidad (%) de terminar en o antes de esa fecha
+    """
+    if nivel == "Carpeta":
+        fines, indice = resultado['fin_carpetas'], resultado['carpetas']
+    else:
+        fines, indice = resultado['fin_listas'], resultado['listas']
+
+    from calendario_laboral import a_indice_habil, desde_indice_habil
+
+    # Los fines son exclusivos (en días hábiles): el último día de trabajo es el anterior
+    ultimo_dia = fines - 1
+    percentiles = np.percentile(ultimo_dia, PERCENTILES, axis=0, method="higher").astype(np.int64)
+    resumen = pd.DataFrame({
+        f"P{p}": pd.to_datetime(desde_indice_habil(resultado['origen'], fila))
+        for p, fila in zip(PERCENTILES, percentiles)
+    }, index=indice)
+    if fecha_objetivo is not None:
+        # Un objetivo en día no laborable equivale al último hábil anterior
+        limite = int(a_indice_habil(np.datetime64(fecha_objetivo, 'D'), resultado['origen'], roll='backward'))
+        resumen['Probabilidad'] = (ultimo_dia <= limite).mean(axis=0) * 100
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Riesgo de cronograma por carpeta (Monte Carlo)")
+    parser.add_argument("--escenarios", type=int, default=ESCENARIOS_POR_DEFECTO)
+    parser.add_argument("--procesos", type=int, default=1, help=f"0 = todos los núcleos ({os.cpu_count()})")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--fecha", help="Fecha objetivo DD/MM/AAAA para la probabilidad de terminar")
+    args = parser.parse_args()
+
+    import time
+    from config import get_config
+    from almacen_dataset import construir_dataset, rutas_fuentes
+
+    config = get_config()
+    df, _ = construir_dataset(rutas_fuentes(config), config.get('space_id'), config.get('areas') or ())
+    if df is None or df.empty:
+        print("❌ No hay datos para simular")
+        return 1
+
+    fecha = pd.to_datetime(args.fecha, dayfirst=True) if args.fecha else None
+    inicio = time.perf_counter()
+    resultado = simular_riesgo(df, args.escenarios, args.semilla, args.procesos or os.cpu_count())
+    print(f"🎲 {args.escenarios:,} escenarios × {len(df):,} tareas en {time.perf_counter() - inicio:.1f} s")
+    print(resumen_riesgo(resultado, "Carpeta", fecha).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
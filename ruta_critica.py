@@ -0,0 +1,352 @@
+"""
+Grafo de dependencias entre tareas y método de la ruta crítica (CPM)
+El grafo se arma vectorizado como arreglos CSR (aristas predecesora → sucesora
+ordenadas por origen). El orden topológico es un Kahn con cola, sin recursión, y
+las pasadas hacia adelante y hacia atrás recorren cada arista una vez: el costo es
+lineal en tareas + dependencias aunque la cadena tenga 100k tareas de profundidad.
+Las tareas que quedan sin ordenar están en un ciclo o detrás de uno.
+Los días del programa son días hábiles del calendario laboral
+"""
+import heapq
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_RUTA = ['Inicio_Temprano', 'Fin_Temprano', 'Inicio_Tardio', 'Fin_Tardio', 'Holgura', 'Critica']
+
+
+class GrafoDependencias:
+    """Aristas predecesora → sucesora en formato CSR sobre posiciones 0..n-1"""
+
+    def __init__(self, n, origen, destino):
+        self.n = n
+        origen = np.asarray(origen, dtype=np.int64)
+        orden = np.argsort(origen, kind="stable")
+        self.origen = origen[orden]
+        self.destino = np.asarray(destino, dtype=np.int64)[orden]
+        self.punteros = np.concatenate(([0], np.cumsum(np.bincount(self.origen, minlength=n))))
+        self._listas = None
+        self._inverso = None
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        """
+        Grafo a partir de las columnas Id y Dependencias (ids separados por comas).
+        Las dependencias hacia tareas fuera de `df` (p. ej. filtradas) se ignoran
+        """
+        ids = df['Id'].astype(str).to_numpy()
+        posicion = pd.Series(np.arange(len(ids)), index=ids)
+        posicion = posicion[~posicion.index.duplicated() & (posicion.index != "")]
+
+        dependencias = df['Dependencias'].astype(str).reset_index(drop=True).str.split(",").explode()
+        dependencias = dependencias[dependencias.str.len() > 0]
+        predecesoras = posicion.reindex(dependencias.to_numpy()).to_numpy()
+        validas = ~np.isnan(predecesoras)
+        return cls(len(df), predecesoras[validas], dependencias.index.to_numpy()[validas])
+
+    def listas(self):
+        """(punteros, destinos) como listas de Python para los recorridos nodo a nodo"""
+        if self._listas is None:
+            self._listas = (self.punteros.tolist(), self.destino.tolist())
+        return self._listas
+
+    @property
+    def inverso(self):
+        """Grafo con las aristas invertidas (sucesora → predecesora), construido una vez"""
+        if self._inverso is None:
+            self._inverso = GrafoDependencias(self.n, self.destino, self.origen)
+        return self._inverso
+
+    def alcanzables(self, nodo, validas):
+        """Posiciones alcanzables desde `nodo` (incluido) sin pasar por nodos no válidos"""
+        punteros, destino = self.listas()
+        alcanzadas = [nodo]
+        vistas = {nodo}
+        for actual in alcanzadas:
+            for arista in range(punteros[actual], punteros[actual + 1]):
+                siguiente = destino[arista]
+                if validas[siguiente] and siguiente not in vistas:
+                    vistas.add(siguiente)
+                    alcanzadas.append(siguiente)
+        return alcanzadas
+
+    def orden_topologico(self):
+        """Orden de Kahn (lista de posiciones) y posiciones que no se pudieron ordenar"""
+        punteros, destino = self.listas()
+        grado = np.bincount(self.destino, minlength=self.n).tolist()
+
+        cola = deque(np.flatnonzero(np.asarray(grado) == 0).tolist())
+        orden = []
+        while cola:
+            nodo = cola.popleft()
+            orden.append(nodo)
+            for arista in range(punteros[nodo], punteros[nodo + 1]):
+                sucesora = destino[arista]
+                grado[sucesora] -= 1
+                if grado[sucesora] == 0:
+                    cola.append(sucesora)
+        return orden, np.flatnonzero(np.asarray(grado) > 0)
+
+
+def nodos_en_ciclos(grafo, bloqueados):
+    """
+    De las posiciones bloqueadas, las que forman ciclos: se descartan con una cola
+    las que no tienen sucesoras bloqueadas (solo esperan a un ciclo)
+    """
+    restantes = np.zeros(grafo.n, dtype=bool)
+    restantes[bloqueados] = True
+    dentro = restantes[grafo.origen] & restantes[grafo.destino]
+    inverso = GrafoDependencias(grafo.n, grafo.destino[dentro], grafo.origen[dentro])
+    punteros = inverso.punteros.tolist()
+    predecesoras = inverso.destino.tolist()
+    salida = np.bincount(grafo.origen[dentro], minlength=grafo.n).tolist()
+
+    cola = deque(np.flatnonzero(restantes & (np.asarray(salida) == 0)).tolist())
+    restantes = restantes.tolist()
+    while cola:
+        nodo = cola.popleft()
+        restantes[nodo] = False
+        for arista in range(punteros[nodo], punteros[nodo + 1]):
+            predecesora = predecesoras[arista]
+            salida[predecesora] -= 1
+            if salida[predecesora] == 0:
+                cola.append(predecesora)
+    return np.flatnonzero(restantes)
+
+
+def programar(grafo, planificado, duracion):
+    """
+    Pasadas CPM en días desde el origen del proyecto. Devuelve el programa
+    {planificado, duracion, inicio_temprano, fin_tardio, validas, rango, fin_proyecto, ciclos}
+    """
+    orden, bloqueados = grafo.orden_topologico()
+    ciclos = nodos_en_ciclos(grafo, bloqueados) if len(bloqueados) else bloqueados
+    validas = np.zeros(grafo.n, dtype=bool)
+    validas[orden] = True
+    # Posición de cada tarea en el orden topológico (guía los cambios incrementales)
+    rango = np.full(grafo.n, grafo.n, dtype=np.int64)
+    rango[orden] = np.arange(len(orden))
+
+    punteros, destino = grafo.listas()
+    duracion_lista = duracion.tolist()
+    validas_lista = validas.tolist()
+
+    # Pasada hacia adelante: cada tarea empuja su fin temprano a sus sucesoras
+    inicio_temprano = planificado.tolist()
+    for nodo in orden:
+        fin = inicio_temprano[nodo] + duracion_lista[nodo]
+        for arista in range(punteros[nodo], punteros[nodo + 1]):
+            sucesora = destino[arista]
+            if fin > inicio_temprano[sucesora]:
+                inicio_temprano[sucesora] = fin
+    inicio_temprano = np.asarray(inicio_temprano, dtype=np.int64)
+    fin_temprano = inicio_temprano + duracion
+    fin_proyecto = int(fin_temprano[validas].max()) if validas.any() else 0
+
+    # Pasada hacia atrás: el fin tardío es el menor inicio tardío de las sucesoras
+    fin_tardio = [fin_proyecto] * grafo.n
+    for nodo in reversed(orden):
+        limite = fin_tardio[nodo]
+        for arista in range(punteros[nodo], punteros[nodo + 1]):
+            sucesora = destino[arista]
+            if validas_lista[sucesora]:
+                limite = min(limite, fin_tardio[sucesora] - duracion_lista[sucesora])
+        fin_tardio[nodo] = limite
+
+    return {
+        'planificado': planificado,
+        'duracion': duracion,
+        'inicio_temprano': inicio_temprano,
+        'fin_tardio': np.asarray(fin_tardio, dtype=np.int64),
+        'validas': validas,
+        'rango': rango,
+        'fin_proyecto': fin_proyecto,
+        'ciclos': ciclos,
+    }
+
+
+def tabla_programa(programa, origen_proyecto, indice, calendario=None):
+    """Fechas, holgura (días hábiles) y marca de ruta crítica de un programa como DataFrame"""
+    from calendario_laboral import desde_indice_habil
+
+    validas = programa['validas']
+    inicio_temprano = programa['inicio_temprano']
+    fin_tardio = programa['fin_tardio']
+    inicio_tardio = fin_tardio - programa['duracion']
+    holgura = inicio_tardio - inicio_temprano
+
+    # Las tareas bloqueadas por un ciclo no tienen fechas válidas
+    def a_fecha(dias):
+        return pd.to_datetime(desde_indice_habil(origen_proyecto, dias, calendario)).where(validas)
+
+    resultado = pd.DataFrame({
+        'Inicio_Temprano': a_fecha(inicio_temprano),
+        'Fin_Temprano': a_fecha(inicio_temprano + programa['duracion'] - 1),
+        'Inicio_Tardio': a_fecha(inicio_tardio),
+        'Fin_Tardio': a_fecha(fin_tardio - 1),
+        'Holgura': pd.Series(holgura).where(validas),
+        'Critica': validas & (holgura == 0),
+    })
+    resultado.index = indice
+    return resultado
+
+
+def origen_y_plan(df, calendario=None):
+    """
+    Primer día hábil del proyecto, inicios planificados (días hábiles desde él) y
+    duraciones en días hábiles
+    """
+    from calendario_laboral import a_dias, a_indice_habil, dias_habiles_tareas, sumar_dias_habiles
+
+    origen_proyecto = sumar_dias_habiles(a_dias(df['Fecha_Inicio']).min(), 0, calendario)
+    planificado = a_indice_habil(df['Fecha_Inicio'], origen_proyecto, calendario).astype(np.int64)
+    return origen_proyecto, planificado, dias_habiles_tareas(df, calendario)
+
+
+def calcular_ruta_critica(df, grafo=None):
+    """
+    Inicio/fin temprano y tardío, holgura (días) y marca de ruta crítica por tarea.
+    Una tarea no empieza antes de su fecha de inicio planificada ni antes de que
+    terminen sus predecesoras. Devuelve (DataFrame alineado con df, posiciones en ciclos)
+    """
+    if grafo is None:
+        grafo = GrafoDependencias.desde_dataframe(df)
+    if grafo.n == 0:
+        return pd.DataFrame(columns=COLUMNAS_RUTA), np.empty(0, dtype=np.int64)
+
+    origen_proyecto, planificado, duracion = origen_y_plan(df)
+    programa = programar(grafo, planificado, duracion)
+    return tabla_programa(programa, origen_proyecto, df.index), programa['ciclos']
+
+
+def propagar_cambio(grafo, programa, posicion, nuevo_inicio, nueva_duracion):
+    """
+    Programa resultante de mover la tarea `posicion` (inicio planificado en días
+    desde el origen y duración nuevos) sin recalcular todo el plan. Las tareas se
+    revisan en orden topológico (heap por rango) y solo se sigue por las sucesoras
+    de las que cambiaron. El fin tardío no depende de los inicios: se desplaza con
+    el fin del proyecto y, si cambió la duración, se revisan solo predecesoras.
+    Devuelve (programa nuevo, posiciones cuyas fechas o duración cambiaron)
+    """
+    validas = programa['validas']
+    if not validas[posicion]:
+        raise ValueError("La tarea está en un ciclo de dependencias o detrás de uno")
+
+    planificado = programa['planificado'].copy()
+    duracion = programa['duracion'].copy()
+    planificado[posicion] = nuevo_inicio
+    duracion[posicion] = nueva_duracion
+    rango = programa['rango']
+    punteros, destino = grafo.listas()
+    punteros_inv, origen_inv = grafo.inverso.listas()
+
+    # Hacia adelante: inicio = máximo entre lo planificado y el fin de las predecesoras
+    inicio_temprano = programa['inicio_temprano'].copy()
+    cambiadas = []
+    en_cola = {posicion}
+    cola = [(rango[posicion], posicion)]
+    while cola:
+        _, nodo = heapq.heappop(cola)
+        inicio = int(planificado[nodo])
+        for arista in range(punteros_inv[nodo], punteros_inv[nodo + 1]):
+            predecesora = origen_inv[arista]
+            inicio = max(inicio, int(inicio_temprano[predecesora] + duracion[predecesora]))
+        if inicio == inicio_temprano[nodo] and nodo != posicion:
+            continue
+        inicio_temprano[nodo] = inicio
+        cambiadas.append(nodo)
+        for arista in range(punteros[nodo], punteros[nodo + 1]):
+            sucesora = destino[arista]
+            if validas[sucesora] and sucesora not in en_cola:
+                en_cola.add(sucesora)
+                heapq.heappush(cola, (rango[sucesora], sucesora))
+
+    fin_proyecto = int((inicio_temprano + duracion)[validas].max())
+    fin_tardio = programa['fin_tardio'] + (fin_proyecto - programa['fin_proyecto'])
+
+    if nueva_duracion != programa['duracion'][posicion]:
+        # Hacia atrás, en orden topológico inverso desde las predecesoras de la tarea
+        en_cola = set()
+        cola = []
+        for arista in range(punteros_inv[posicion], punteros_inv[posicion + 1]):
+            en_cola.add(origen_inv[arista])
+            heapq.heappush(cola, (-rango[origen_inv[arista]], origen_inv[arista]))
+        while cola:
+            _, nodo = heapq.heappop(cola)
+            limite = fin_proyecto
+            for arista in range(punteros[nodo], punteros[nodo + 1]):
+                sucesora = destino[arista]
+                if validas[sucesora]:
+                    limite = min(limite, int(fin_tardio[sucesora] - duracion[sucesora]))
+            if limite == fin_tardio[nodo]:
+                continue
+            fin_tardio[nodo] = limite
+            for arista in range(punteros_inv[nodo], punteros_inv[nodo + 1]):
+                predecesora = origen_inv[arista]
+                if predecesora not in en_cola:
+                    en_cola.add(predecesora)
+                    heapq.heappush(cola, (-rango[predecesora], predecesora))
+
+    nuevo = dict(
+        programa, planificado=planificado, duracion=duracion, inicio_temprano=inicio_temprano,
+        fin_tardio=fin_tardio, fin_proyecto=fin_proyecto
+    )
+    return nuevo, np.sort(np.asarray(cambiadas, dtype=np.int64))
+
+
+def fechas_programadas(df, programa, posiciones, origen_proyecto, calendario=None):
+    """Filas de `posiciones` con las fechas de inicio y límite que les da el programa"""
+    from calendario_laboral import desde_indice_habil
+
+    inicio_temprano = programa['inicio_temprano'][posiciones]
+    dias = programa['duracion'][posiciones]
+    inicio = desde_indice_habil(origen_proyecto, inicio_temprano, calendario)
+    fin = desde_indice_habil(origen_proyecto, inicio_temprano + dias - 1, calendario)
+    return df.iloc[posiciones].assign(
+        Fecha_Inicio=pd.to_datetime(inicio),
+        Fecha_Limite=pd.to_datetime(fin),
+        Duracion=(fin - inicio).astype(np.int64) + 1,
+        Dias_Habiles=dias
+    )
+
+
+def comparar_programas(df, base, nuevo, posiciones, origen_proyecto):
+    """Tareas reprogramadas con sus fechas, desplazamiento (días hábiles) y holgura antes y después"""
+    antes = fechas_programadas(df, base, posiciones, origen_proyecto)
+    despues = fechas_programadas(df, nuevo, posiciones, origen_proyecto)
+
+    def holgura(programa):
+        return (programa['fin_tardio'] - programa['duracion'] - programa['inicio_temprano'])[posiciones]
+
+    return pd.DataFrame({
+        'Tarea': antes['Tarea'],
+        'Asignados': antes['Asignados'],
+        'Inicio_Base': antes['Fecha_Inicio'],
+        'Inicio_Nuevo': despues['Fecha_Inicio'],
+        'Fin_Base': antes['Fecha_Limite'],
+        'Fin_Nuevo': despues['Fecha_Limite'],
+        'Desplazamiento': despues['Dias_Habiles'] + nuevo['inicio_temprano'][posiciones] -
+                          antes['Dias_Habiles'] - base['inicio_temprano'][posiciones],
+        'Holgura_Base': holgura(base),
+        'Holgura_Nueva': holgura(nuevo),
+    })
+
+
+def cambios_ruta_critica(base, nuevo):
+    """Posiciones que entran y salen de la ruta crítica y cuántas cambian de holgura"""
+    def holgura(programa):
+        return programa['fin_tardio'] - programa['duracion'] - programa['inicio_temprano']
+
+    validas = base['validas']
+    antes, despues = holgura(base), holgura(nuevo)
+    return {
+        'entran': np.flatnonzero(validas & (antes != 0) & (despues == 0)),
+        'salen': np.flatnonzero(validas & (antes == 0) & (despues != 0)),
+        'holgura_cambiada': int((validas & (antes != despues)).sum()),
+    }
+
+
+def tareas_en_ciclos(df, ciclos):
+    """Nombres de las tareas que forman ciclos de dependencias"""
+    return df['Tarea'].iloc[ciclos].astype(str).tolist()
@@ -94,6 +94,12 @@ def convertir_fecha(fecha_str):
     except:
         return None
 
+def convertir_fechas(serie):
+    """convertir_fecha sobre una columna completa, sin parsear fila por fila"""
+    texto = serie.where(serie != 'N/A')
+    fechas = pd.to_datetime(texto, format='%d/%m/%y', errors='coerce')
+    return fechas.fillna(pd.to_datetime(texto, format='%Y-%m-%d', errors='coerce'))
+
 def crear_diagrama_gantt(df):
     if df.empty:
         return None
@@ -164,28 +170,26 @@ def aplicar_filtros(df, filtros):
     if filtros.get('asignados'):
         def fa(s): return any(a in filtros['asignados'] for a in (s.split(',') if s and s!='N/A' else []))
         df_f = df_f[df_f['Asignados'].apply(fa)]
+    # Las fechas límite se convierten una vez por columna (NaT si no se pueden leer)
+    limite = convertir_fechas(df_f['Fecha Límite'])
     if filtros.get('fecha_inicio') and filtros.get('fecha_fin'):
-        def inrange(fs):
-            f = convertir_fecha(fs)
-            if not f:
-                return False
-            return filtros['fecha_inicio'] <= f.date() <= filtros['fecha_fin']
-        df_f = df_f[df_f['Fecha Límite'].apply(inrange)]
+        df_f = df_f[limite.between(pd.Timestamp(filtros['fecha_inicio']), pd.Timestamp(filtros['fecha_fin']))]
     if filtros['buscar_texto']:
         df_f = df_f[df_f['Tarea'].str.contains(filtros['buscar_texto'], case=False, na=False)]
-    fr = filtros['filtro_rapido']; hoy = datetime.now().date()
+    limite = limite.reindex(df_f.index)
+    fr = filtros['filtro_rapido']; hoy = pd.Timestamp(datetime.now().date())
     if fr == "Solo Pendientes": df_f = df_f[df_f['Estado']=="pendiente"]
     elif fr == "Solo En Progreso": df_f = df_f[df_f['Estado']=="en progreso"]
     elif fr == "Solo Completadas": df_f = df_f[df_f['Estado']=="completado"]
     elif fr == "Prioridad Alta": df_f = df_f[df_f['Prioridad'].isin(['high','urgent'])]
     elif fr == "Sin Asignar": df_f = df_f[df_f['Asignados'].isin(['','N/A'])]
     elif fr == "Vencidas Pendientes":
-        df_f = df_f[(df_f['Estado']!="completado") & (df_f['Fecha Límite'].apply(lambda f: convertir_fecha(f) and convertir_fecha(f).date() < hoy))]
+        df_f = df_f[(df_f['Estado']!="completado") & (limite < hoy)]
     elif fr == "Esta Semana":
         inicio = hoy - timedelta(days=hoy.weekday()); fin = inicio + timedelta(days=6)
-        df_f = df_f[df_f['Fecha Límite'].apply(lambda f: convertir_fecha(f) and inicio <= convertir_fecha(f).date() <= fin)]
+        df_f = df_f[limite.between(inicio, fin)]
     elif fr == "Próximos 7 Días":
-        df_f = df_f[df_f['Fecha Límite'].apply(lambda f: convertir_fecha(f) and hoy <= convertir_fecha(f).date() <= hoy + timedelta(days=7))]
+        df_f = df_f[limite.between(hoy, hoy + timedelta(days=7))]
     if filtros['solo_activas']: df_f = df_f[df_f['Estado'] != 'completado']
     return df_f
 
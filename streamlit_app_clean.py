@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 import os
+from tabla_paginada import mostrar_tabla_paginada
 
 # ===== CONFIGURACIÓN BÁSICA =====
 st.set_page_config(
@@ -609,7 +610,7 @@ def main():
             st.subheader("📋 Tabla de Tareas")
             
             if len(df_filtrado) > 0:
-                st.dataframe(df_filtrado, use_container_width=True, hide_index=True)
+                mostrar_tabla_paginada(df_filtrado, "tabla_tareas")
                 
                 # Descarga CSV
                 csv = df_filtrado.to_csv(index=False)
@@ -0,0 +1,79 @@
+"""
+Tabla paginada del lado del servidor para Streamlit
+Ordena con un índice de posiciones y solo toma, renombra y formatea las filas
+de la página visible; el navegador nunca recibe el DataFrame completo
+"""
+import math
+
+TAMANOS_PAGINA = (25, 50, 100, 250)
+SIN_ORDEN = "(sin ordenar)"
+
+
+def posiciones_ordenadas(df, columna, descendente=False):
+    """Posiciones de las filas ordenadas por `columna` (vacíos al final, orden estable)"""
+    import numpy as np
+
+    if columna is None or columna not in df.columns:
+        return np.arange(len(df))
+    serie = df[columna].reset_index(drop=True)
+    return serie.sort_values(ascending=not descendente, kind="stable", na_position="last").index.to_numpy()
+
+
+def obtener_pagina(df, pagina, tamano, columna_orden=None, descendente=False):
+    """Filas de la página `pagina` (desde 1) y el total de páginas"""
+    total_paginas = max(1, math.ceil(len(df) / tamano))
+    pagina = min(max(1, pagina), total_paginas)
+    inicio = (pagina - 1) * tamano
+    if columna_orden is None:
+        return df.iloc[inicio:inicio + tamano], total_paginas
+    posiciones = posiciones_ordenadas(df, columna_orden, descendente)
+    return df.take(posiciones[inicio:inicio + tamano]), total_paginas
+
+
+def formatear_pagina(df_pagina, columnas, columnas_fecha=(), formato_fecha="%d/%m/%Y"):
+    """Seleccionar y renombrar columnas ({columna: etiqueta}) y formatear fechas de la página"""
+    vista = df_pagina[list(columnas)].copy()
+    for columna in columnas_fecha:
+        if columna in vista.columns:
+            vista[columna] = vista[columna].dt.strftime(formato_fecha)
+    return vista.rename(columns=columnas)
+
+
+def mostrar_tabla_paginada(df, clave, columnas=None, columnas_fecha=(), formato_fecha="%d/%m/%Y"):
+    """
+    Mostrar `df` en páginas con orden del lado del servidor. `columnas` mapea
+    columna → etiqueta (por defecto todas); `clave` separa el estado de cada tabla
+    """
+    import streamlit as st
+
+    columnas = columnas or {columna: columna for columna in df.columns}
+    etiquetas = {etiqueta: columna for columna, etiqueta in columnas.items()}
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        orden = st.selectbox("Ordenar por", [SIN_ORDEN] + list(etiquetas), key=f"{clave}_orden")
+    with col2:
+        descendente = st.checkbox("Descendente", key=f"{clave}_descendente")
+    with col3:
+        tamano = st.selectbox("Filas por página", TAMANOS_PAGINA, key=f"{clave}_tamano")
+    total_paginas = max(1, math.ceil(len(df) / tamano))
+    with col4:
+        # El máximo cambia con los filtros: la página guardada se ajusta al rango nuevo
+        clave_pagina = f"{clave}_pagina"
+        if st.session_state.get(clave_pagina, 1) > total_paginas:
+            st.session_state[clave_pagina] = total_paginas
+        pagina = st.number_input("Página", min_value=1, max_value=total_paginas, step=1, key=clave_pagina)
+
+    columna_orden = etiquetas.get(orden)
+    df_pagina, total_paginas = obtener_pagina(df, int(pagina), tamano, columna_orden, descendente)
+    st.dataframe(
+        formatear_pagina(df_pagina, columnas, columnas_fecha, formato_fecha),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    inicio = (int(pagina) - 1) * tamano
+    st.caption(
+        f"Mostrando {min(inicio + 1, len(df))}–{min(inicio + tamano, len(df))} "
+        f"de {len(df)} tareas · página {int(pagina)} de {total_paginas}"
+    )
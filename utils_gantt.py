@@ -5,19 +5,380 @@ Versión limpia sin dependencias externas
 import json
 import os
 
+from instrumentacion import cronometrado, fijar
+
 def dummy_function():
     """Función dummy para mantener compatibilidad"""
     pass
 
 # Funciones básicas que podrían ser necesarias
-def verificar_datos_existentes():
-    """Verifica si existen datos locales"""
-    return os.path.exists("tareas_sin_subtareas.json")
+ARCHIVO_DATOS = "tareas_sin_subtareas.json"
+
+def verificar_datos_existentes(archivo=ARCHIVO_DATOS):
+    """Verifica si existen datos locales y su antigüedad en horas"""
+    from datetime import datetime
+
+    if not os.path.exists(archivo):
+        return {"existe": False, "horas_antiguedad": None, "version": None}
+    mtime = os.path.getmtime(archivo)
+    horas = (datetime.now().timestamp() - mtime) / 3600
+    return {"existe": True, "horas_antiguedad": horas, "version": mtime}
 
 def procesar_datos_basico(datos):
     """Procesa datos básicos"""
     return datos
 
+FORMATO_FECHA = "%d/%m/%y"
+
+def convertir_fecha(fecha_str):
+    """Convertir fecha en formato dd/mm/yy a datetime"""
+    from datetime import datetime
+
+    if fecha_str and fecha_str.strip():
+        try:
+            return datetime.strptime(fecha_str, FORMATO_FECHA)
+        except ValueError:
+            return None
+    return None
+
+# Sin fechas: inicio N días calendario antes de hoy y duración en días hábiles, por estado
+DIAS_ATRAS_SIN_INICIO = {"Completado": 30, "En Progreso": 15}
+DIAS_HABILES_SIN_LIMITE = {"Completado": 5}
+DIAS_HABILES_PREDETERMINADOS = 10
+
+@cronometrado("procesar_datos")
+def procesar_datos_gantt(data, espacios=None, areas=None, hoy=None):
+    """
+    Procesar datos para el diagrama de Gantt (todas las áreas del JSON).
+    `espacios` mapea área → space_id; `areas` limita las áreas incluidas.
+    Incluye las alertas de riesgo a la fecha `hoy` (por defecto, la actual)
+    """
+    import pandas as pd
+
+    espacios = espacios or {}
+    tareas = []
+    
+    for area, carpetas in data.items():
+        if areas and area not in areas:
+            continue
+        for carpeta, listas in carpetas.items():
+            for lista, estados in listas.items():
+                for estado, lista_tareas in estados.items():
+                    for tarea in lista_tareas:
+                        tareas.append({
+                            "Id": tarea.get("id") or "",
+                            "Tarea": tarea["nombre"][:50] + "..." if len(tarea["nombre"]) > 50 else tarea["nombre"],
+                            "Nombre_Completo": tarea["nombre"],
+                            "Área": area,
+                            "Espacio": espacios.get(area, ""),
+                            "Carpeta": carpeta,
+                            "Lista": lista,
+                            "Estado": estado.title(),
+                            "Asignados": ", ".join(tarea["asignados"]) if tarea["asignados"] else "Sin asignar",
+                            "Prioridad": tarea.get("prioridad", "normal").title() if tarea.get("prioridad") else "Normal",
+                            # Texto dd/mm/yy: se convierte por columna en completar_fechas
+                            "Fecha_Inicio": tarea.get("fecha_inicio"),
+                            "Fecha_Limite": tarea.get("fecha_limite"),
+                            # Ids de las tareas que esta espera, separados por comas
+                            "Dependencias": ",".join(tarea.get("dependencias") or [])
+                        })
+    
+    df = pd.DataFrame(tareas)
+    if df.empty:
+        return df
+    from alertas_tareas import clasificar_riesgo
+    return clasificar_riesgo(completar_fechas(df, hoy), hoy)
+
+def completar_fechas(df, hoy=None, calendario=None):
+    """
+    Imputar fechas faltantes y calcular Duracion (días calendario, largo de la
+    barra), Dias_Habiles y Fechas_Estimadas sobre las columnas completas, sin
+    bucles por fila
+    """
+    from datetime import date
+    import numpy as np
+    import pandas as pd
+    from calendario_laboral import calendario_configurado, dias_habiles, sumar_dias_habiles
+
+    calendario = calendario or calendario_configurado()
+    hoy = pd.Timestamp(hoy or date.today())
+    # Como convertir_fecha: dd/mm/yy; vacías o inválidas quedan sin fecha
+    inicio = pd.to_datetime(df['Fecha_Inicio'], format=FORMATO_FECHA, errors='coerce')
+    limite = pd.to_datetime(df['Fecha_Limite'], format=FORMATO_FECHA, errors='coerce')
+    estimadas = (inicio.isna() | limite.isna()).to_numpy()
+    
+    # Sin inicio: hace 30 días (completadas), 15 (en progreso) o hoy
+    dias_atras = df['Estado'].map(DIAS_ATRAS_SIN_INICIO).fillna(0).astype('int64')
+    inicio = inicio.fillna(hoy - pd.to_timedelta(dias_atras, unit='D'))
+    
+    # Sin límite: 5 días hábiles (completadas) o 10 desde el inicio
+    sin_limite = limite.isna().to_numpy()
+    if sin_limite.any():
+        habiles = df['Estado'].map(DIAS_HABILES_SIN_LIMITE).fillna(DIAS_HABILES_PREDETERMINADOS).astype('int64')
+        estimado = sumar_dias_habiles(inicio[sin_limite], habiles.to_numpy()[sin_limite] - 1, calendario)
+        limite = limite.copy()
+        limite[sin_limite] = pd.to_datetime(estimado)
+    
+    # Asegurar que fecha_limite >= fecha_inicio
+    limite = limite.where(limite >= inicio, inicio + pd.Timedelta(days=1))
+    
+    df = df.assign(
+        Fecha_Inicio=inicio,
+        Fecha_Limite=limite,
+        Duracion=(limite.dt.normalize() - inicio.dt.normalize()).dt.days + 1,
+        Dias_Habiles=np.maximum(dias_habiles(inicio, limite, calendario), 1),
+        # Alguna fecha no venía de ClickUp y se imputó
+        Fechas_Estimadas=estimadas
+    )
+    # Las duraciones van a continuación de las fechas, como en las exportaciones
+    columnas = [c for c in df.columns if c not in ('Duracion', 'Dias_Habiles')]
+    posicion = columnas.index('Fecha_Limite') + 1
+    return df[columnas[:posicion] + ['Duracion', 'Dias_Habiles'] + columnas[posicion:]]
+
+# ===== DATASET COMPARTIDO =====
+def activar_copy_on_write():
+    """
+    Copy-on-write de pandas: los subconjuntos de un DataFrame compartido son vistas
+    y una escritura copia solo lo modificado, sin tocar el original
+    """
+    import pandas as pd
+
+    try:
+        pd.set_option("mode.copy_on_write", True)
+    except (KeyError, ValueError):
+        # pandas 3 ya trabaja siempre así
+        pass
+
+def opciones_filtros(df):
+    """Valores disponibles de cada filtro del sidebar (se calculan una vez por dataset)"""
+    asignados = (
+        df.loc[df['Asignados'] != "Sin asignar", 'Asignados']
+        .str.split(",").explode().str.strip().unique()
+    )
+    return {
+        'areas': sorted(df['Área'].unique().tolist()),
+        'carpetas': sorted(df['Carpeta'].unique().tolist()),
+        'estados': sorted(df['Estado'].unique().tolist()),
+        'prioridades': sorted(df['Prioridad'].unique().tolist()),
+        'asignados': sorted(asignados.tolist()),
+        'fecha_min': df['Fecha_Inicio'].min(),
+        'fecha_max': df['Fecha_Limite'].max(),
+    }
+
+# ===== FILTROS DEL SIDEBAR =====
+# Cada filtro devuelve una máscara booleana, o None si no filtra nada
+def _mascara_area(df, area):
+    return None if area in (None, "Todas") else (df['Área'] == area).to_numpy()
+
+def _mascara_carpeta(df, carpeta):
+    return None if carpeta in (None, "Todas") else (df['Carpeta'] == carpeta).to_numpy()
+
+def _mascara_estados(df, estados):
+    return None if not estados or "Todos" in estados else df['Estado'].isin(estados).to_numpy()
+
+def _mascara_prioridades(df, prioridades):
+    return None if not prioridades or "Todas" in prioridades else df['Prioridad'].isin(prioridades).to_numpy()
+
+def _mascara_asignado(df, asignado):
+    if asignado in (None, "Todos"):
+        return None
+    return df['Asignados'].str.contains(asignado, na=False, regex=False).to_numpy()
+
+def _mascara_fechas(df, rango):
+    """Tareas que empiezan desde `rango[0]` y terminan hasta `rango[1]` (fechas inclusive)"""
+    import pandas as pd
+
+    if not rango:
+        return None
+    desde, hasta = rango
+    return (
+        (df['Fecha_Inicio'] >= pd.Timestamp(desde)) &
+        (df['Fecha_Limite'] < pd.Timestamp(hasta) + pd.Timedelta(days=1))
+    ).to_numpy()
+
+def _mascara_alertas(df, alertas):
+    """Tareas con alguna de las alertas elegidas (columnas de alertas_tareas.CATEGORIAS_RIESGO)"""
+    import numpy as np
+
+    if not alertas:
+        return None
+    return np.logical_or.reduce([df[columna].to_numpy(dtype=bool) for columna in alertas])
+
+# Orden de aplicación de los filtros del sidebar
+FILTROS_GANTT = {
+    'area': _mascara_area,
+    'carpeta': _mascara_carpeta,
+    'estados': _mascara_estados,
+    'prioridades': _mascara_prioridades,
+    'asignado': _mascara_asignado,
+    'fechas': _mascara_fechas,
+    'alertas': _mascara_alertas,
+}
+
+def aplicar_filtro(df, nombre, valor):
+    """Aplica un único filtro del sidebar"""
+    mascara = FILTROS_GANTT[nombre](df, valor)
+    return df if mascara is None else df[mascara]
+
+def indices_filtrados(df, filtros):
+    """
+    Posiciones de las filas que pasan los filtros (claves de FILTROS_GANTT),
+    o None si ningún filtro está activo. No crea DataFrames intermedios
+    """
+    import numpy as np
+
+    combinada = None
+    for nombre, funcion in FILTROS_GANTT.items():
+        if nombre not in filtros:
+            continue
+        mascara = funcion(df, filtros[nombre])
+        if mascara is not None:
+            combinada = mascara if combinada is None else combinada & mascara
+    return None if combinada is None else np.flatnonzero(combinada)
+
+@cronometrado("filtrar")
+def aplicar_filtros_gantt(df, filtros):
+    """
+    Vista filtrada del DataFrame. Sin filtros activos devuelve el mismo objeto
+    (el dataset compartido no se copia); si no, solo las filas seleccionadas
+    """
+    posiciones = indices_filtrados(df, filtros)
+    return df if posiciones is None else df.take(posiciones)
+
+# ===== MÉTRICAS DEL DASHBOARD =====
+def cubo_para_filtros(cubo, df_filtrado, filtros, rango_total):
+    """
+    Cubo de la vista actual: se filtran las celdas del cubo del dataset. Un rango de
+    fechas de semanas completas (de lunes a domingo) se resuelve con las semanas de
+    inicio y fin de las celdas. Se agrega directamente la vista ya filtrada (una sola
+    pasada) en dos casos: un límite de fechas que corta una semana, porque no
+    coincide con las celdas semanales, y las alertas, que el cubo no guarda
+    """
+    from cubo_metricas import construir_cubo, mascara_semanas, semanas_completas
+
+    fechas = filtros.get('fechas')
+    desde = hasta = None
+    if fechas:
+        # Un límite en el borde del dataset no deja fuera ninguna tarea
+        desde = fechas[0] if fechas[0] > rango_total[0].date() else None
+        hasta = fechas[1] if fechas[1] < rango_total[1].date() else None
+    if filtros.get('alertas') or not semanas_completas(desde, hasta):
+        return construir_cubo(df_filtrado)
+
+    posiciones = indices_filtrados(cubo, {k: v for k, v in filtros.items() if k not in ('fechas', 'alertas')})
+    vista = cubo if posiciones is None else cubo.take(posiciones)
+    if desde is None and hasta is None:
+        return vista
+    return vista[mascara_semanas(vista, desde, hasta)]
+
+@cronometrado("estadisticas")
+def calcular_estadisticas_avanzadas(df, cubo=None):
+    """
+    Totales, conteos por estado y prioridad, progreso, duración promedio por estado
+    y carga por persona. Se calculan sobre el cubo (si no se pasa, se construye)
+    """
+    from cubo_metricas import construir_cubo, resumen_cubo
+
+    return resumen_cubo(cubo if cubo is not None else construir_cubo(df))
+
+@cronometrado("sincronizar_clickup")
+def actualizar_datos_desde_clickup():
+    """Sincroniza todos los espacios configurados y regenera el JSON combinado"""
+    import time
+    import streamlit as st
+    from config import get_config
+    from ingesta_clickup import cargar_espacios, combinar_espacios, guardar_combinado, sincronizar_espacios
+
+    config = get_config()
+    if not config.get('api_token'):
+        st.warning("⚠️ No hay token de ClickUp configurado; no se puede sincronizar")
+        return False
+
+    with st.spinner(f"Sincronizando {len(config['space_ids'])} espacio(s) de ClickUp..."):
+        resultados = sincronizar_espacios(config)
+
+    for resultado in resultados:
+        if resultado['estado'] != 'ok':
+            st.warning(f"⚠️ Espacio {resultado['space_id']}: {resultado['error']} (se conservan los datos anteriores)")
+
+    datos, _espacios = combinar_espacios(cargar_espacios(config['space_ids']), config.get('areas'))
+    if not datos:
+        st.error("❌ No se obtuvieron datos de ningún espacio")
+        return False
+
+    guardar_combinado(datos, ARCHIVO_DATOS)
+
+    # Con varios procesos de la app, publicar la versión nueva para todos
+    from config import usar_dataset_compartido
+    if usar_dataset_compartido():
+        from almacen_dataset import publicar_desde_fuentes
+        publicar_desde_fuentes(config)
+    fijar("ultima_sincronizacion_segundos", time.time())
+    
+    # Registrar la sincronización en el historial (append-only)
+    try:
+        from historial_snapshots import registrar_snapshot
+        from metricas_historial import MetricasHistorial
+        if registrar_snapshot(datos):
+            MetricasHistorial().actualizar()
+    except Exception as e:
+        st.warning(f"⚠️ No se pudo registrar el snapshot en el historial: {e}")
+    
+    # Reportes HTML del día en segundo plano (no bloquea la app)
+    from config import prerender_reportes_activo
+    if prerender_reportes_activo():
+        try:
+            from prerender_reportes import programar_prerender
+            programar_prerender()
+        except OSError as e:
+            st.warning(f"⚠️ No se pudo lanzar la generación de reportes: {e}")
+    
+    st.success(f"✅ {sum(r['estado'] == 'ok' for r in resultados)}/{len(resultados)} espacio(s) sincronizados")
+    return True
+
+def generar_datos_ejemplo(archivo=ARCHIVO_DATOS):
+    """Escribe un conjunto pequeño de datos de ejemplo en el archivo local"""
+    from datetime import datetime, timedelta
+
+    hoy = datetime.now()
+
+    def fecha(dias):
+        return (hoy + timedelta(days=dias)).strftime("%d/%m/%y")
+
+    datos = {
+        "Administración y Sistemas": {
+            "SistemasGM": {
+                "Tareas": {
+                    "pendiente": [
+                        {"nombre": "Implementar Sistema de Facturación", "estado": "pendiente", "asignados": ["Juan Pérez"],
+                         "fecha_inicio": fecha(5), "fecha_limite": fecha(20), "prioridad": "high"}
+                    ],
+                    "en progreso": [
+                        {"nombre": "Desarrollo API REST", "estado": "en progreso", "asignados": ["Carlos López"],
+                         "fecha_inicio": fecha(-10), "fecha_limite": fecha(5), "prioridad": "urgent"}
+                    ],
+                    "completado": [
+                        {"nombre": "Análisis de Requerimientos", "estado": "completado", "asignados": ["Pedro Sánchez"],
+                         "fecha_inicio": fecha(-30), "fecha_limite": fecha(-15), "prioridad": "normal"}
+                    ]
+                }
+            }
+        }
+    }
+    try:
+        with open(archivo, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"Error generando datos de ejemplo: {e}")
+        return False
+
+    # Igual que al sincronizar: con el dataset compartido, publicar la versión nueva
+    from config import get_config, usar_dataset_compartido
+    if usar_dataset_compartido():
+        from almacen_dataset import publicar_desde_fuentes
+        publicar_desde_fuentes(get_config())
+    return True
+
 # Mantener compatibilidad pero sin funcionalidad compleja
 def get_clickup_config():
     """Función de compatibilidad"""
@@ -26,3 +387,55 @@ def get_clickup_config():
         'space_id': '90111892233',
         'environment': 'demo'
     }
+
+# ===== EXPORTACIÓN =====
+FORMATOS_EXPORTACION = {
+    'csv': {'extension': 'csv', 'mime': 'text/csv'},
+    'excel': {
+        'extension': 'xlsx',
+        'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    },
+    'parquet': {'extension': 'parquet', 'mime': 'application/vnd.apache.parquet'},
+    'arrow': {'extension': 'arrow', 'mime': 'application/vnd.apache.arrow.file'}
+}
+
+def huella_datos(df):
+    """Calcula una huella estable del DataFrame filtrado para cachear exportaciones"""
+    import pandas as pd
+
+    if df is None or df.empty:
+        return "vacio"
+    hashes = pd.util.hash_pandas_object(df, index=True).values
+    return f"{len(df)}-{hashes.sum():x}-{hashes[0]:x}"
+
+def exportar_a_csv(df):
+    """Genera los bytes CSV del DataFrame"""
+    return df.to_csv(index=False).encode('utf-8')
+
+def exportar_a_excel(df):
+    """Genera los bytes XLSX del DataFrame (streaming, una hoja por carpeta)"""
+    import io
+    from exportador_excel import COLUMNAS_DASHBOARD, escribir_excel_streaming, iterar_filas_dataframe
+
+    if df is None or df.empty:
+        return None
+    try:
+        buffer = io.BytesIO()
+        escribir_excel_streaming(iterar_filas_dataframe(df), buffer, COLUMNAS_DASHBOARD)
+        return buffer.getvalue()
+    except Exception as e:
+        print(f"Error exportando a Excel: {e}")
+        return None
+
+@cronometrado("exportar")
+def generar_exportacion(df, formato):
+    """Genera los bytes de exportación en el formato indicado"""
+    if formato == 'csv':
+        return exportar_a_csv(df)
+    if formato == 'excel':
+        return exportar_a_excel(df)
+    if formato in ('parquet', 'arrow'):
+        from exportador_arrow import exportar_tabla_arrow
+        from exportador_excel import CAMPOS_DASHBOARD
+        return exportar_tabla_arrow(df[CAMPOS_DASHBOARD], formato)
+    raise ValueError(f"Formato de exportación no soportado: {formato}")
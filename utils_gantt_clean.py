@@ -130,8 +130,16 @@ def procesar_datos_clickup(data):
         for assignee in task.get('assignees', []):
             asignados.append(assignee.get('username', 'Sin nombre'))
         
+        # Procesar dependencias: tareas que esta espera (ClickUp lista ambos sentidos)
+        dependencias = [
+            dep.get('depends_on') for dep in task.get('dependencies') or []
+            if dep.get('task_id') == task.get('id') and dep.get('depends_on')
+        ]
+        
         # Crear tarea procesada
         tarea_procesada = {
+            'id': task.get('id'),
+            'dependencias': dependencias,
             'nombre': task.get('name', 'Sin nombre'),
             'estado': estado,
             'asignados': asignados,